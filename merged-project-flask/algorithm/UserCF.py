@@ -9,10 +9,18 @@ import math
 import random
 from operator import itemgetter
 
+from .ItemCF import DEFAULT_RATINGS
+
 class UserBasedCF:
     """基于用户的协同过滤推荐算法"""
     
-    def __init__(self):
+    def __init__(self, ratings=None, seed=None, train_ratio=0.9):
+        """
+        Args:
+            ratings: 评分列表 [[用户ID, 物品ID, 评分], ...]，为None时使用模拟数据
+            seed: 划分训练集/测试集的随机种子，为None时使用全局随机状态
+            train_ratio: 训练集比例
+        """
         # 训练集
         self.train_set = {}
         # 测试集
@@ -27,34 +35,26 @@ class UserBasedCF:
         self.items = set()
         
         # 初始化数据
-        self.load_data()
+        self.load_data(ratings, seed, train_ratio)
         self.calc_user_sim()
     
-    def load_data(self):
+    def load_data(self, ratings=None, seed=None, train_ratio=0.9):
         """加载数据"""
         # 模拟数据，实际应从数据库加载
         # 用户-物品评分矩阵
-        ratings = [
-            [1, 101, 5.0],
-            [1, 102, 4.0],
-            [1, 103, 3.0],
-            [2, 101, 4.0],
-            [2, 104, 5.0],
-            [3, 102, 5.0],
-            [3, 103, 4.0],
-            [3, 104, 3.0],
-            [4, 101, 4.0],
-            [4, 103, 5.0],
-            [4, 104, 4.0]
-        ]
+        if ratings is None:
+            ratings = DEFAULT_RATINGS
+        
+        # 指定种子时使用独立的随机数生成器，保证划分可复现
+        rng = random.Random(seed) if seed is not None else random
         
         # 划分训练集和测试集
         for user, item, rating in ratings:
             self.users.add(user)
             self.items.add(item)
             
-            # 90%作为训练集
-            if random.random() < 0.9:
+            # 按train_ratio划分训练集
+            if rng.random() < train_ratio:
                 self.train_set.setdefault(user, {})
                 self.train_set[user][item] = rating
             else:
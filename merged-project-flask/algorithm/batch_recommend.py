@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量预计算职位推荐
+将ItemBasedCF模型导出为可内存映射的NumPy数组，多进程按用户分片计算top-N推荐，
+结果以紧凑的二进制格式写入 user_id -> (职位ID, 分数) 键值表
+"""
+
+import os
+import time
+import sqlite3
+import logging
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 结果表名
+RECOMMENDATION_TABLE = 'tb_job_recommendation'
+
+# 打包格式：小端int32职位ID + 小端float32分数
+JOB_ID_DTYPE = np.dtype('<i4')
+SCORE_DTYPE = np.dtype('<f4')
+
+# 模型文件
+MODEL_FILES = ('items', 'neighbors', 'sims', 'users', 'user_ptr', 'user_items', 'user_ratings')
+
+
+def export_item_model(cf, model_dir: str, k: int = 20) -> None:
+    """
+    将ItemBasedCF模型导出为内存映射友好的定长数组
+
+    Args:
+        cf: 已训练的ItemBasedCF实例
+        model_dir: 输出目录
+        k: 每个物品保留的最相似物品数量（与recommend的k含义一致）
+    """
+    os.makedirs(model_dir, exist_ok=True)
+
+    items = np.array(sorted(cf.items), dtype=np.int64)
+    item_index = {item: i for i, item in enumerate(items.tolist())}
+
+    # 物品近邻表：每行保存相似度最高的k个物品下标，不足k个以-1填充
+    neighbors = np.full((len(items), k), -1, dtype=np.int32)
+    sims = np.zeros((len(items), k), dtype=np.float32)
+    for item, related in cf.item_sim_matrix.items():
+        row = item_index[item]
+        top = sorted(related.items(), key=lambda x: x[1], reverse=True)[:k]
+        for j, (other, sim) in enumerate(top):
+            neighbors[row, j] = item_index[other]
+            sims[row, j] = sim
+
+    # 用户历史：CSR格式
+    users = np.array(sorted(cf.train_set), dtype=np.int64)
+    user_ptr = np.zeros(len(users) + 1, dtype=np.int64)
+    user_items, user_ratings = [], []
+    for i, user in enumerate(users.tolist()):
+        history = cf.train_set[user]
+        user_items.extend(item_index[item] for item in history)
+        user_ratings.extend(history.values())
+        user_ptr[i + 1] = len(user_items)
+
+    arrays = {
+        'items': items,
+        'neighbors': neighbors,
+        'sims': sims,
+        'users': users,
+        'user_ptr': user_ptr,
+        'user_items': np.array(user_items, dtype=np.int32),
+        'user_ratings': np.array(user_ratings, dtype=np.float32),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(model_dir, f'{name}.npy'), array)
+    logger.info(f"模型已导出到 {model_dir}: {len(items)}个物品, {len(users)}个用户")
+
+
+class MmapItemModel:
+    """以内存映射方式加载的物品协同过滤模型，多个进程共享同一份页缓存"""
+
+    def __init__(self, model_dir: str):
+        for name in MODEL_FILES:
+            setattr(self, name, np.load(os.path.join(model_dir, f'{name}.npy'), mmap_mode='r'))
+
+    def recommend_index(self, user_index: int, n: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        为第user_index个用户计算推荐，逻辑与ItemBasedCF.recommend一致
+
+        Returns:
+            (职位ID数组, 分数数组)
+        """
+        start, end = self.user_ptr[user_index], self.user_ptr[user_index + 1]
+        history = np.asarray(self.user_items[start:end])
+        ratings = np.asarray(self.user_ratings[start:end])
+
+        neighbors = np.asarray(self.neighbors[history])
+        weights = np.asarray(self.sims[history]) * ratings[:, None]
+        valid = neighbors >= 0
+
+        # 累加 sim * rating，并排除用户已评分的物品
+        scores = np.bincount(neighbors[valid], weights=weights[valid], minlength=len(self.items))
+        candidates = np.zeros(len(self.items), dtype=bool)
+        candidates[neighbors[valid]] = True
+        candidates[history] = False
+
+        candidate_index = np.flatnonzero(candidates)
+        if len(candidate_index) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        candidate_scores = scores[candidate_index]
+        top_n = min(n, len(candidate_index))
+        top = np.argpartition(-candidate_scores, top_n - 1)[:top_n]
+        top = top[np.argsort(-candidate_scores[top], kind='stable')]
+        return np.asarray(self.items[candidate_index[top]]), candidate_scores[top].astype(np.float32)
+
+
+# 子进程中的模型实例（每个进程映射一次）
+_worker_model = None
+
+
+def _init_worker(model_dir: str) -> None:
+    """子进程初始化：内存映射加载模型"""
+    global _worker_model
+    _worker_model = MmapItemModel(model_dir)
+
+
+def _recommend_shard(shard: Tuple[int, int, int]) -> List[Tuple[int, bytes, bytes]]:
+    """计算一个用户分片的推荐结果，返回打包后的行"""
+    start, end, n = shard
+    rows = []
+    for user_index in range(start, end):
+        job_ids, scores = _worker_model.recommend_index(user_index, n)
+        rows.append((int(_worker_model.users[user_index]), pack_job_ids(job_ids), pack_scores(scores)))
+    return rows
+
+
+def pack_job_ids(job_ids: Sequence[int]) -> bytes:
+    """打包职位ID"""
+    return np.asarray(job_ids, dtype=JOB_ID_DTYPE).tobytes()
+
+
+def pack_scores(scores: Sequence[float]) -> bytes:
+    """打包推荐分数"""
+    return np.asarray(scores, dtype=SCORE_DTYPE).tobytes()
+
+
+class RecommendationStore:
+    """预计算推荐结果存储：user_id为主键的紧凑键值表"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def create_table(self) -> None:
+        """创建结果表（user_id为INTEGER PRIMARY KEY，查询即一次主键查找）"""
+        conn = self._connect()
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {RECOMMENDATION_TABLE} (
+                user_id INTEGER PRIMARY KEY,
+                job_ids BLOB NOT NULL,
+                scores BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def put_many(self, rows: Iterable[Tuple[int, bytes, bytes]]) -> int:
+        """
+        批量写入推荐结果
+
+        Args:
+            rows: [(用户ID, 打包的职位ID, 打包的分数), ...]
+
+        Returns:
+            写入行数
+        """
+        now = time.time()
+        conn = self._connect()
+        cursor = conn.executemany(
+            f"INSERT OR REPLACE INTO {RECOMMENDATION_TABLE} (user_id, job_ids, scores, updated_at) VALUES (?, ?, ?, ?)",
+            ((user_id, job_ids, scores, now) for user_id, job_ids, scores in rows))
+        count = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return count
+
+    def get(self, user_id: int, n: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        查询用户的预计算推荐
+
+        Returns:
+            推荐列表 [{'job_id': 职位ID, 'score': 推荐评分}, ...]，无记录时返回None
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(f"SELECT job_ids, scores FROM {RECOMMENDATION_TABLE} WHERE user_id = ?",
+                               (user_id,)).fetchone()
+        except sqlite3.OperationalError:
+            # 结果表尚未创建
+            row = None
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        job_ids = np.frombuffer(row[0], dtype=JOB_ID_DTYPE)
+        scores = np.frombuffer(row[1], dtype=SCORE_DTYPE)
+        if n is not None:
+            job_ids, scores = job_ids[:n], scores[:n]
+        return [{'job_id': int(job_id), 'score': float(score)} for job_id, score in zip(job_ids, scores)]
+
+
+def precompute_recommendations(cf, db_path: str, model_dir: str, n: int = 50, k: int = 20,
+                               workers: Optional[int] = None, shard_size: int = 1000) -> Dict[str, Any]:
+    """
+    为全部活跃用户（训练集中的用户）预计算top-N推荐
+
+    Args:
+        cf: 已训练的ItemBasedCF实例
+        db_path: 结果表所在的SQLite数据库
+        model_dir: 内存映射模型目录
+        n: 每个用户保存的推荐数量
+        k: 每个物品使用的近邻数量
+        workers: 进程数，None时使用CPU核数
+        shard_size: 每个分片的用户数量
+
+    Returns:
+        统计信息
+    """
+    import multiprocessing
+
+    start_time = time.time()
+    export_item_model(cf, model_dir, k=k)
+    n_users = len(cf.train_set)
+
+    store = RecommendationStore(db_path)
+    store.create_table()
+
+    shards = [(start, min(start + shard_size, n_users), n) for start in range(0, n_users, shard_size)]
+    written = 0
+    workers = workers or os.cpu_count() or 1
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(model_dir,)) as pool:
+        for rows in pool.imap_unordered(_recommend_shard, shards):
+            written += store.put_many(rows)
+
+    stats = {
+        'users': n_users,
+        'written': written,
+        'shards': len(shards),
+        'workers': workers,
+        'elapsed_s': time.time() - start_time,
+    }
+    logger.info(f"推荐预计算完成: {stats}")
+    return stats
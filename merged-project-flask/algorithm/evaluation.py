@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+推荐算法离线评估
+在固定种子划分的训练集/测试集上评估各推荐器的准确率、召回率、覆盖率和流行度，
+并在不同规模的合成数据上测量训练耗时、峰值内存和推荐延迟
+"""
+
+import math
+import random
+import sys
+import time
+from typing import Dict, List, Any, Callable, Sequence
+
+# 合成数据使用的技能方向：(方向, 技能列表, 职位名称)
+SYNTHETIC_TOPICS = [
+    ('python', ['python', 'django', 'flask', 'mysql'], 'Python开发工程师'),
+    ('java', ['java', 'spring', 'mysql', 'redis'], 'Java开发工程师'),
+    ('frontend', ['javascript', 'vue', 'react', 'css'], '前端开发工程师'),
+    ('data', ['数据分析', 'sql', 'hadoop', 'spark'], '数据分析师'),
+    ('ai', ['机器学习', '深度学习', 'pytorch', 'tensorflow'], '算法工程师'),
+    ('testing', ['自动化测试', 'selenium', 'pytest', 'linux'], '测试工程师'),
+    ('devops', ['linux', 'docker', 'kubernetes', 'jenkins'], '运维工程师'),
+    ('mobile', ['android', 'ios', 'flutter', 'kotlin'], '移动开发工程师'),
+]
+
+SYNTHETIC_CITIES = ['北京', '上海', '广州', '深圳', '杭州', '成都']
+
+# 参与评估的推荐器
+ENGINE_NAMES = ('itemcf', 'usercf', 'skill', 'embedding')
+
+
+def generate_synthetic_dataset(n_users: int, n_items: int, interactions_per_user: int = 20,
+                               seed: int = 42) -> Dict[str, Any]:
+    """
+    生成合成的用户-职位交互数据
+
+    每个用户有一个主要技能方向，80%的交互来自该方向的职位，职位热度服从长尾分布
+
+    Args:
+        n_users: 用户数量
+        n_items: 职位数量
+        interactions_per_user: 每个用户的平均交互数量
+        seed: 随机种子
+
+    Returns:
+        {'ratings': [[用户ID, 职位ID, 评分], ...], 'jobs': 职位列表, 'user_skills': {用户ID: 技能列表}}
+    """
+    rng = random.Random(seed)
+
+    jobs = []
+    topic_jobs = {topic: [] for topic, _, _ in SYNTHETIC_TOPICS}
+    for job_id in range(1, n_items + 1):
+        topic, skills, title = rng.choice(SYNTHETIC_TOPICS)
+        jobs.append({
+            'id': job_id,
+            'position_name': rng.choice(['', '高级', '初级', '资深']) + title,
+            'company_name': f'合成公司{rng.randint(1, max(1, n_items // 10))}',
+            'city': rng.choice(SYNTHETIC_CITIES),
+            'education': rng.choice(['本科', '硕士', '大专']),
+            'coattr': '民营',
+            'welfare': ' '.join(rng.sample(skills, 2)) + ' 五险一金',
+            'salary0': float(rng.randint(5, 30)),
+            'salary1': float(rng.randint(30, 50)),
+        })
+        topic_jobs[topic].append(job_id)
+
+    # 长尾热度：按职位序号的幂律分布作为抽样权重
+    all_ids = [job['id'] for job in jobs]
+    weights = {job_id: 1.0 / (rank + 1) ** 0.8 for rank, job_id in enumerate(rng.sample(all_ids, len(all_ids)))}
+
+    ratings = []
+    user_skills = {}
+    for user in range(1, n_users + 1):
+        topic, skills, _ = rng.choice(SYNTHETIC_TOPICS)
+        user_skills[user] = rng.sample(skills, 3)
+        pool = topic_jobs[topic] or all_ids
+        pool_weights = [weights[job_id] for job_id in pool]
+        all_weights = [weights[job_id] for job_id in all_ids]
+
+        count = max(1, int(rng.gauss(interactions_per_user, interactions_per_user / 4)))
+        seen = set()
+        for _ in range(count):
+            if rng.random() < 0.8:
+                job_id = rng.choices(pool, pool_weights)[0]
+            else:
+                job_id = rng.choices(all_ids, all_weights)[0]
+            if job_id in seen:
+                continue
+            seen.add(job_id)
+            ratings.append([user, job_id, float(rng.randint(1, 5))])
+
+    return {'ratings': ratings, 'jobs': jobs, 'user_skills': user_skills}
+
+
+def build_engine(name: str, dataset: Dict[str, Any], seed: int, k: int = 20) -> Dict[str, Any]:
+    """
+    构建推荐器，并返回统一的推荐函数
+
+    所有推荐器使用同一种子在同一份评分数据上划分训练集/测试集，保证评估口径一致
+
+    Args:
+        name: 推荐器名称，见ENGINE_NAMES
+        dataset: generate_synthetic_dataset的返回结果
+        seed: 划分训练集/测试集的随机种子
+        k: 协同过滤使用的近邻数量
+
+    Returns:
+        {'recommend': 推荐函数(user, n) -> [职位ID, ...], 'train_set': ..., 'test_set': ..., 'item_popular': ...}
+    """
+    if name == 'itemcf':
+        from algorithm.ItemCF import ItemBasedCF
+        model = ItemBasedCF(ratings=dataset['ratings'], seed=seed)
+        recommend = lambda user, n: [r['job_id'] for r in model.recommend(user, k=k, n=n)]
+        return {'recommend': recommend, 'train_set': model.train_set, 'test_set': model.test_set,
+                'item_popular': model.item_popular}
+
+    if name == 'usercf':
+        from algorithm.UserCF import UserBasedCF
+        model = UserBasedCF(ratings=dataset['ratings'], seed=seed)
+        recommend = lambda user, n: [r['job_id'] for r in model.recommend(user, k=k, n=n)]
+        return {'recommend': recommend, 'train_set': model.train_set, 'test_set': model.test_set,
+                'item_popular': model.item_popular}
+
+    # 基于内容的推荐器不需要训练交互数据，但沿用同一划分以排除训练集中的职位
+    train_set, test_set, item_popular = split_ratings(dataset['ratings'], seed)
+    user_skills = dataset['user_skills']
+
+    if name == 'skill':
+        from algorithm.skill_match import SkillBasedRecommender
+        model = SkillBasedRecommender(dataset['jobs'])
+        recommend = lambda user, n: [r['job_id'] for r in model.recommend(
+            user_skills.get(user, []), n=n, exclude=train_set.get(user, {}))]
+    elif name == 'embedding':
+        from algorithm.job_embedding import JobEmbeddingIndex
+        model = JobEmbeddingIndex().build(dataset['jobs'])
+
+        def recommend(user, n):
+            seen = train_set.get(user, {})
+            hits = model.search_text(' '.join(user_skills.get(user, [])), n + len(seen))
+            return [hit['job_id'] for hit in hits if hit['job_id'] not in seen][:n]
+    else:
+        raise ValueError(f"不支持的推荐器: {name}")
+
+    return {'recommend': recommend, 'train_set': train_set, 'test_set': test_set, 'item_popular': item_popular}
+
+
+def split_ratings(ratings: Sequence[Sequence[Any]], seed: int, train_ratio: float = 0.9):
+    """
+    按与ItemBasedCF/UserBasedCF相同的方式划分训练集/测试集
+
+    Returns:
+        (train_set, test_set, item_popular)
+    """
+    rng = random.Random(seed)
+    train_set, test_set, item_popular = {}, {}, {}
+    for user, item, rating in ratings:
+        if rng.random() < train_ratio:
+            train_set.setdefault(user, {})[item] = rating
+            item_popular[item] = item_popular.get(item, 0) + 1
+        else:
+            test_set.setdefault(user, {})[item] = rating
+    return train_set, test_set, item_popular
+
+
+def evaluate(recommend: Callable[[Any, int], List[Any]], test_set: Dict[Any, Dict[Any, float]],
+             item_popular: Dict[Any, int], all_items: Sequence[Any], n: int = 10) -> Dict[str, float]:
+    """
+    计算准确率、召回率、覆盖率和流行度
+
+    Args:
+        recommend: 推荐函数(user, n) -> [职位ID, ...]
+        test_set: 测试集 {用户ID: {职位ID: 评分}}
+        item_popular: 训练集中的职位流行度
+        all_items: 全部职位ID
+        n: 推荐列表长度
+
+    Returns:
+        评估指标字典；popularity为推荐职位流行度log(1+p)的均值，popularity_bias为其与全部职位均值之比
+    """
+    hit = 0
+    rec_count = 0
+    rec_total = 0
+    test_count = 0
+    popular_sum = 0.0
+    all_rec_items = set()
+
+    for user, test_items in test_set.items():
+        rec_items = recommend(user, n)
+        for item in rec_items:
+            if item in test_items:
+                hit += 1
+            all_rec_items.add(item)
+            popular_sum += math.log(1 + item_popular.get(item, 0))
+        rec_count += n
+        rec_total += len(rec_items)
+        test_count += len(test_items)
+
+    catalogue_popularity = sum(math.log(1 + item_popular.get(item, 0)) for item in all_items) / max(len(all_items), 1)
+    popularity = popular_sum / rec_total if rec_total else 0.0
+    return {
+        'precision': hit / rec_count if rec_count else 0.0,
+        'recall': hit / test_count if test_count else 0.0,
+        'coverage': len(all_rec_items) / max(len(all_items), 1),
+        'popularity': popularity,
+        'popularity_bias': popularity / catalogue_popularity if catalogue_popularity else 0.0,
+    }
+
+
+def _peak_rss_mb() -> float:
+    """当前进程的峰值常驻内存(MB)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux单位为KB，macOS单位为字节
+        return peak / 1024.0 / 1024.0 if sys.platform == 'darwin' else peak / 1024.0
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024.0 / 1024.0
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """计算百分位数（最近秩法）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(math.ceil(q / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _benchmark_worker(name: str, n_users: int, n_items: int, interactions_per_user: int,
+                      seed: int, n: int, latency_samples: int) -> Dict[str, Any]:
+    """在独立子进程中测量单个推荐器，使峰值内存互不干扰"""
+    dataset = generate_synthetic_dataset(n_users, n_items, interactions_per_user, seed)
+    baseline_rss = _peak_rss_mb()
+
+    start = time.perf_counter()
+    engine = build_engine(name, dataset, seed)
+    train_time = time.perf_counter() - start
+    peak_rss = _peak_rss_mb()
+
+    rng = random.Random(seed)
+    users = list(dataset['user_skills'])
+    sample = rng.sample(users, min(latency_samples, len(users)))
+    latencies = []
+    for user in sample:
+        start = time.perf_counter()
+        engine['recommend'](user, n)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'engine': name,
+        'users': n_users,
+        'items': n_items,
+        'ratings': len(dataset['ratings']),
+        'train_time_s': train_time,
+        'peak_rss_mb': peak_rss,
+        'train_rss_mb': peak_rss - baseline_rss,
+        'p50_ms': _percentile(latencies, 50),
+        'p99_ms': _percentile(latencies, 99),
+    }
+
+
+def run_evaluation(n_users: int = 500, n_items: int = 500, interactions_per_user: int = 20, seed: int = 42,
+                   n: int = 10, engines: Sequence[str] = ENGINE_NAMES) -> List[Dict[str, Any]]:
+    """
+    在同一份合成数据、同一划分上评估各推荐器的离线指标
+
+    Returns:
+        每个推荐器的评估结果列表
+    """
+    dataset = generate_synthetic_dataset(n_users, n_items, interactions_per_user, seed)
+    all_items = [job['id'] for job in dataset['jobs']]
+
+    results = []
+    for name in engines:
+        engine = build_engine(name, dataset, seed)
+        metrics = evaluate(engine['recommend'], engine['test_set'], engine['item_popular'], all_items, n)
+        metrics['engine'] = name
+        results.append(metrics)
+    return results
+
+
+def run_benchmark(sizes: Sequence[int] = (200, 500, 1000), interactions_per_user: int = 20, seed: int = 42,
+                  n: int = 10, latency_samples: int = 200,
+                  engines: Sequence[str] = ENGINE_NAMES) -> List[Dict[str, Any]]:
+    """
+    在规模递增的合成数据上测量训练耗时、峰值内存和p50/p99推荐延迟
+
+    Args:
+        sizes: 数据规模列表（用户数量，职位数量与之相同）
+
+    Returns:
+        每个(规模, 推荐器)组合的测量结果
+    """
+    import multiprocessing
+
+    results = []
+    for size in sizes:
+        for name in engines:
+            # 每次测量使用新进程，峰值内存只反映当前推荐器
+            with multiprocessing.Pool(1) as pool:
+                results.append(pool.apply(_benchmark_worker,
+                                          (name, size, size, interactions_per_user, seed, n, latency_samples)))
+    return results
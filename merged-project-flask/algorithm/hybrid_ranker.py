@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+混合排序
+从多个候选生成器（协同过滤、技能匹配、向量检索、热门）召回职位，
+以向量化方式计算特征，经可配置的线性加权融合并应用硬性约束后输出排序结果
+"""
+
+import math
+import time
+import logging
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 特征名称（与融合权重的键对应）
+FEATURE_NAMES = ('cf', 'skill', 'embedding', 'popularity')
+
+# 默认融合权重
+DEFAULT_BLEND_WEIGHTS = {
+    'cf': 0.4,
+    'skill': 0.3,
+    'embedding': 0.2,
+    'popularity': 0.1,
+}
+
+# 候选生成器：(上下文, 召回数量) -> [{'job_id': 职位ID, 'score': 分数}, ...]
+# 上下文中的deadline为本次排序的截止时间（time.perf_counter()的时间点），
+# 需要线性扫描的生成器应在扫描中检查，超时后返回已得到的部分结果
+CandidateGenerator = Callable[[Dict[str, Any], int], List[Dict[str, Any]]]
+
+
+class HybridRanker:
+    """混合排序器"""
+
+    def __init__(self, jobs: List[Dict[str, Any]], generators: Dict[str, CandidateGenerator],
+                 weights: Optional[Dict[str, float]] = None, popularity: Optional[Dict[Any, float]] = None,
+                 deadline_ms: float = 50.0, n_candidates: int = 200):
+        """
+        Args:
+            jobs: 全部职位记录，需包含id/city/salary0/worktime0/education字段
+            generators: 候选生成器，按字典顺序依次调用，键为对应的特征名
+            weights: 融合权重，缺省使用DEFAULT_BLEND_WEIGHTS
+            popularity: 职位热度 {职位ID: 热度}，同时作为兜底候选
+            deadline_ms: 单次排序的时间预算（毫秒）：超出后跳过剩余的生成器；截止时间通过context['deadline']
+                         传给生成器，扫描型生成器（如技能匹配）在扫描中途检查并提前返回。
+                         不会强行中断生成器，不检查截止时间的生成器仍可能使实际耗时超过该值
+            n_candidates: 每个生成器的召回数量
+        """
+        self.generators = generators
+        self.weights = dict(DEFAULT_BLEND_WEIGHTS)
+        self.weights.update(weights or {})
+        self.weight_vector = np.array([self.weights.get(name, 0.0) for name in FEATURE_NAMES], dtype=np.float32)
+        self.deadline_ms = deadline_ms
+        self.n_candidates = n_candidates
+
+        # 职位属性列（用于向量化的约束过滤）
+        self.job_ids = np.array([job['id'] for job in jobs], dtype=np.int64)
+        self.job_pos = {job_id: i for i, job_id in enumerate(self.job_ids.tolist())}
+        self.city = np.array([job.get('city') or '' for job in jobs], dtype=object)
+        self.education = np.array([job.get('education') or '' for job in jobs], dtype=object)
+        self.salary0 = np.array([job.get('salary0') or 0 for job in jobs], dtype=np.float32)
+        self.worktime0 = np.array([job.get('worktime0') or 0 for job in jobs], dtype=np.float32)
+
+        # 热度特征：log平滑后按最大值归一化
+        self.popularity = np.zeros(len(jobs), dtype=np.float32)
+        for job_id, count in (popularity or {}).items():
+            pos = self.job_pos.get(job_id)
+            if pos is not None:
+                self.popularity[pos] = math.log1p(count)
+        if self.popularity.max(initial=0) > 0:
+            self.popularity /= self.popularity.max()
+        self.popular_pos = np.argsort(-self.popularity, kind='stable')[:n_candidates]
+        self.popular_pos = self.popular_pos[self.popularity[self.popular_pos] > 0]
+
+    def _constraint_mask(self, pos: np.ndarray, constraints: Dict[str, Any]) -> np.ndarray:
+        """计算候选职位是否满足硬性约束"""
+        mask = np.ones(len(pos), dtype=bool)
+        if constraints.get('city'):
+            mask &= self.city[pos] == constraints['city']
+        if constraints.get('salary_range'):
+            min_salary, max_salary = constraints['salary_range']
+            salary = self.salary0[pos]
+            mask &= (salary >= min_salary) & (salary <= max_salary)
+        if constraints.get('worktime_range'):
+            min_work, max_work = constraints['worktime_range']
+            worktime = self.worktime0[pos]
+            mask &= (worktime >= min_work) & (worktime <= max_work)
+        if constraints.get('education'):
+            education = constraints['education']
+            mask &= np.fromiter((education in value for value in self.education[pos]), dtype=bool, count=len(pos))
+        return mask
+
+    def rank(self, context: Dict[str, Any], n: int = 10,
+             constraints: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        排序
+
+        Args:
+            context: 传给各生成器的上下文（如user_id、skills、text）
+            n: 返回数量
+            constraints: 硬性约束 city / salary_range / worktime_range / education
+
+        Returns:
+            (推荐列表 [{'job_id', 'score', 'features'}, ...], 统计信息)
+        """
+        start = time.perf_counter()
+        budget = self.deadline_ms / 1000.0
+
+        # 召回：按顺序调用生成器，超出时间预算后跳过剩余生成器；生成器通过deadline在扫描中途提前返回
+        deadline = start + budget
+        generator_context = dict(context, deadline=deadline)
+        hits_by_feature = {}
+        skipped = []
+        for name, generator in self.generators.items():
+            if time.perf_counter() > deadline:
+                skipped.append(name)
+                continue
+            try:
+                hits_by_feature[name] = generator(generator_context, self.n_candidates) or []
+            except Exception as e:
+                logger.warning(f"候选生成器 {name} 失败: {str(e)}")
+                hits_by_feature[name] = []
+
+        # 候选集合（职位数组下标），热门职位作为兜底；
+        # 各生成器的分数在约束过滤之前按该生成器全部召回结果的最大值归一化到[0, 1]，
+        # 同一职位的特征值不随约束条件（过滤掉哪些候选）变化
+        candidate_pos = [self.popular_pos]
+        hit_arrays = {}
+        for name, hits in hits_by_feature.items():
+            pos = np.array([self.job_pos.get(hit['job_id'], -1) for hit in hits], dtype=np.int64)
+            scores = np.array([hit['score'] for hit in hits], dtype=np.float32)
+            valid = pos >= 0
+            pos, scores = pos[valid], scores[valid]
+            max_score = scores.max(initial=0)
+            scores = np.clip(scores / max_score, 0, 1) if max_score > 0 else np.zeros_like(scores)
+            hit_arrays[name] = (pos, scores)
+            candidate_pos.append(pos)
+        candidates = np.unique(np.concatenate(candidate_pos))
+
+        stats = {'candidates': int(len(candidates)), 'skipped_generators': skipped}
+        if len(candidates) == 0:
+            stats['elapsed_ms'] = (time.perf_counter() - start) * 1000
+            return [], stats
+
+        # 硬性约束
+        candidates = candidates[self._constraint_mask(candidates, constraints or {})]
+        stats['eligible'] = int(len(candidates))
+        if len(candidates) == 0:
+            stats['elapsed_ms'] = (time.perf_counter() - start) * 1000
+            return [], stats
+
+        # 特征矩阵：各生成器归一化后的分数
+        features = np.zeros((len(candidates), len(FEATURE_NAMES)), dtype=np.float32)
+        for col, name in enumerate(FEATURE_NAMES):
+            if name == 'popularity':
+                features[:, col] = self.popularity[candidates]
+                continue
+            if name not in hit_arrays:
+                continue
+            pos, scores = hit_arrays[name]
+            row = np.searchsorted(candidates, pos)
+            inside = (row < len(candidates)) & (candidates[np.minimum(row, len(candidates) - 1)] == pos)
+            features[row[inside], col] = scores[inside]
+
+        # 线性融合并取top-n
+        blended = features @ self.weight_vector
+        top_n = min(n, len(candidates))
+        top = np.argpartition(-blended, top_n - 1)[:top_n]
+        top = top[np.argsort(-blended[top], kind='stable')]
+
+        results = []
+        for i in top:
+            results.append({
+                'job_id': int(self.job_ids[candidates[i]]),
+                'score': float(blended[i]),
+                'features': {name: float(features[i, col]) for col, name in enumerate(FEATURE_NAMES)},
+            })
+        stats['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        return results, stats
@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+职位向量检索
+将职位与简历编码为稠密向量，使用倒排文件(IVF)近似最近邻索引进行召回
+"""
+
+import os
+import logging
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 参与编码的职位字段，职位名称权重最高，重复一次以提升其占比
+JOB_TEXT_FIELDS = ('position_name', 'position_name', 'coattr', 'welfare', 'education', 'city', 'company_name')
+
+# 参与编码的简历结构化字段（来自ResumeNER.extract_structured_info）
+RESUME_TEXT_FIELDS = ('title', 'major', 'skills', 'education', 'organization', 'location')
+
+
+def job_to_text(job: Dict[str, Any]) -> str:
+    """
+    将tb_job记录拼接为待编码文本
+
+    Args:
+        job: 职位记录字典
+
+    Returns:
+        拼接后的文本
+    """
+    parts = []
+    for field in JOB_TEXT_FIELDS:
+        value = job.get(field)
+        if value:
+            parts.append(str(value))
+    return ' '.join(parts).lower()
+
+
+def resume_to_text(structured_info: Dict[str, Any]) -> str:
+    """
+    将简历结构化信息拼接为待编码文本
+
+    Args:
+        structured_info: ResumeNER.extract_structured_info的返回结果
+
+    Returns:
+        拼接后的文本
+    """
+    parts = []
+    for field in RESUME_TEXT_FIELDS:
+        value = structured_info.get(field)
+        if not value:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            parts.extend(str(v) for v in value if v)
+        else:
+            parts.append(str(value))
+    return ' '.join(parts).lower()
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """按行L2归一化，便于用内积计算余弦相似度"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class TfidfSvdEncoder:
+    """TF-IDF + SVD 文本编码器（无需下载模型的默认方案）"""
+
+    def __init__(self, n_components: int = 128, ngram_range=(1, 2), max_features: int = 50000):
+        """
+        初始化编码器
+
+        Args:
+            n_components: 向量维度
+            ngram_range: 字符n-gram范围，中文无需分词即可编码
+            max_features: 词表最大规模
+        """
+        self.n_components = n_components
+        self.ngram_range = ngram_range
+        self.max_features = max_features
+        self.vectorizer = None
+        self.svd = None
+
+    def fit(self, texts: Sequence[str]) -> 'TfidfSvdEncoder':
+        """在职位语料上拟合TF-IDF与SVD"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.decomposition import TruncatedSVD
+
+        self.vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=self.ngram_range,
+                                          max_features=self.max_features, sublinear_tf=True)
+        tfidf = self.vectorizer.fit_transform(texts)
+
+        # SVD维度不能超过特征数，小语料时自动收缩
+        n_components = min(self.n_components, tfidf.shape[1] - 1, tfidf.shape[0] - 1)
+        if n_components >= 2:
+            self.svd = TruncatedSVD(n_components=n_components, random_state=0)
+            self.svd.fit(tfidf)
+        else:
+            self.svd = None
+        return self
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """将文本编码为归一化的稠密向量"""
+        if self.vectorizer is None:
+            raise RuntimeError("编码器尚未拟合")
+        tfidf = self.vectorizer.transform(texts)
+        if self.svd is not None:
+            vectors = self.svd.transform(tfidf)
+        else:
+            vectors = tfidf.toarray()
+        return _l2_normalize(np.asarray(vectors, dtype=np.float32))
+
+
+class TransformerEncoder:
+    """本地Transformer句向量编码器（CPU推理，平均池化）"""
+
+    def __init__(self, model_path: str, batch_size: int = 32, max_length: int = 256):
+        """
+        初始化编码器
+
+        Args:
+            model_path: 本地模型目录（HuggingFace格式）
+            batch_size: 编码批大小
+            max_length: 最大token长度
+        """
+        import torch
+        from transformers import AutoTokenizer, AutoModel
+
+        self.torch = torch
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.model = AutoModel.from_pretrained(model_path)
+        self.model.eval()
+
+    def fit(self, texts: Sequence[str]) -> 'TransformerEncoder':
+        """预训练模型无需拟合"""
+        return self
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """将文本编码为归一化的稠密向量"""
+        outputs = []
+        with self.torch.no_grad():
+            for i in range(0, len(texts), self.batch_size):
+                batch = self.tokenizer(list(texts[i:i + self.batch_size]), padding=True, truncation=True,
+                                       max_length=self.max_length, return_tensors='pt')
+                hidden = self.model(**batch).last_hidden_state
+                mask = batch['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                outputs.append(pooled.numpy())
+        if not outputs:
+            return np.zeros((0, 0), dtype=np.float32)
+        return _l2_normalize(np.concatenate(outputs).astype(np.float32))
+
+
+def create_encoder(model_path: Optional[str] = None, n_components: int = 128):
+    """
+    创建文本编码器：优先使用本地模型，不存在或加载失败时回退到TF-IDF+SVD
+
+    Args:
+        model_path: 本地句向量模型目录
+        n_components: TF-IDF+SVD回退方案的向量维度
+
+    Returns:
+        编码器实例
+    """
+    if model_path and os.path.isdir(model_path):
+        try:
+            encoder = TransformerEncoder(model_path)
+            logger.info(f"使用本地向量模型: {model_path}")
+            return encoder
+        except Exception as e:
+            logger.warning(f"加载本地向量模型失败，回退到TF-IDF+SVD: {str(e)}")
+    return TfidfSvdEncoder(n_components=n_components)
+
+
+class IVFIndex:
+    """倒排文件近似最近邻索引（纯NumPy实现，内积/余弦相似度）"""
+
+    def __init__(self, n_lists: Optional[int] = None, n_probe: int = 8, seed: int = 0, kmeans_iters: int = 10):
+        """
+        初始化索引
+
+        Args:
+            n_lists: 聚类中心数量，None时取sqrt(N)
+            n_probe: 查询时探查的聚类数量
+            seed: 聚类初始化随机种子
+            kmeans_iters: k-means迭代次数
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.kmeans_iters = kmeans_iters
+        self.centroids = None
+        self.vectors = None   # 按聚类顺序重排后的向量
+        self.ids = None       # 与vectors对应的职位ID
+        self.offsets = None   # 第i个聚类的数据区间为offsets[i]:offsets[i+1]
+
+    def __len__(self):
+        return 0 if self.ids is None else len(self.ids)
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+        """分块计算每个向量最近的聚类中心，避免一次性生成N×K矩阵"""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            scores = vectors[start:start + chunk_size] @ centroids.T
+            labels[start:start + chunk_size] = np.argmax(scores, axis=1)
+        return labels
+
+    def build(self, vectors: np.ndarray, ids: Sequence[Any]) -> 'IVFIndex':
+        """
+        构建索引
+
+        Args:
+            vectors: 已归一化的向量矩阵 (N, D)
+            ids: 与向量一一对应的职位ID
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ids = np.asarray(ids)
+        n = len(vectors)
+        n_lists = self.n_lists or max(1, int(np.sqrt(n)))
+        n_lists = min(n_lists, max(n, 1))
+
+        if n == 0:
+            self.centroids = np.zeros((0, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+            self.vectors, self.ids = vectors, ids
+            self.offsets = np.zeros(1, dtype=np.int64)
+            return self
+
+        # 球面k-means：随机选取初始中心，迭代更新并重新归一化
+        rng = np.random.RandomState(self.seed)
+        centroids = vectors[rng.choice(n, n_lists, replace=False)].copy()
+        labels = np.zeros(n, dtype=np.int32)
+        if n_lists > 1:
+            for _ in range(self.kmeans_iters):
+                labels = self._assign(vectors, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, vectors)
+                empty = ~np.bincount(labels, minlength=n_lists).astype(bool)
+                # 空聚类保留原中心
+                sums[empty] = centroids[empty]
+                centroids = _l2_normalize(sums)
+            labels = self._assign(vectors, centroids)
+
+        # 按聚类排序，使每个倒排列表在内存中连续
+        order = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels, minlength=n_lists)
+        self.centroids = centroids
+        self.vectors = vectors[order]
+        self.ids = ids[order]
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        logger.info(f"IVF索引构建完成: {n}个向量, {n_lists}个聚类")
+        return self
+
+    def search(self, query: np.ndarray, k: int = 10, n_probe: Optional[int] = None) -> List[List[tuple]]:
+        """
+        查询最相似的k个向量
+
+        Args:
+            query: 单个查询向量 (D,) 或批量查询 (Q, D)
+            k: 返回数量
+            n_probe: 探查的聚类数量，None时使用构建参数
+
+        Returns:
+            每个查询对应的 [(职位ID, 相似度), ...] 列表
+        """
+        if self.centroids is None or len(self) == 0:
+            return [[] for _ in range(1 if query.ndim == 1 else len(query))]
+
+        queries = np.atleast_2d(query).astype(np.float32)
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        centroid_scores = queries @ self.centroids.T
+        if n_probe < len(self.centroids):
+            probe_lists = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+        else:
+            probe_lists = np.tile(np.arange(len(self.centroids)), (len(queries), 1))
+
+        results = []
+        for q, lists in zip(queries, probe_lists):
+            candidates = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in lists])
+            if len(candidates) == 0:
+                results.append([])
+                continue
+            scores = self.vectors[candidates] @ q
+            top_n = min(k, len(candidates))
+            top = np.argpartition(-scores, top_n - 1)[:top_n]
+            top = top[np.argsort(-scores[top])]
+            results.append([(self.ids[candidates[i]].item(), float(scores[i])) for i in top])
+        return results
+
+
+class JobEmbeddingIndex:
+    """职位向量检索：编码tb_job与简历结构化信息，通过IVF索引召回top-k职位"""
+
+    def __init__(self, encoder=None, n_probe: int = 8, n_lists: Optional[int] = None):
+        """
+        初始化检索器
+
+        Args:
+            encoder: 文本编码器，None时使用TF-IDF+SVD
+            n_probe: 查询时探查的聚类数量
+            n_lists: 聚类中心数量，None时取sqrt(N)
+        """
+        self.encoder = encoder or TfidfSvdEncoder()
+        self.index = IVFIndex(n_lists=n_lists, n_probe=n_probe)
+
+    def __len__(self):
+        return len(self.index)
+
+    def build(self, jobs: List[Dict[str, Any]]) -> 'JobEmbeddingIndex':
+        """
+        对职位列表编码并建立索引
+
+        Args:
+            jobs: tb_job记录列表，需包含id字段
+        """
+        jobs = [job for job in jobs if job.get('id') is not None]
+        texts = [job_to_text(job) for job in jobs]
+        if not texts:
+            self.index.build(np.zeros((0, 1), dtype=np.float32), [])
+            return self
+        self.encoder.fit(texts)
+        vectors = self.encoder.encode(texts)
+        self.index.build(vectors, [job['id'] for job in jobs])
+        return self
+
+    def search_text(self, text: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        按查询文本召回职位
+
+        Returns:
+            推荐列表 [{'job_id': 职位ID, 'score': 相似度}, ...]
+        """
+        if not text or len(self) == 0:
+            return []
+        query = self.encoder.encode([text.lower()])[0]
+        return [{'job_id': job_id, 'score': score} for job_id, score in self.index.search(query, k)[0]]
+
+    def search_resume(self, structured_info: Dict[str, Any], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        按简历结构化信息召回职位
+
+        Args:
+            structured_info: ResumeNER.extract_structured_info的返回结果
+            k: 返回数量
+        """
+        return self.search_text(resume_to_text(structured_info), k)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基于技能匹配的职位推荐
+从 recommend_jobs_by_skills 中抽取的匹配打分逻辑，供接口、离线评估和混合排序复用
+"""
+
+import time
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+# 检查技能匹配的职位字段
+SKILL_MATCH_FIELDS = ('position_name', 'education', 'welfare', 'company_name', 'coattr')
+
+# 检查类别匹配的职位字段
+CATEGORY_MATCH_FIELDS = ('position_name', 'coattr', 'welfare')
+
+# 推荐扫描中每隔多少个职位检查一次截止时间
+DEADLINE_CHECK_INTERVAL = 256
+
+
+def job_match_texts(job: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    职位用于匹配的小写文本：(类别字段文本, 其余技能字段文本)，字段之间用\0分隔避免跨字段命中
+    """
+    category_text = '\0'.join((job.get(field) or '').lower() for field in CATEGORY_MATCH_FIELDS)
+    other_text = '\0'.join((job.get(field) or '').lower() for field in SKILL_MATCH_FIELDS
+                           if field not in CATEGORY_MATCH_FIELDS)
+    return category_text, other_text
+
+
+class JobSkillMatcher:
+    """
+    将一次请求的技能和技能类别编译为Aho-Corasick自动机，
+    每个职位只需对拼接后的字段做一次线性扫描
+    """
+
+    def __init__(self, weighted_skills: List[Tuple[str, float]], skill_categories: List[str]):
+        """
+        Args:
+            weighted_skills: 带权重的技能列表 [(技能, 权重), ...]
+            skill_categories: 技能类别名称列表
+        """
+        from utils.skill_matcher import AhoCorasick
+
+        self.skills = [skill for skill, weight in weighted_skills]
+        self.categories = list(skill_categories)
+        self.automaton = AhoCorasick()
+        for i, skill in enumerate(self.skills):
+            self.automaton.add(skill.lower(), ('skill', i))
+        for i, category in enumerate(self.categories):
+            self.automaton.add(category.lower(), ('category', i))
+        self.automaton.build()
+
+    def match(self, job: Dict[str, Any]) -> Tuple[List[str], List[str], int]:
+        """
+        计算单个职位与技能的匹配情况
+
+        Args:
+            job: 职位记录字典
+
+        Returns:
+            (匹配的技能, 匹配的类别, 匹配分数)，匹配分数 = 匹配的技能数量 + 匹配的类别数量*2
+        """
+        return self.match_texts(*job_match_texts(job))
+
+    def match_texts(self, category_text: str, other_text: str) -> Tuple[List[str], List[str], int]:
+        """按job_match_texts预先生成的职位文本计算匹配情况（返回值同match）"""
+        # 类别字段在前、其余技能字段在后；结束位置不超过category_end的命中落在类别字段中
+        category_end = len(category_text)
+
+        skill_hits, category_hits = set(), set()
+        for start, end, (kind, i) in self.automaton.iter_matches(category_text + '\0' + other_text):
+            if kind == 'skill':
+                skill_hits.add(i)
+            elif end <= category_end:
+                category_hits.add(i)
+
+        matched_skills = [skill for i, skill in enumerate(self.skills) if i in skill_hits]
+        matched_categories = [category for i, category in enumerate(self.categories) if i in category_hits]
+        return matched_skills, matched_categories, len(matched_skills) + len(matched_categories) * 2
+
+
+def score_jobs_by_skills(jobs: Iterable[Dict[str, Any]], weighted_skills: List[Tuple[str, float]],
+                         skill_categories: List[str]) -> List[Dict[str, Any]]:
+    """
+    为职位列表添加 matched_skills / matched_categories / match_score 并按匹配分数排序
+
+    Args:
+        jobs: 职位记录字典列表（会被原地更新）
+        weighted_skills: 带权重的技能列表
+        skill_categories: 技能类别名称列表
+
+    Returns:
+        按匹配分数降序排列的职位列表
+    """
+    matcher = JobSkillMatcher(weighted_skills, skill_categories)
+    job_list = []
+    for job in jobs:
+        matched_skills, matched_categories, score = matcher.match(job)
+        job['matched_skills'] = matched_skills
+        job['matched_categories'] = matched_categories
+        job['match_score'] = score
+        job_list.append(job)
+
+    job_list.sort(key=lambda x: x['match_score'], reverse=True)
+    return job_list
+
+
+class SkillBasedRecommender:
+    """基于技能匹配的推荐器，接口与协同过滤推荐器保持一致"""
+
+    def __init__(self, jobs: List[Dict[str, Any]]):
+        """
+        Args:
+            jobs: 候选职位记录列表，需包含id字段
+        """
+        self.jobs = jobs
+        # 各职位用于匹配的小写文本（只生成一次，每次推荐只做自动机扫描）
+        self.job_texts = [(job['id'],) + job_match_texts(job) for job in jobs]
+
+    def recommend(self, skills: List[str], n: int = 10, exclude: Optional[Iterable[Any]] = None,
+                  deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        推荐算法
+
+        Args:
+            skills: 技能列表
+            n: 推荐n个职位
+            exclude: 需要排除的职位ID（如用户已投递的职位）
+            deadline: 截止时间（time.perf_counter()的时间点），超过后停止扫描，返回已扫描职位中的结果
+
+        Returns:
+            推荐列表 [{'job_id': 职位ID, 'score': 匹配分数}, ...]
+        """
+        from utils.skill_taxonomy import classify
+
+        skills = [skill.strip().lower() for skill in skills if skill and skill.strip()]
+        classified = classify(skills)
+        exclude = set(exclude or ())
+        matcher = JobSkillMatcher(classified.weighted_skills, classified.skill_categories)
+
+        rank = []
+        for i, (job_id, category_text, other_text) in enumerate(self.job_texts):
+            if deadline is not None and i and i % DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+                break
+            if job_id in exclude:
+                continue
+            _, _, score = matcher.match_texts(category_text, other_text)
+            if score > 0:
+                rank.append((job_id, score))
+
+        rank.sort(key=lambda x: x[1], reverse=True)
+        return [{'job_id': job_id, 'score': score} for job_id, score in rank[:n]]
@@ -20,6 +20,7 @@ from datetime import datetime
 
 # 导入新的情感分析器
 from utils.emotion_analyzer import EmotionAnalyzer, get_emotion_analyzer, get_emotion_distribution, reset_emotion_stats, get_current_emotion
+from utils.face_tracker import get_face_tracker, release_face_tracker
 
 def convert_expression_results(expressions):
     """
@@ -150,6 +151,8 @@ def analyze_expression():
     
     请求参数:
         - image: Base64编码的图像
+        - session_id: 可选，实时视频流的会话ID；指定时按会话跟踪人脸（每隔若干帧检测一次，
+          人脸变化超过阈值才重新识别），返回平滑后的情绪分数
         
     返回:
         - success: 是否成功
@@ -158,6 +161,7 @@ def analyze_expression():
             - face_count: 检测到的人脸数量
             - expressions: 表情分析结果
             - image: 处理后的图像Base64
+            - tracking: 指定session_id时返回，包含frame_index、detected、inferred_faces
     """
     try:
         # 获取参数
@@ -214,7 +218,15 @@ def analyze_expression():
         # 处理图像
         try:
             current_app.logger.info("开始处理图像...")
-            processed_image, results = analyzer.process_frame(image)
+            tracker = None
+            if data.get('session_id'):
+                tracker = get_face_tracker(
+                    str(data['session_id']),
+                    detect_interval=current_app.config.get('FACE_TRACK_DETECT_INTERVAL', 10),
+                    change_threshold=current_app.config.get('FACE_TRACK_CHANGE_THRESHOLD', 0.06),
+                    smoothing=current_app.config.get('FACE_TRACK_SMOOTHING', 0.4)
+                )
+            processed_image, results = analyzer.process_frame(image, tracker=tracker)
             current_app.logger.info(f"图像处理完成，检测到 {results['face_count']} 个人脸")
             
             if results['face_count'] == 0:
@@ -225,7 +237,8 @@ def analyze_expression():
                     'data': {
                         'face_count': 0,
                         'expressions': [],
-                        'image': None
+                        'image': None,
+                        'tracking': results.get('tracking')
                     }
                 })
         except Exception as e:
@@ -268,6 +281,8 @@ def analyze_expression():
             'expressions': converted_expressions,
             'image': f'data:image/jpeg;base64,{processed_image_base64}'
         }
+        if 'tracking' in results:
+            response_data['tracking'] = results['tracking']
         
         current_app.logger.info(f"表情分析完成，检测到 {results['face_count']} 个人脸")
         
@@ -537,6 +552,21 @@ def reset_stats():
             'message': f'重置情绪分布统计信息失败: {str(e)}'
         }), 500 
 
+@facial_expression_bp.route('/session/<session_id>', methods=['DELETE'])
+def release_session(session_id):
+    """
+    结束实时分析会话，释放该会话的人脸跟踪状态（空闲超时后也会自动释放）
+    
+    返回:
+        - success: 是否成功
+        - message: 消息
+    """
+    released = release_face_tracker(session_id)
+    return jsonify({
+        'success': True,
+        'message': '已释放会话的人脸跟踪状态' if released else '会话不存在或已过期'
+    })
+
 @facial_expression_bp.route('/current-emotion', methods=['GET'])
 def get_current_emotion_api():
     """
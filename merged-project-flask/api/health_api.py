@@ -88,6 +88,12 @@ def system_health():
     """系统资源健康检查"""
     return jsonify(check_system_resources())
 
+@health_bp.route('/health/ner', methods=['GET'])
+def ner_health():
+    """简历实体识别模型就绪状态（加载中或加载失败时返回503）"""
+    ner_status = check_resume_ner()
+    return jsonify(ner_status), 200 if ner_status['status'] == 'healthy' else 503
+
 def get_uptime():
     """获取系统运行时间"""
     try:
@@ -291,6 +297,38 @@ def check_ai_services():
             'message': 'AI services check failed'
         }
 
+def check_resume_ner():
+    """检查简历实体识别模型的加载状态"""
+    try:
+        from utils.resume_ner import get_resume_ner_status
+
+        enabled = current_app.config.get('RESUME_NER_ENABLED', False)
+        model_status = get_resume_ner_status()
+        if not enabled:
+            status = 'disabled'
+        elif model_status['ready']:
+            status = 'healthy'
+        elif model_status['state'] == 'failed':
+            status = 'unhealthy'
+        else:
+            status = 'starting'
+
+        return {
+            'status': status,
+            'enabled': enabled,
+            'preload': current_app.config.get('RESUME_NER_PRELOAD', False),
+            'model': model_status,
+            'message': 'Resume NER model checked'
+        }
+
+    except Exception as e:
+        current_app.logger.error(f"Resume NER check failed: {str(e)}")
+        return {
+            'status': 'unhealthy',
+            'error': str(e),
+            'message': 'Resume NER check failed'
+        }
+
 def check_filesystem():
     """检查文件系统状态"""
     try:
@@ -10,6 +10,8 @@ import os
 import json
 import sqlite3
 import math
+import time
+import threading
 from flask import Blueprint, request, jsonify, current_app, send_from_directory
 from flask_cors import CORS
 
@@ -19,12 +21,219 @@ jobBp = Blueprint('job_api', __name__)
 # 数据库路径
 DB_PATH = 'merged_job_interview.db'
 
+# 薪资范围筛选（单位：K）
+SALARY_RANGES = {
+    '0': (0, 3),
+    '1': (3, 5),
+    '2': (5, 10),
+    '3': (10, 15),
+    '4': (15, 20),
+    '5': (20, 50)
+}
+
+# 工作经验范围筛选（单位：年）
+WORKTIME_RANGES = {
+    '0': (0, 1),
+    '1': (1, 3),
+    '2': (3, 5),
+    '3': (5, 10),
+    '4': (10, 100)
+}
+
+# 公司规模范围筛选（单位：人）
+COMPANY_SIZE_RANGES = {
+    '0': (0, 20),
+    '1': (20, 99),
+    '2': (100, 499),
+    '3': (500, 999),
+    '4': (1000, 9999),
+    '5': (10000, 1000000)
+}
+
 def get_db_connection():
     """获取数据库连接"""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row  # 设置行工厂，使结果可以通过列名访问
     return conn
 
+# 职位表修改计数：由触发器在每次增删改后加一，用于发现对已有职位的编辑
+JOB_VERSION_TABLE = 'tb_job_version'
+JOB_VERSION_EVENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+def ensure_job_version_tracking(cursor):
+    """
+    确保职位修改计数表及触发器存在
+    职位表被删除重建（如重新导入数据）后触发器随之消失，重新创建时计数加一，使重新导入的数据也被视为新版本
+
+    Returns:
+        是否新建了触发器（需要提交）
+    """
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tb_job' AND name LIKE 'tb_job_version_%'")
+    if cursor.fetchone()[0] == len(JOB_VERSION_EVENTS):
+        return False
+
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {JOB_VERSION_TABLE} (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)")
+    cursor.execute(f"INSERT OR IGNORE INTO {JOB_VERSION_TABLE} (id, version) VALUES (1, 0)")
+    for event in JOB_VERSION_EVENTS:
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tb_job_version_{event.lower()} AFTER {event} ON tb_job
+            BEGIN
+                UPDATE {JOB_VERSION_TABLE} SET version = version + 1 WHERE id = 1;
+            END
+        """)
+    cursor.execute(f"UPDATE {JOB_VERSION_TABLE} SET version = version + 1 WHERE id = 1")
+    return True
+
+# 最近一次检查到的职位数据版本及检查时间
+job_data_version = None
+job_data_version_checked_at = 0.0
+
+def get_job_data_version():
+    """
+    职位数据版本（职位数量、最大ID、修改计数），职位表增删改后变化，用于判断内存中的索引是否过期
+    JOB_DATA_VERSION_TTL秒内复用上次的结果，避免每个请求都查询数据库
+    """
+    global job_data_version, job_data_version_checked_at
+    now = time.monotonic()
+    if job_data_version is not None and now - job_data_version_checked_at < current_app.config.get('JOB_DATA_VERSION_TTL', 30):
+        return job_data_version
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    if ensure_job_version_tracking(cursor):
+        conn.commit()
+    cursor.execute(f"SELECT (SELECT COUNT(*) FROM tb_job), (SELECT MAX(id) FROM tb_job), "
+                   f"(SELECT version FROM {JOB_VERSION_TABLE} WHERE id = 1)")
+    version = tuple(cursor.fetchone())
+    conn.close()
+
+    job_data_version, job_data_version_checked_at = version, now
+    return version
+
+# 职位向量索引（首次使用时构建）及其对应的职位数据版本
+job_index = None
+job_index_version = None
+job_index_lock = threading.Lock()
+
+def get_job_index():
+    """
+    获取职位向量索引单例，首次调用或职位数据版本变化时对全部职位编码并重建索引
+    重建持有锁，同一时间只有一个线程重建；已有旧索引时其他请求不等待，继续使用旧索引
+    """
+    global job_index, job_index_version
+    version = get_job_data_version()
+    if job_index is not None and version == job_index_version:
+        return job_index
+    if not job_index_lock.acquire(blocking=job_index is None):
+        return job_index
+    try:
+        if job_index is not None and version == job_index_version:
+            return job_index
+        from algorithm.job_embedding import JobEmbeddingIndex, create_encoder
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM tb_job")
+        jobs = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+
+        encoder = create_encoder(current_app.config.get('JOB_EMBEDDING_MODEL_PATH'),
+                                 current_app.config.get('JOB_EMBEDDING_DIM', 128))
+        index = JobEmbeddingIndex(encoder, n_probe=current_app.config.get('JOB_INDEX_NPROBE', 8)).build(jobs)
+        job_index, job_index_version = index, version
+        print(f"职位向量索引构建完成，职位数量: {len(index)}")
+        return index
+    finally:
+        job_index_lock.release()
+
+# 在线协同过滤模型（仅用于没有预计算结果的新用户）
+cf_model = None
+
+def get_cf_model():
+    """获取在线ItemBasedCF模型单例"""
+    global cf_model
+    if cf_model is None:
+        from algorithm.ItemCF import ItemBasedCF
+        cf_model = ItemBasedCF()
+    return cf_model
+
+# 混合排序器（首次使用时构建）及其对应的职位数据版本
+hybrid_ranker = None
+hybrid_ranker_version = None
+hybrid_ranker_lock = threading.Lock()
+
+def get_hybrid_ranker():
+    """
+    获取混合排序器单例，组合协同过滤、技能匹配、向量检索与热门四路召回；职位数据版本变化时重建
+    重建方式与get_job_index相同：持锁重建，已有旧排序器时其他请求继续使用旧排序器
+    """
+    global hybrid_ranker, hybrid_ranker_version
+    version = get_job_data_version()
+    if hybrid_ranker is not None and version == hybrid_ranker_version:
+        return hybrid_ranker
+    if not hybrid_ranker_lock.acquire(blocking=hybrid_ranker is None):
+        return hybrid_ranker
+    try:
+        if hybrid_ranker is not None and version == hybrid_ranker_version:
+            return hybrid_ranker
+        from algorithm.hybrid_ranker import HybridRanker
+        from algorithm.batch_recommend import RecommendationStore
+        from algorithm.skill_match import SkillBasedRecommender
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM tb_job")
+        jobs = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+
+        cf = get_cf_model()
+        store = RecommendationStore(DB_PATH)
+        skill_recommender = SkillBasedRecommender(jobs)
+        index = get_job_index()
+        cf_k = current_app.config.get('RECOMMENDATION_CF_K', 20)
+
+        def cf_candidates(context, n):
+            user_id = context.get('user_id')
+            if user_id is None:
+                return []
+            hits = store.get(user_id, n)
+            if hits is None and user_id in cf.train_set:
+                hits = cf.recommend(user_id, k=cf_k, n=n)
+            return hits or []
+
+        def skill_candidates(context, n):
+            skills = context.get('skills')
+            return skill_recommender.recommend(skills, n, deadline=context.get('deadline')) if skills else []
+
+        def embedding_candidates(context, n):
+            if context.get('structured_info'):
+                return index.search_resume(context['structured_info'], n)
+            if context.get('text'):
+                return index.search_text(context['text'], n)
+            return []
+
+        ranker = HybridRanker(
+            jobs,
+            generators={'cf': cf_candidates, 'skill': skill_candidates, 'embedding': embedding_candidates},
+            weights=current_app.config.get('HYBRID_RANK_WEIGHTS'),
+            popularity=cf.item_popular,
+            deadline_ms=current_app.config.get('HYBRID_RANK_DEADLINE_MS', 50),
+            n_candidates=current_app.config.get('HYBRID_RANK_CANDIDATES', 200)
+        )
+        hybrid_ranker, hybrid_ranker_version = ranker, version
+        print(f"混合排序器构建完成，职位数量: {len(jobs)}")
+        return ranker
+    finally:
+        hybrid_ranker_lock.release()
+
+def fetch_jobs_by_ids(cursor, job_ids):
+    """按ID批量查询职位，返回 {id: 职位字典}"""
+    if not job_ids:
+        return {}
+    placeholders = ','.join('?' * len(job_ids))
+    cursor.execute(f"SELECT * FROM tb_job WHERE id IN ({placeholders})", list(job_ids))
+    return {row['id']: dict(row) for row in cursor.fetchall()}
+
 # 统一的响应格式
 def create_response(code=200, message="success", data=None):
     """创建统一格式的响应"""
@@ -50,6 +259,9 @@ def index():
                 '/api/provinces',       # 获取省份列表
                 '/api/stats/salary',    # 获取薪资统计
                 '/api/stats/city',      # 获取城市职位数量统计
+                '/api/jobs/recommend-by-resume',  # 基于简历向量检索推荐职位
+                '/api/jobs/recommend/<user_id>',  # 获取用户的预计算推荐
+                '/api/jobs/recommend-hybrid',     # 多路召回+混合排序推荐
                 '/api/test',            # 测试数据库连接
                 '/job/get',             # 原接口：获取职位列表
                 '/job/getWordCut',      # 原接口：获取词云数据
@@ -93,30 +305,15 @@ def get_jobs():
     
     if salary:
         # 根据薪资范围筛选
-        salary_ranges = {
-            '0': (0, 3),
-            '1': (3, 5),
-            '2': (5, 10),
-            '3': (10, 15),
-            '4': (15, 20),
-            '5': (20, 50)
-        }
-        if salary in salary_ranges:
-            min_salary, max_salary = salary_ranges[salary]
+        if salary in SALARY_RANGES:
+            min_salary, max_salary = SALARY_RANGES[salary]
             conditions.append("(salary0 >= ? AND salary0 <= ?)")
             params.extend([min_salary, max_salary])
     
     if worktime:
         # 根据工作经验筛选
-        worktime_ranges = {
-            '0': (0, 1),
-            '1': (1, 3),
-            '2': (3, 5),
-            '3': (5, 10),
-            '4': (10, 100)
-        }
-        if worktime in worktime_ranges:
-            min_work, max_work = worktime_ranges[worktime]
+        if worktime in WORKTIME_RANGES:
+            min_work, max_work = WORKTIME_RANGES[worktime]
             conditions.append("(worktime0 >= ? AND worktime0 <= ?)")
             params.extend([min_work, max_work])
     
@@ -126,16 +323,8 @@ def get_jobs():
     
     if company_size:
         # 根据公司规模筛选
-        size_ranges = {
-            '0': (0, 20),
-            '1': (20, 99),
-            '2': (100, 499),
-            '3': (500, 999),
-            '4': (1000, 9999),
-            '5': (10000, 1000000)
-        }
-        if company_size in size_ranges:
-            min_size, max_size = size_ranges[company_size]
+        if company_size in COMPANY_SIZE_RANGES:
+            min_size, max_size = COMPANY_SIZE_RANGES[company_size]
             conditions.append("(cosize0 >= ? AND cosize0 <= ?)")
             params.extend([min_size, max_size])
     
@@ -415,8 +604,9 @@ def recommend_jobs_by_skills():
     """根据技能推荐相关岗位"""
     try:
         # 导入技能分类工具
-        from utils.skill_classifier import classify_skills, get_weighted_skills, get_skill_categories, get_display_skills
-        
+        from utils.skill_taxonomy import classify
+        from algorithm.skill_match import score_jobs_by_skills
+
         # 获取技能参数
         skills_param = request.args.get('skills', '')
         
@@ -438,10 +628,10 @@ def recommend_jobs_by_skills():
                 'data': None
             })
         
-        # 对技能进行分类和权重处理
-        classified_skills = classify_skills(skills)
-        weighted_skills = get_weighted_skills(skills)
-        skill_categories = get_skill_categories(skills)
+        # 对技能进行分类和权重处理（一次分类，后续复用）
+        classified_skills = classify(skills)
+        weighted_skills = classified_skills.weighted_skills
+        skill_categories = classified_skills.skill_categories
         
         print(f"根据技能推荐岗位: {skills}")
         print(f"技能分类: {skill_categories}")
@@ -517,52 +707,17 @@ def recommend_jobs_by_skills():
         
         # 转换为字典列表
         column_names = [description[0] for description in cursor.description]
-        job_list = []
-        
-        for job in jobs:
-            job_dict = dict(zip(column_names, job))
-            # 添加匹配的技能
-            job_dict['matched_skills'] = []
-            job_dict['matched_categories'] = []
-            
-            # 检查技能匹配
-            for skill, weight in weighted_skills:
-                skill_lower = skill.lower()
-                # 检查更多字段以找出匹配的技能
-                job_fields = [
-                    job_dict.get('position_name', '').lower(),
-                    job_dict.get('education', '').lower(),
-                    job_dict.get('welfare', '').lower(),
-                    job_dict.get('company_name', '').lower(),
-                    job_dict.get('coattr', '').lower()
-                ]
-                
-                if any(skill_lower in field for field in job_fields if field):
-                    job_dict['matched_skills'].append(skill)
-            
-            # 检查类别匹配
-            for category in skill_categories:
-                category_lower = category.lower()
-                # 检查职位名称和公司属性是否匹配类别
-                if (category_lower in job_dict.get('position_name', '').lower() or 
-                    category_lower in job_dict.get('coattr', '').lower() or
-                    category_lower in job_dict.get('welfare', '').lower()):
-                    job_dict['matched_categories'].append(category)
-            
-            # 添加匹配分数：匹配的技能数量 + 匹配的类别数量*2
-            job_dict['match_score'] = len(job_dict['matched_skills']) + len(job_dict['matched_categories']) * 2
-            
-            job_list.append(job_dict)
-        
-        # 按匹配分数排序
-        job_list.sort(key=lambda x: x['match_score'], reverse=True)
+
+        # 检查技能和类别匹配，添加匹配分数并按匹配分数排序
+        job_list = score_jobs_by_skills((dict(zip(column_names, job)) for job in jobs),
+                                        weighted_skills, skill_categories)
         
         conn.close()
         
         print(f"返回岗位数量: {len(job_list)}")
         
         # 获取用于显示的技能信息
-        display_skills = get_display_skills(skills)
+        display_skills = classified_skills.display
         
         return jsonify({
             'code': 200,
@@ -587,6 +742,191 @@ def recommend_jobs_by_skills():
             'data': None
         })
 
+@jobBp.route('/api/jobs/recommend-by-resume', methods=['POST'])
+def recommend_jobs_by_resume():
+    """
+    基于简历向量检索推荐职位
+
+    请求参数:
+        structured_info: 简历结构化信息（ResumeNER.extract_structured_info的结果）
+        text: 简历文本，未提供structured_info时直接作为查询文本
+        k: 返回数量，默认10
+    """
+    try:
+        data = request.get_json() or {}
+        structured_info = data.get('structured_info')
+        text = data.get('text', '')
+        k = int(data.get('k', 10))
+
+        if not structured_info and not text:
+            return jsonify({
+                'code': 400,
+                'message': '缺少structured_info或text参数',
+                'data': None
+            })
+
+        index = get_job_index()
+        if structured_info:
+            hits = index.search_resume(structured_info, k)
+        else:
+            hits = index.search_text(text, k)
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        jobs_by_id = fetch_jobs_by_ids(cursor, [hit['job_id'] for hit in hits])
+        conn.close()
+
+        job_list = []
+        for hit in hits:
+            job = jobs_by_id.get(hit['job_id'])
+            if job:
+                job['similarity'] = round(hit['score'], 4)
+                job_list.append(job)
+
+        return jsonify({
+            'code': 200,
+            'message': '获取推荐岗位成功',
+            'data': {
+                'list': job_list,
+                'total': len(job_list)
+            }
+        })
+
+    except Exception as e:
+        print(f"向量检索推荐岗位失败: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+        return jsonify({
+            'code': 500,
+            'message': f"服务器错误: {str(e)}",
+            'data': None
+        })
+
+@jobBp.route('/api/jobs/recommend/<int:user_id>', methods=['GET'])
+def recommend_jobs_for_user(user_id):
+    """
+    获取用户的职位推荐
+
+    优先读取批量任务预计算的结果（一次主键查找），
+    仅对没有预计算结果的新用户走在线协同过滤
+
+    请求参数:
+        n: 返回数量，默认10
+    """
+    try:
+        from algorithm.batch_recommend import RecommendationStore
+
+        n = int(request.args.get('n', 10))
+        hits = RecommendationStore(DB_PATH).get(user_id, n)
+        source = 'precomputed'
+        if hits is None:
+            hits = get_cf_model().recommend(user_id, k=current_app.config.get('RECOMMENDATION_CF_K', 20), n=n)
+            source = 'online'
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        jobs_by_id = fetch_jobs_by_ids(cursor, [hit['job_id'] for hit in hits])
+        conn.close()
+
+        job_list = []
+        for hit in hits:
+            job = jobs_by_id.get(hit['job_id'])
+            if job:
+                job['score'] = round(hit['score'], 4)
+                job_list.append(job)
+
+        return jsonify({
+            'code': 200,
+            'message': '获取推荐岗位成功',
+            'data': {
+                'list': job_list,
+                'total': len(job_list),
+                'source': source
+            }
+        })
+
+    except Exception as e:
+        print(f"获取用户推荐失败: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+        return jsonify({
+            'code': 500,
+            'message': f"服务器错误: {str(e)}",
+            'data': None
+        })
+
+@jobBp.route('/api/jobs/recommend-hybrid', methods=['POST'])
+def recommend_jobs_hybrid():
+    """
+    多路召回+混合排序推荐职位
+
+    请求参数:
+        user_id: 用户ID（协同过滤召回）
+        skills: 技能列表（技能匹配召回）
+        structured_info / text: 简历结构化信息或文本（向量检索召回）
+        city / salary / worktime / education: 硬性约束，取值与 /api/jobs 的筛选参数一致
+        n: 返回数量，默认10
+    """
+    try:
+        data = request.get_json() or {}
+        n = int(data.get('n', 10))
+
+        skills = data.get('skills') or []
+        if isinstance(skills, str):
+            skills = [skill.strip() for skill in skills.split(',') if skill.strip()]
+
+        context = {
+            'user_id': data.get('user_id'),
+            'skills': skills,
+            'structured_info': data.get('structured_info'),
+            'text': data.get('text', '')
+        }
+        constraints = {
+            'city': data.get('city'),
+            'salary_range': SALARY_RANGES.get(str(data.get('salary', ''))),
+            'worktime_range': WORKTIME_RANGES.get(str(data.get('worktime', ''))),
+            'education': data.get('education')
+        }
+
+        ranker = get_hybrid_ranker()
+        hits, stats = ranker.rank(context, n, constraints)
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        jobs_by_id = fetch_jobs_by_ids(cursor, [hit['job_id'] for hit in hits])
+        conn.close()
+
+        job_list = []
+        for hit in hits:
+            job = jobs_by_id.get(hit['job_id'])
+            if job:
+                job['score'] = round(hit['score'], 4)
+                job['features'] = {name: round(value, 4) for name, value in hit['features'].items()}
+                job_list.append(job)
+
+        return jsonify({
+            'code': 200,
+            'message': '获取推荐岗位成功',
+            'data': {
+                'list': job_list,
+                'total': len(job_list),
+                'stats': stats
+            }
+        })
+
+    except Exception as e:
+        print(f"混合排序推荐岗位失败: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+        return jsonify({
+            'code': 500,
+            'message': f"服务器错误: {str(e)}",
+            'data': None
+        })
+
 @jobBp.route('/api/job/analyze', methods=['POST', 'OPTIONS'])
 def analyze_job():
     """分析岗位信息并提供与简历匹配的建议"""
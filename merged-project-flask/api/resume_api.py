@@ -6,9 +6,10 @@
 提供AI简历生成、解析和实体识别功能
 """
 
+import io
 import json
 import base64
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 import time
 import requests
 from datetime import datetime
@@ -28,6 +29,9 @@ from api.common import allowed_file
 
 # 导入简历实体识别模块
 from utils.resume_ner import get_resume_ner
+from utils.skill_matcher import get_skill_matcher, SOURCE_KEYWORD
+from utils.text_normalizer import clean_compact
+from utils.docx_stream import docx_text, read_docx_properties
 
 # 创建蓝图
 resumeBp = Blueprint('resume', __name__)
@@ -118,61 +122,85 @@ def generate_resume(text, appid, apikey, apisecret):
     response = requests.post(url, json=content, headers={'content-type': "application/json"}).text
     return response
 
-# 从URL下载文档并提取文本
-def extract_text_from_url(document_url):
+# 文档下载会话（带重试，进程内复用连接）
+_download_session = None
+
+def get_download_session():
+    """获取下载文档用的requests会话（连接失败时重试3次）"""
+    global _download_session
+    if _download_session is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.5))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _download_session = session
+    return _download_session
+
+# 流式下载文档到内存
+def download_document(document_url, max_bytes=None, timeout=None):
     """
-    从URL下载文档并提取文本内容
-
+    流式下载文档到内存，超过大小上限时立即中止
+    
     Args:
         document_url: 文档URL
-
+        max_bytes: 大小上限，默认使用配置DOCUMENT_DOWNLOAD_MAX_BYTES
+        timeout: (连接超时, 读取超时)，默认使用配置DOCUMENT_DOWNLOAD_TIMEOUT
+        
     Returns:
-        提取的文本内容，失败时返回None
+        文档内容（bytes）
+        
+    Raises:
+        requests.exceptions.RequestException: 下载失败
+        ValueError: 文档超过大小上限
     """
-    try:
-        print(f"开始从URL下载文档: {document_url}")
+    max_bytes = max_bytes or current_app.config.get('DOCUMENT_DOWNLOAD_MAX_BYTES', 16 * 1024 * 1024)
+    timeout = timeout or current_app.config.get('DOCUMENT_DOWNLOAD_TIMEOUT', (5, 30))
 
-        # 下载文档
-        response = requests.get(document_url, timeout=30)
+    with get_download_session().get(document_url, stream=True, timeout=timeout) as response:
         response.raise_for_status()
 
-        # 创建临时文件
-        import tempfile
-        import os
+        # 服务端声明了大小时先检查，避免开始下载
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise ValueError(f"文档大小{int(content_length)}字节超过上限{max_bytes}字节")
 
-        # 根据URL判断文件类型
-        file_extension = '.docx'
-        if document_url.lower().endswith('.pdf'):
-            file_extension = '.pdf'
-        elif document_url.lower().endswith('.doc'):
-            file_extension = '.doc'
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"文档大小超过上限{max_bytes}字节")
+            chunks.append(chunk)
+    return b''.join(chunks)
 
-        # 保存到临时文件
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            temp_file.write(response.content)
-            temp_file_path = temp_file.name
+# 从URL下载文档并提取文本
+def extract_text_from_url(document_url):
+    """
+    从URL下载文档并提取文本内容（全程在内存中处理，不写临时文件）
 
-        print(f"文档已下载到临时文件: {temp_file_path}")
+    Args:
+        document_url: 文档URL
 
-        # 提取文本
-        try:
-            # 导入文本提取模块
-            sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts/workflow'))
-            import document_text_extractor
+    Returns:
+        提取的文本内容，失败时返回None
+    """
+    try:
+        print(f"开始从URL下载文档: {document_url}")
+        data = download_document(document_url)
+        print(f"文档下载完成，大小: {len(data)} 字节")
 
-            # 提取文本
-            text_content = document_text_extractor.extract_text_from_document(temp_file_path)
-            print(f"成功提取文本，长度: {len(text_content) if text_content else 0}")
+        # 导入文本提取模块
+        sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts/workflow'))
+        import document_text_extractor
 
-            return text_content
+        # 按文件头判断类型（URL没有扩展名时默认按扩展名兜底）
+        text_content = document_text_extractor.extract_text_from_bytes(data, document_url)
+        print(f"成功提取文本，长度: {len(text_content) if text_content else 0}")
 
-        finally:
-            # 清理临时文件
-            try:
-                os.unlink(temp_file_path)
-                print(f"临时文件已删除: {temp_file_path}")
-            except Exception as cleanup_error:
-                print(f"删除临时文件失败: {cleanup_error}")
+        return text_content
 
     except Exception as e:
         print(f"从URL提取文本失败: {str(e)}")
@@ -190,25 +218,22 @@ def extract_skills_fallback(text):
     Returns:
         提取的技能列表
     """
-    skills = set()
-    text_lower = text.lower()
-
-    # 常见技能关键词
-    skill_keywords = [
-        'python', 'java', 'javascript', 'php', 'c++', 'c#', 'go', 'rust',
-        'html', 'css', 'react', 'vue', 'angular', 'node.js', 'express',
-        'django', 'flask', 'spring', 'mysql', 'postgresql', 'mongodb',
-        'redis', 'docker', 'kubernetes', 'aws', 'azure', 'git', 'linux',
-        '机器学习', '深度学习', '数据分析', '人工智能', '大数据',
-        '前端开发', '后端开发', '全栈开发', '移动开发', '测试',
-        '项目管理', '团队协作', '沟通能力', '问题解决'
-    ]
-
-    for keyword in skill_keywords:
-        if keyword in text_lower:
-            skills.add(keyword)
-
-    return list(skills)
+    # 常见技能关键词（FALLBACK_SKILL_KEYWORDS）已编译进技能匹配自动机，一次扫描即可找出全部命中
+    skills = get_skill_matcher().find_skills(text, (SOURCE_KEYWORD,))
+
+    return skills
+
+# 按应用配置获取简历实体识别实例
+def get_configured_resume_ner():
+    """
+    按应用配置（RESUME_NER_ENABLED、RESUME_NER_MODEL_PATH）获取NER实例，各接口共用同一模型路径
+    
+    Returns:
+        ResumeNER实例或NERServiceClient，未启用简历实体识别功能时返回None
+    """
+    if not current_app.config.get('RESUME_NER_ENABLED', False):
+        return None
+    return get_resume_ner(current_app.config.get('RESUME_NER_MODEL_PATH', None))
 
 # 使用RANER模型分析简历文本
 def analyze_resume_text(text):
@@ -222,17 +247,12 @@ def analyze_resume_text(text):
         提取的结构化信息
     """
     try:
-        # 检查是否启用了简历实体识别功能
-        if not current_app.config.get('RESUME_NER_ENABLED', False):
+        # 获取NER实例（检查是否启用了简历实体识别功能）
+        resume_ner = get_configured_resume_ner()
+        if resume_ner is None:
             print("简历实体识别功能未启用")
             return None
         
-        # 获取模型路径
-        model_path = current_app.config.get('RESUME_NER_MODEL_PATH', None)
-        
-        # 获取NER实例
-        resume_ner = get_resume_ner(model_path)
-        
         # 提取结构化信息
         structured_info = resume_ner.extract_structured_info(text)
         
@@ -250,52 +270,19 @@ def extract_text_from_docx(file_path):
     从Word文档中提取文本
     
     Args:
-        file_path: Word文档的本地路径
+        file_path: Word文档的本地路径，或内存中的文件对象（io.BytesIO）
         
     Returns:
-        提取的文本内容，包括段落、表格和元数据
+        提取的文本内容（段落和表格按文档顺序），以及文档属性
     """
     try:
-        print(f"正在从Word文档提取文本: {file_path}")
-        
-        # 打开Word文档
-        from docx import Document
-        doc = Document(file_path)
-        
-        # 提取文档属性
-        doc_properties = {
-            'title': doc.core_properties.title or '',
-            'author': doc.core_properties.author or '',
-            'created': str(doc.core_properties.created) if doc.core_properties.created else '',
-            'modified': str(doc.core_properties.modified) if doc.core_properties.modified else '',
-            'last_modified_by': doc.core_properties.last_modified_by or ''
-        }
+        print(f"正在从Word文档提取文本: {file_path if isinstance(file_path, str) else '内存文档'}")
         
-        # 提取段落文本
-        paragraphs = []
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            if text:
-                paragraphs.append(text)
+        # 流式解析document.xml（不构建python-docx对象模型），段落和表格按文档顺序合并，合并单元格只保留一次
+        all_text = docx_text(file_path, paragraph_separator='\n\n')
         
-        # 提取表格文本
-        tables = []
-        for table in doc.tables:
-            table_data = []
-            for row in table.rows:
-                row_data = []
-                for cell in row.cells:
-                    # 获取单元格中的所有段落文本
-                    cell_text = '\n'.join([p.text.strip() for p in cell.paragraphs if p.text.strip()])
-                    if cell_text:
-                        row_data.append(cell_text)
-                if row_data:
-                    table_data.append(' | '.join(row_data))
-            if table_data:
-                tables.append('\n'.join(table_data))
-        
-        # 合并所有文本
-        all_text = '\n\n'.join(paragraphs + tables)
+        # 提取文档属性（docProps/core.xml）
+        doc_properties = read_docx_properties(file_path)
         
         return all_text, doc_properties
     
@@ -315,20 +302,7 @@ def clean_text(text):
     Returns:
         清理后的文本
     """
-    if not text:
-        return ""
-    
-    # 替换多个连续的空白字符为单个空格
-    import re
-    text = re.sub(r'\s+', ' ', text)
-    
-    # 去除特殊字符
-    text = re.sub(r'[^\w\s\u4e00-\u9fff,.，。:：;；!！?？、""''（）()【】[\]{}]', '', text)
-    
-    # 去除首尾空白
-    text = text.strip()
-    
-    return text
+    return clean_compact(text)
 
 # 解析简历API返回的数据，提取所有简历模板链接
 def parse_resume_api_response(response_data: str) -> List[Dict[str, str]]:
@@ -428,23 +402,6 @@ def get_recommended_jobs(resume_info: Dict[str, Any], api_url: str = None) -> Li
         print(f"获取推荐职位时发生错误: {str(e)}")
         return []
 
-# 临时文件管理器
-class TempFile:
-    def __init__(self, file_path):
-        self.file_path = file_path
-        self.is_temp = False
-    
-    def __enter__(self):
-        return self
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.is_temp and self.file_path and os.path.exists(self.file_path):
-            try:
-                os.remove(self.file_path)
-                print(f"临时文件已删除: {self.file_path}")
-            except Exception as e:
-                print(f"删除临时文件失败: {str(e)}")
-
 @resumeBp.route('/resume/generate', methods=['POST'])
 def generate_ai_resume():
     """
@@ -663,153 +620,115 @@ def process_resume_doc():
     返回:
         提取的实体信息
     """
-    temp_file_path = None
-    
     try:
         data = request.get_json()
         
         # 获取请求参数
         resume_url = data.get('resumeUrl', '')
         
-        # 使用临时文件上下文管理器
-        with TempFile(None) as temp_file:
-            if not resume_url:
-                # 如果没有提供URL，使用默认文档路径
-                doc_path = 'D:/zp/test_docs/f4a63f81-738b-4c54-ad18-88f1990fe52d.docx'
-                print(f"未提供简历URL，使用默认文档: {doc_path}")
-                
-                # 检查文件是否存在
-                if not os.path.exists(doc_path):
-                    return jsonify({
-                        'code': 404,
-                        'message': f'文件不存在: {doc_path}',
-                        'data': None
-                    })
-                
-                temp_file.file_path = doc_path
-            else:
-                # 下载指定URL的文档
-                print(f"准备下载简历文档: {resume_url}")
-                
-                # 创建临时文件
-                import tempfile
-                
-                temp_dir = tempfile.gettempdir()
-                file_name = f"resume_{int(time.time())}.docx"
-                temp_file.file_path = os.path.join(temp_dir, file_name)
-                temp_file.is_temp = True
-                
-                # 下载文件
-                try:
-                    # 设置超时和重试
-                    from requests.adapters import HTTPAdapter
-                    from requests.packages.urllib3.util.retry import Retry
-                    
-                    session = requests.Session()
-                    retry = Retry(total=3, backoff_factor=0.5)
-                    adapter = HTTPAdapter(max_retries=retry)
-                    session.mount('http://', adapter)
-                    session.mount('https://', adapter)
-                    
-                    response = session.get(resume_url, stream=True, timeout=(5, 30))  # 连接超时5秒，读取超时30秒
-                    response.raise_for_status()  # 如果请求失败，抛出异常
-                    
-                    with open(temp_file.file_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                    
-                    print(f"文档下载成功，保存至: {temp_file.file_path}")
-                except requests.exceptions.RequestException as e:
-                    print(f"下载文档失败: {str(e)}")
-                    return jsonify({
-                        'code': 500,
-                        'message': f"下载文档失败: {str(e)}",
-                        'data': None
-                    })
-            
-            # 从Word文档提取文本
-            text, doc_properties = extract_text_from_docx(temp_file.file_path)
+        if not resume_url:
+            # 如果没有提供URL，使用默认文档路径
+            doc_path = 'D:/zp/test_docs/f4a63f81-738b-4c54-ad18-88f1990fe52d.docx'
+            print(f"未提供简历URL，使用默认文档: {doc_path}")
             
-            if not text:
+            # 检查文件是否存在
+            if not os.path.exists(doc_path):
                 return jsonify({
-                    'code': 500,
-                    'message': "提取文本失败或文档为空",
+                    'code': 404,
+                    'message': f'文件不存在: {doc_path}',
                     'data': None
                 })
             
-            # 文本预处理：分段处理长文本
-            max_text_length = 5000  # 最大文本长度
-            if len(text) > max_text_length:
-                print(f"文本过长({len(text)}字符)，将进行分段处理")
-                # 简单分段策略：按段落分割
-                segments = text.split('\n\n')
-                processed_segments = []
-                current_segment = ""
-                
-                for segment in segments:
-                    if len(current_segment) + len(segment) < max_text_length:
-                        current_segment += segment + '\n\n'
-                    else:
-                        processed_segments.append(current_segment)
-                        current_segment = segment + '\n\n'
-                
-                if current_segment:
-                    processed_segments.append(current_segment)
-                
-                # 处理每个分段并合并结果
-                all_entities = []
-                for i, segment in enumerate(processed_segments):
-                    print(f"处理分段 {i+1}/{len(processed_segments)}")
-                    segment_entities = analyze_resume_text(segment)
-                    if segment_entities:
-                        if not all_entities:
-                            all_entities = segment_entities
-                        else:
-                            # 合并实体列表
-                            for key, values in segment_entities.items():
-                                if key == 'raw_entities':
-                                    all_entities[key].extend(values)
-                                elif isinstance(values, list):
-                                    all_entities[key].extend(values)
-                
-                entities = all_entities
-            else:
-                # 使用RANER模型提取实体
-                entities = analyze_resume_text(text)
-            
-            if entities is None:
+            doc_source = doc_path
+        else:
+            # 下载指定URL的文档到内存，不写临时文件
+            print(f"准备下载简历文档: {resume_url}")
+            try:
+                content = download_document(resume_url)
+                print(f"文档下载成功，大小: {len(content)} 字节")
+                doc_source = io.BytesIO(content)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"下载文档失败: {str(e)}")
                 return jsonify({
                     'code': 500,
-                    'message': '实体提取失败',
+                    'message': f"下载文档失败: {str(e)}",
                     'data': None
                 })
+        
+        # 从Word文档提取文本
+        text, doc_properties = extract_text_from_docx(doc_source)
+        
+        if not text:
+            return jsonify({
+                'code': 500,
+                'message': "提取文本失败或文档为空",
+                'data': None
+            })
+        
+        # 文本预处理：分段处理长文本
+        max_text_length = 5000  # 最大文本长度
+        if len(text) > max_text_length:
+            print(f"文本过长({len(text)}字符)，将进行分段处理")
+            # 简单分段策略：按段落分割
+            segments = text.split('\n\n')
+            processed_segments = []
+            current_segment = ""
+            
+            for segment in segments:
+                if len(current_segment) + len(segment) < max_text_length:
+                    current_segment += segment + '\n\n'
+                else:
+                    processed_segments.append(current_segment)
+                    current_segment = segment + '\n\n'
+            
+            if current_segment:
+                processed_segments.append(current_segment)
+            
+            # 处理每个分段并合并结果
+            all_entities = []
+            for i, segment in enumerate(processed_segments):
+                print(f"处理分段 {i+1}/{len(processed_segments)}")
+                segment_entities = analyze_resume_text(segment)
+                if segment_entities:
+                    if not all_entities:
+                        all_entities = segment_entities
+                    else:
+                        # 合并实体列表
+                        for key, values in segment_entities.items():
+                            if key == 'raw_entities':
+                                all_entities[key].extend(values)
+                            elif isinstance(values, list):
+                                all_entities[key].extend(values)
             
-            # 返回结果
+            entities = all_entities
+        else:
+            # 使用RANER模型提取实体
+            entities = analyze_resume_text(text)
+        
+        if entities is None:
             return jsonify({
-                'code': 0,
-                'message': '简历处理成功',
-                'data': {
-                    'text': text[:1000] + ('...' if len(text) > 1000 else ''),  # 限制返回文本长度
-                    'text_length': len(text),
-                    'entities': entities,
-                    'doc_properties': doc_properties
-                }
+                'code': 500,
+                'message': '实体提取失败',
+                'data': None
             })
-    
+        
+        # 返回结果
+        return jsonify({
+            'code': 0,
+            'message': '简历处理成功',
+            'data': {
+                'text': text[:1000] + ('...' if len(text) > 1000 else ''),  # 限制返回文本长度
+                'text_length': len(text),
+                'entities': entities,
+                'doc_properties': doc_properties
+            }
+        })
+
     except Exception as e:
         import traceback
         print(f"服务器错误: {str(e)}")
         print(traceback.format_exc())
         
-        # 确保清理临时文件
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-                print(f"临时文件已删除: {temp_file_path}")
-            except:
-                pass
-        
         return jsonify({
             'code': 500,
             'message': f"服务器错误: {str(e)}",
@@ -1077,6 +996,92 @@ def extract_text():
             'data': None
         }), 500
 
+@resumeBp.route('/extract_text/stream', methods=['POST'])
+def extract_text_stream():
+    """
+    从上传的文件中逐页提取文本并识别实体（NDJSON流式响应）
+
+    每解析完一页就返回一行 {"event": "page", ...}（该页文本、实体和技能），
+    大文件不必等全部页面解析完成；最后返回 {"event": "done", ...}（合并后的技能和统计信息），
+    出错时返回 {"event": "error", "message": ...}
+    """
+    if 'file' not in request.files or request.files['file'].filename == '':
+        return jsonify({
+            'success': False,
+            'message': '没有选择文件',
+            'data': None
+        }), 400
+
+    file = request.files['file']
+    if not allowed_file(file.filename):
+        return jsonify({
+            'success': False,
+            'message': '文件类型不允许，请上传PDF或Word文档',
+            'data': None
+        }), 400
+
+    filename = secure_filename(file.filename)
+    unique_filename = f"{int(time.time())}_{filename}"
+    file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
+    file.save(file_path)
+    with_tables = request.form.get('with_tables', 'false').lower() == 'true'
+    print(f"文件已保存为: {file_path}，开始逐页提取")
+
+    def generate():
+        start_time = time.time()
+        page_infos = []
+        text_length = 0
+        ner_error_message = None
+        try:
+            sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts/workflow'))
+            import document_text_extractor
+            from utils.resume_ner import iter_structured_info, merge_structured_info
+
+            pages = document_text_extractor.iter_document_pages(file_path, with_tables=with_tables)
+            try:
+                resume_ner = get_configured_resume_ner()
+                if resume_ner is None:
+                    raise RuntimeError('简历实体识别功能未启用')
+                page_iter = iter_structured_info(resume_ner, pages)
+            except Exception as e:
+                # 模型不可用时仍逐页返回文本，技能使用降级方法提取
+                ner_error_message = str(e)
+                print(f"NER不可用，使用降级技能提取: {ner_error_message}")
+                page_iter = ({'page_no': page_no, 'text': text, 'skills': extract_skills_fallback(text)}
+                             for page_no, text, _ in pages if text)
+
+            for page_info in page_iter:
+                # 合并结果只需要实体和技能，页面文本返回后即释放
+                page_text = page_info.pop('text')
+                page_infos.append(page_info)
+                text_length += len(page_text)
+                yield json.dumps({
+                    'event': 'page',
+                    'page_no': page_info['page_no'],
+                    'text': page_text,
+                    'entities': page_info.get('raw_entities', []),
+                    'skills': page_info.get('skills', []),
+                    'elapsed_ms': round((time.time() - start_time) * 1000, 1)
+                }, ensure_ascii=False) + '\n'
+
+            merged = merge_structured_info(page_infos)
+            yield json.dumps({
+                'event': 'done',
+                'filename': filename,
+                'page_count': len(page_infos),
+                'text_length': text_length,
+                'skills': merged['skills'],
+                'ner_success': ner_error_message is None,
+                'ner_error': ner_error_message,
+                'elapsed_ms': round((time.time() - start_time) * 1000, 1)
+            }, ensure_ascii=False) + '\n'
+            print(f"逐页提取完成: {len(page_infos)}页，技能{len(merged['skills'])}个")
+        except Exception as e:
+            traceback.print_exc()
+            yield json.dumps({'event': 'error', 'message': f"文本提取失败: {str(e)}"}, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @resumeBp.route('/workflow/star', methods=['POST', 'OPTIONS'])
 def star_workflow_api():
     """
@@ -43,6 +43,25 @@ def create_app(config_class=Config):
     app.config['RESUME_NER_MODEL_PATH'] = os.path.join(app.root_path, 'models', 'nlp', 'raner_resume')
     app.config['RESUME_NER_ENABLED'] = True
     
+    # 配置简历实体识别的推理后端（PyTorch或ONNX Runtime）
+    if app.config['RESUME_NER_ENABLED']:
+        from utils.resume_ner import configure_resume_ner
+        configure_resume_ner(app.config.get('RESUME_NER_BACKEND', 'pytorch'),
+                             app.config.get('RESUME_NER_ONNX_PATH'),
+                             app.config.get('RESUME_NER_ONNX_THREADS', 0))
+    
+    # 使用独立的NER服务进程时，worker只保留轻量客户端，不再各自加载模型
+    # （socket路径和认证密钥由gunicorn master写入环境变量，未通过gunicorn启动时在此报错）
+    ner_service_enabled = app.config['RESUME_NER_ENABLED'] and app.config.get('RESUME_NER_SERVICE_ENABLED', False)
+    if ner_service_enabled:
+        from utils.resume_ner import configure_resume_ner_service
+        configure_resume_ner_service(app.config['RESUME_NER_SERVICE_SOCKET'] or None, required=True)
+    
+    # 在后台线程预加载简历实体识别模型（gunicorn未开启preload，create_app已在各worker进程中执行）
+    if app.config['RESUME_NER_ENABLED'] and app.config.get('RESUME_NER_PRELOAD', False) and not ner_service_enabled:
+        from utils.resume_ner import preload_resume_ner
+        preload_resume_ner(app.config['RESUME_NER_MODEL_PATH'])
+    
     # 启用CORS
     CORS(app, resources={
         r"/api/*": {
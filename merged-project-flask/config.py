@@ -22,6 +22,8 @@ DEBUG = True
 UPLOAD_FOLDER = os.path.join(basedir, 'static/uploads')
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 最大上传16MB
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'doc', 'docx'}
+DOCUMENT_DOWNLOAD_MAX_BYTES = MAX_CONTENT_LENGTH  # 从URL下载简历文档的大小上限（与上传上限一致）
+DOCUMENT_DOWNLOAD_TIMEOUT = (5, 30)  # 下载文档的连接/读取超时（秒）
 
 # 外部访问配置
 # 设置为Nginx服务的域名或IP，例如：http://example.com 或 http://192.168.1.100
@@ -39,6 +41,38 @@ XF_API_KEY = os.getenv('XUNFEI_API_KEY', 'your-api-key')
 # RANER模型配置
 RESUME_NER_MODEL_ID = 'damo/nlp_raner_named-entity-recognition_chinese-base-resume'
 RESUME_NER_ENABLED = True  # 是否启用简历实体识别功能
+RESUME_NER_PRELOAD = os.getenv('RESUME_NER_PRELOAD', 'false').lower() == 'true'  # worker启动后是否在后台线程预加载简历实体识别模型（每个worker各加载一份，默认关闭，首次请求时加载）
+RESUME_NER_BACKEND = os.getenv('RESUME_NER_BACKEND', 'pytorch')  # 推理后端：pytorch 或 onnx（int8量化，需先导出）
+RESUME_NER_ONNX_PATH = os.path.join(basedir, 'models', 'nlp', 'raner_resume_onnx')  # ONNX模型导出目录
+RESUME_NER_ONNX_THREADS = int(os.getenv('RESUME_NER_ONNX_THREADS', '2'))  # 每个worker的ONNX Runtime线程数，0表示自动
+RESUME_NER_SERVICE_ENABLED = os.getenv('RESUME_NER_SERVICE_ENABLED', 'false').lower() == 'true'  # 是否由独立服务进程统一推理（仅gunicorn部署，由gunicorn.conf.py启动）
+RESUME_NER_SERVICE_SOCKET = os.getenv('RESUME_NER_SERVICE_SOCKET', '')  # NER服务的Unix socket路径，为空时在启动时创建的私有临时目录中
+RESUME_NER_SERVICE_MAX_BATCH = 16  # NER服务单个微批次最多合并的请求数
+RESUME_NER_SERVICE_MAX_WAIT_MS = 10  # NER服务收到请求后等待合并更多请求的最长时间（毫秒）
+
+# 情绪识别模型配置
+EMOTION_BACKEND = os.getenv('EMOTION_BACKEND', 'pytorch')  # 推理后端：pytorch、torchscript 或 onnx（int8量化，需先导出）
+EMOTION_EXPORT_PATH = os.path.join(basedir, 'weights', 'emotion_export')  # TorchScript/ONNX模型导出目录
+EMOTION_NUM_THREADS = int(os.getenv('EMOTION_NUM_THREADS', '2'))  # 每个worker的推理线程数，0表示自动
+FACE_TRACK_DETECT_INTERVAL = 10  # 带session_id的实时分析每隔多少帧做一次完整人脸检测，其余帧用光流跟踪
+FACE_TRACK_CHANGE_THRESHOLD = 0.06  # 人脸缩略图平均灰度差（0~1）超过该值才重新识别情绪
+FACE_TRACK_SMOOTHING = 0.4  # 情绪分数指数滑动平均中新结果的权重
+
+# 职位向量检索配置
+JOB_EMBEDDING_MODEL_PATH = os.path.join(basedir, 'models', 'nlp', 'job_embedding')  # 本地句向量模型，不存在时使用TF-IDF+SVD
+JOB_EMBEDDING_DIM = 128  # TF-IDF+SVD向量维度
+JOB_INDEX_NPROBE = 8  # IVF索引查询时探查的聚类数量
+JOB_DATA_VERSION_TTL = 30  # 职位数据版本的检查间隔（秒），间隔内复用上次结果，版本变化后重建职位索引与混合排序器
+
+# 批量推荐预计算配置
+RECOMMENDATION_MODEL_DIR = os.path.join(basedir, 'models', 'recommend', 'itemcf')  # 内存映射的协同过滤模型目录
+RECOMMENDATION_TOP_N = 50  # 每个用户预计算的推荐数量
+RECOMMENDATION_CF_K = 20  # 每个职位使用的近邻数量，预计算与在线协同过滤共用
+
+# 混合排序配置
+HYBRID_RANK_WEIGHTS = {'cf': 0.4, 'skill': 0.3, 'embedding': 0.2, 'popularity': 0.1}  # 线性融合权重
+HYBRID_RANK_DEADLINE_MS = 50  # 单次排序的时间预算（毫秒），超时后跳过剩余召回，技能匹配召回在扫描中途返回
+HYBRID_RANK_CANDIDATES = 200  # 每路召回的候选数量
 
 # DeepSeek API配置
 DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY', 'your-deepseek-api-key')
@@ -58,6 +92,8 @@ class Config:
     # 上传文件配置
     UPLOAD_FOLDER = UPLOAD_FOLDER
     MAX_CONTENT_LENGTH = MAX_CONTENT_LENGTH
+    DOCUMENT_DOWNLOAD_MAX_BYTES = DOCUMENT_DOWNLOAD_MAX_BYTES
+    DOCUMENT_DOWNLOAD_TIMEOUT = DOCUMENT_DOWNLOAD_TIMEOUT
     
     # 外部访问配置
     EXTERNAL_URL_BASE = EXTERNAL_URL_BASE
@@ -73,6 +109,36 @@ class Config:
     # RANER模型配置
     RESUME_NER_MODEL_ID = RESUME_NER_MODEL_ID
     RESUME_NER_ENABLED = RESUME_NER_ENABLED
+    RESUME_NER_PRELOAD = RESUME_NER_PRELOAD
+    RESUME_NER_BACKEND = RESUME_NER_BACKEND
+    RESUME_NER_ONNX_PATH = RESUME_NER_ONNX_PATH
+    RESUME_NER_ONNX_THREADS = RESUME_NER_ONNX_THREADS
+    RESUME_NER_SERVICE_ENABLED = RESUME_NER_SERVICE_ENABLED
+    RESUME_NER_SERVICE_SOCKET = RESUME_NER_SERVICE_SOCKET
+
+    # 情绪识别模型配置
+    EMOTION_BACKEND = EMOTION_BACKEND
+    EMOTION_EXPORT_PATH = EMOTION_EXPORT_PATH
+    EMOTION_NUM_THREADS = EMOTION_NUM_THREADS
+    FACE_TRACK_DETECT_INTERVAL = FACE_TRACK_DETECT_INTERVAL
+    FACE_TRACK_CHANGE_THRESHOLD = FACE_TRACK_CHANGE_THRESHOLD
+    FACE_TRACK_SMOOTHING = FACE_TRACK_SMOOTHING
+
+    # 职位向量检索配置
+    JOB_EMBEDDING_MODEL_PATH = JOB_EMBEDDING_MODEL_PATH
+    JOB_EMBEDDING_DIM = JOB_EMBEDDING_DIM
+    JOB_INDEX_NPROBE = JOB_INDEX_NPROBE
+    JOB_DATA_VERSION_TTL = JOB_DATA_VERSION_TTL
+
+    # 批量推荐预计算配置
+    RECOMMENDATION_MODEL_DIR = RECOMMENDATION_MODEL_DIR
+    RECOMMENDATION_TOP_N = RECOMMENDATION_TOP_N
+    RECOMMENDATION_CF_K = RECOMMENDATION_CF_K
+
+    # 混合排序配置
+    HYBRID_RANK_WEIGHTS = HYBRID_RANK_WEIGHTS
+    HYBRID_RANK_DEADLINE_MS = HYBRID_RANK_DEADLINE_MS
+    HYBRID_RANK_CANDIDATES = HYBRID_RANK_CANDIDATES
 
     # DeepSeek API配置
     DEEPSEEK_API_KEY = DEEPSEEK_API_KEY
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+gunicorn配置（gunicorn启动时自动读取当前目录下的本文件）
+在master进程启动时拉起简历实体识别服务进程，所有worker共享同一份NER模型；
+socket路径和认证密钥由master生成并写入环境变量，fork出的worker继承后连接服务
+"""
+
+from config import (
+    RESUME_NER_ENABLED, RESUME_NER_MODEL_ID, RESUME_NER_BACKEND, RESUME_NER_ONNX_PATH, RESUME_NER_ONNX_THREADS,
+    RESUME_NER_SERVICE_ENABLED, RESUME_NER_SERVICE_SOCKET, RESUME_NER_SERVICE_MAX_BATCH,
+    RESUME_NER_SERVICE_MAX_WAIT_MS
+)
+
+# NER服务进程
+_ner_service_process = None
+# 为NER服务socket创建的私有临时目录（退出时删除）
+_ner_service_dir = None
+
+
+def on_starting(server):
+    """master进程启动时拉起NER服务进程"""
+    global _ner_service_process, _ner_service_dir
+    if not (RESUME_NER_ENABLED and RESUME_NER_SERVICE_ENABLED):
+        return
+
+    import os
+    from utils.ner_service import prepare_service_environment, start_service_process
+
+    # 与create_app中的模型路径一致：本地模型存在时使用本地模型
+    model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'nlp', 'raner_resume')
+    if not os.path.exists(model_path):
+        model_path = RESUME_NER_MODEL_ID
+
+    address, authkey = prepare_service_environment(RESUME_NER_SERVICE_SOCKET or None)
+    if not RESUME_NER_SERVICE_SOCKET:
+        _ner_service_dir = os.path.dirname(address)
+    _ner_service_process = start_service_process(
+        address, model_path, RESUME_NER_SERVICE_MAX_BATCH, RESUME_NER_SERVICE_MAX_WAIT_MS,
+        ner_options={'backend': RESUME_NER_BACKEND, 'onnx_path': RESUME_NER_ONNX_PATH,
+                     'onnx_threads': RESUME_NER_ONNX_THREADS},
+        authkey=authkey
+    )
+    server.log.info(f"简历实体识别服务进程已启动: pid={_ner_service_process.pid}, socket={address}")
+
+
+def on_exit(server):
+    """master进程退出时停止NER服务进程"""
+    if _ner_service_process is not None and _ner_service_process.is_alive():
+        _ner_service_process.terminate()
+        _ner_service_process.join(timeout=5)
+    if _ner_service_dir is not None:
+        import shutil
+        shutil.rmtree(_ner_service_dir, ignore_errors=True)
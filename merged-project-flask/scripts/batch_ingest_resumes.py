@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量处理简历（目录或zip压缩包）：提取 → 清理 → 实体识别 → 技能分类，结果写入JSONL或Parquet
+
+用法:
+    python scripts/batch_ingest_resumes.py resumes/ --output output/resumes.jsonl --workers 4
+    python scripts/batch_ingest_resumes.py campus_2024.zip --output output/campus_2024.parquet --no-ner
+"""
+
+import os
+import sys
+import json
+import argparse
+import logging
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.resume_ingest import ingest_resumes, DEFAULT_MAX_TASKS_PER_CHILD, STAGES
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='批量处理简历并写入结构化结果')
+    parser.add_argument('input', type=str, help='简历目录或zip压缩包')
+    parser.add_argument('--output', type=str, required=True, help='输出文件（.jsonl或.parquet）')
+    parser.add_argument('--format', type=str, choices=['jsonl', 'parquet'], default=None,
+                        help='输出格式，默认按输出文件扩展名判断')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认CPU核数')
+    parser.add_argument('--max-tasks-per-child', type=int, default=DEFAULT_MAX_TASKS_PER_CHILD,
+                        help='每个子进程处理多少份简历后重启（限制内存增长），0表示不重启')
+    parser.add_argument('--no-ner', action='store_true', help='不使用NER模型，只做词典技能匹配')
+    parser.add_argument('--model-path', type=str, default=None, help='NER模型路径或ModelScope模型ID')
+    parser.add_argument('--ner-service', type=str, default=None,
+                        help='NER服务的Unix socket路径（各进程共享服务中的模型，不各自加载；'
+                             '认证密钥读取环境变量RESUME_NER_SERVICE_AUTHKEY）')
+    parser.add_argument('--include-text', action='store_true', help='结果中包含清理后的全文')
+    parser.add_argument('--stats-json', type=str, default=None, help='将统计信息另存为JSON文件')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    stats = ingest_resumes(args.input, args.output, args.format, workers=args.workers,
+                           max_tasks_per_child=args.max_tasks_per_child, use_ner=not args.no_ner,
+                           model_path=args.model_path, ner_service=args.ner_service,
+                           include_text=args.include_text)
+
+    print(f"处理完成: 文件={stats['files']}, 成功={stats['succeeded']}, 失败={stats['failed']}, "
+          f"进程={stats['workers']}, 耗时={stats['elapsed_s']:.2f}s, 吞吐={stats['files_per_s']}份/s")
+    print(f"{'阶段':<10}{'处理数':>8}{'失败':>6}{'平均(ms)':>10}{'单进程(份/s)':>14}")
+    for stage in STAGES:
+        stage_stats = stats['stages'][stage]
+        print(f"{stage:<10}{stage_stats['count']:>8}{stage_stats['failed']:>6}{stage_stats['avg_ms']:>10.2f}"
+              f"{stage_stats['files_per_s']:>14.2f}")
+
+    if args.stats_json:
+        with open(args.stats_json, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
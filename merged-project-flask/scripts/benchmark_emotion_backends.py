@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+情绪识别后端对比：PyTorch（fp32） vs TorchScript / ONNX Runtime（int8）
+以PyTorch结果为参照检查标签一致率和标签分布差异，并统计单张人脸和批量推理的延迟
+
+用法:
+    python scripts/benchmark_emotion_backends.py --faces-dir data/faces_eval --threads 2
+    python scripts/benchmark_emotion_backends.py --backends onnx --min-agreement 0.97 --max-tvd 0.01
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config import EMOTION_EXPORT_PATH
+from utils.emotion_analyzer import EmotionClassifier, EMOTION_BATCH_SIZE
+from utils.emotion_backends import load_calibration_faces, BACKEND_PYTORCH, BACKEND_TORCHSCRIPT, BACKEND_ONNX
+
+
+def make_faces(count, seed=0):
+    """合成BGR人脸裁剪图（--faces-dir未指定时使用，只适合测延迟，标签分布没有参考意义）"""
+    rng = np.random.RandomState(seed)
+    return [rng.randint(0, 256, (int(size), int(size), 3), dtype=np.uint8) for size in rng.randint(80, 240, count)]
+
+
+def label_distribution(classifier, predictions):
+    """各情绪标签的占比"""
+    counts = np.array([sum(p[0] == emotion for p in predictions) for emotion in classifier.class_names], dtype=float)
+    return counts / max(len(predictions), 1)
+
+
+def measure_latency(classifier, faces, batch_size):
+    """每张人脸的推理耗时（毫秒）列表"""
+    classifier.predict_faces(faces[:batch_size])
+    latencies = []
+    for start in range(0, len(faces), batch_size):
+        batch = faces[start:start + batch_size]
+        begin = time.perf_counter()
+        classifier.predict_faces(batch)
+        latencies.append((time.perf_counter() - begin) * 1000 / len(batch))
+    return np.array(latencies)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='情绪识别 PyTorch vs TorchScript/ONNX 标签一致性与延迟对比')
+    parser.add_argument('--model-path', type=str,
+                        default=os.path.join(project_root, 'weights', 'model_best.pth.tar'), help='模型权重文件路径')
+    parser.add_argument('--export-dir', type=str, default=EMOTION_EXPORT_PATH, help='TorchScript/ONNX导出目录')
+    parser.add_argument('--backends', type=str, nargs='+', choices=[BACKEND_TORCHSCRIPT, BACKEND_ONNX],
+                        default=[BACKEND_TORCHSCRIPT, BACKEND_ONNX], help='要对比的后端')
+    parser.add_argument('--faces-dir', type=str, default=None, help='人脸裁剪图目录；不指定时使用合成图像')
+    parser.add_argument('--limit', type=int, default=500, help='最多使用的人脸数')
+    parser.add_argument('--threads', type=int, default=2, help='TorchScript/ONNX的算子内线程数，0表示自动')
+    parser.add_argument('--min-agreement', type=float, default=0.95, help='标签一致率低于该值时以非零状态退出')
+    parser.add_argument('--max-tvd', type=float, default=0.02, help='标签分布的总变差距离高于该值时以非零状态退出')
+
+    args = parser.parse_args()
+
+    faces = load_calibration_faces(args.faces_dir, args.limit) if args.faces_dir else make_faces(args.limit)
+    if not faces:
+        print(f"没有可用的人脸图像: {args.faces_dir}")
+        sys.exit(1)
+
+    reference = EmotionClassifier(args.model_path, 'cpu')
+    expected = reference.predict_faces(faces)
+    reference_distribution = label_distribution(reference, expected)
+    latencies = {BACKEND_PYTORCH: (measure_latency(reference, faces, 1), measure_latency(reference, faces, EMOTION_BATCH_SIZE))}
+
+    print(f"人脸数: {len(faces)}, 线程数: {args.threads}")
+    print(f"{'后端':<14}{'量化':>8}{'标签一致率':>12}{'分布TVD':>10}{'最大概率差':>12}")
+    failed = False
+    for backend in args.backends:
+        candidate = EmotionClassifier(args.model_path, 'cpu', backend=backend, export_dir=args.export_dir,
+                                      num_threads=args.threads)
+        if candidate.backend != backend:
+            print(f"{backend}模型不可用，请先运行 scripts/export_emotion_model.py 导出到 {args.export_dir}")
+            failed = True
+            continue
+        actual = candidate.predict_faces(faces)
+        agreement = sum(a[0] == b[0] for a, b in zip(expected, actual)) / len(faces)
+        tvd = 0.5 * np.abs(reference_distribution - label_distribution(candidate, actual)).sum()
+        max_diff = max(abs(a[2][emotion] - b[2][emotion])
+                       for a, b in zip(expected, actual) for emotion in reference.class_names)
+        print(f"{backend:<14}{str(candidate.model.quantization):>8}{agreement:>12.4f}{tvd:>10.4f}{max_diff:>12.4f}")
+        latencies[backend] = (measure_latency(candidate, faces, 1), measure_latency(candidate, faces, EMOTION_BATCH_SIZE))
+        if agreement < args.min_agreement or tvd > args.max_tvd:
+            print(f"{backend}: 标签一致率 {agreement:.4f}（阈值 {args.min_agreement}）或分布TVD {tvd:.4f}"
+                  f"（阈值 {args.max_tvd}）不达标")
+            failed = True
+
+    print("标签分布（参照）: " + ', '.join(f"{emotion}={share:.3f}"
+                                        for emotion, share in zip(reference.class_names, reference_distribution)))
+    print(f"{'后端':<14}{'单张p50(ms)':>12}{'单张p99(ms)':>12}{f'批量{EMOTION_BATCH_SIZE}每张(ms)':>16}")
+    for backend, (single, batched) in latencies.items():
+        print(f"{backend:<14}{np.percentile(single, 50):>12.2f}{np.percentile(single, 99):>12.2f}{batched.mean():>16.2f}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
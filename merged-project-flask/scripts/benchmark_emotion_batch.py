@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多人脸情绪识别基准：逐个人脸推理（predict_image） vs 批量推理（predict_batch，PIL预处理）
+vs 批量推理（predict_faces，OpenCV/NumPy预处理）
+对1~8张人脸分别统计每帧耗时，并检查批量结果与逐个推理的预测是否一致
+
+用法:
+    python scripts/benchmark_emotion_batch.py --repeat 20
+    python scripts/benchmark_emotion_batch.py --model-path weights/model_best.pth.tar --max-faces 8 --device cuda
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+from PIL import Image
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.emotion_analyzer import EmotionClassifier
+
+
+def make_faces(count, seed=0):
+    """合成BGR人脸裁剪图（尺寸不一，与检测框大小随人脸远近变化一致）"""
+    rng = np.random.RandomState(seed)
+    faces = []
+    for _ in range(count):
+        size = int(rng.randint(80, 240))
+        faces.append(rng.randint(0, 256, (size, size, 3), dtype=np.uint8))
+    return faces
+
+
+def max_score_diff(classifier, expected, actual):
+    """两组预测结果的最大概率差"""
+    return max(abs(a[2][emotion] - b[2][emotion])
+               for a, b in zip(expected, actual) for emotion in classifier.class_names)
+
+
+def measure(func, repeat):
+    """每次调用的平均耗时（毫秒）"""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='多人脸情绪识别 逐个推理 vs 批量推理')
+    parser.add_argument('--model-path', type=str,
+                        default=os.path.join(project_root, 'weights', 'model_best.pth.tar'), help='模型权重文件路径')
+    parser.add_argument('--device', type=str, default='cpu', help='设备（cpu或cuda）')
+    parser.add_argument('--max-faces', type=int, default=8, help='最多测试的人脸数')
+    parser.add_argument('--repeat', type=int, default=10, help='每种人脸数的重复次数')
+
+    args = parser.parse_args()
+
+    classifier = EmotionClassifier(args.model_path, args.device)
+
+    print(f"设备: {args.device}, 重复次数: {args.repeat}")
+    print(f"{'人脸数':<8}{'逐个(ms)':>10}{'批量(ms)':>10}{'OpenCV批量(ms)':>16}{'加速比':>8}"
+          f"{'批量概率差':>12}{'OpenCV一致':>12}{'OpenCV概率差':>14}")
+    for count in range(1, args.max_faces + 1):
+        faces = make_faces(count, seed=count)
+        images = [Image.fromarray(face[:, :, ::-1]) for face in faces]
+        loop_ms = measure(lambda: [classifier.predict_image(image) for image in images], args.repeat)
+        batch_ms = measure(lambda: classifier.predict_batch(images), args.repeat)
+        opencv_ms = measure(lambda: classifier.predict_faces(faces), args.repeat)
+
+        looped = [classifier.predict_image(image) for image in images]
+        batch_diff = max_score_diff(classifier, looped, classifier.predict_batch(images))
+        # OpenCV与PIL的缩放插值略有差异，概率不会完全相同
+        opencv = classifier.predict_faces(faces)
+        same = sum(a[0] == b[0] for a, b in zip(looped, opencv))
+        print(f"{count:<8}{loop_ms:>10.1f}{batch_ms:>10.1f}{opencv_ms:>16.1f}{loop_ms / opencv_ms:>8.2f}"
+              f"{batch_diff:>12.2e}{f'{same}/{count}':>12}{max_score_diff(classifier, looped, opencv):>14.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+简历实体识别后端对比：PyTorch vs ONNX Runtime（int8）
+检查实体级一致性（精确率/召回率/完全一致的文本比例）并统计单条推理延迟
+
+用法:
+    python scripts/benchmark_resume_ner_onnx.py --threads 2 --repeat 20
+    python scripts/benchmark_resume_ner_onnx.py --input resumes.txt --min-f1 0.98
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config import RESUME_NER_ONNX_PATH
+from utils.resume_ner import ResumeNER, BACKEND_PYTORCH, BACKEND_ONNX
+
+# 合成简历句子（--input未指定时使用）
+SAMPLE_TEXTS = [
+    "张三，男，汉族，1995年出生，籍贯浙江杭州。",
+    "2013年至2017年就读于浙江大学计算机科学与技术专业，获工学学士学位。",
+    "2017年至2020年在阿里巴巴担任高级软件工程师，负责电商推荐系统的后端开发。",
+    "2020年至今在字节跳动担任算法工程师，主导自然语言处理平台建设。",
+    "李四，女，中国国籍，硕士研究生学历，毕业于北京大学软件工程专业。",
+    "王五，现任腾讯科技产品经理，曾就职于华为技术有限公司，担任项目经理。",
+    "赵六，回族，本科，毕业于复旦大学新闻学专业，现任上海某传媒公司编辑。",
+    "孙七，1990年生，山东济南人，清华大学博士，现任中国科学院研究员。",
+]
+
+
+def entity_set(entities):
+    """实体集合（类型, 起始, 结束）"""
+    return {(entity['type'], entity['start'], entity['end']) for entity in entities}
+
+
+def measure_latency(ner, texts, repeat):
+    """单条推理延迟（毫秒）列表"""
+    # 预热
+    ner.ner_pipeline(texts[0])
+    latencies = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            ner.ner_pipeline(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='简历实体识别 PyTorch vs ONNX Runtime 一致性与延迟对比')
+    parser.add_argument('--input', type=str, help='文本文件，每行一条文本；不指定时使用合成简历句子')
+    parser.add_argument('--model-path', type=str, default=None, help='PyTorch模型路径或ModelScope模型ID')
+    parser.add_argument('--onnx-path', type=str, default=RESUME_NER_ONNX_PATH, help='ONNX模型导出目录')
+    parser.add_argument('--threads', type=int, default=0, help='ONNX Runtime线程数，0表示自动')
+    parser.add_argument('--repeat', type=int, default=10, help='延迟测试的重复次数')
+    parser.add_argument('--min-f1', type=float, default=0.98, help='实体级F1低于该值时以非零状态退出')
+
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = SAMPLE_TEXTS
+
+    reference = ResumeNER(args.model_path, use_cache=False, backend=BACKEND_PYTORCH)
+    candidate = ResumeNER(args.model_path, use_cache=False, backend=BACKEND_ONNX,
+                          onnx_path=args.onnx_path, onnx_threads=args.threads)
+    if candidate.backend != BACKEND_ONNX:
+        print(f"ONNX模型不可用，请先运行 scripts/export_resume_ner_onnx.py 导出到 {args.onnx_path}")
+        sys.exit(1)
+
+    # 实体级一致性（以PyTorch结果为参照）
+    matched = reference_total = candidate_total = exact = 0
+    for text in texts:
+        expected = entity_set(reference.recognize(text))
+        actual = entity_set(candidate.recognize(text))
+        matched += len(expected & actual)
+        reference_total += len(expected)
+        candidate_total += len(actual)
+        exact += expected == actual
+    precision = matched / candidate_total if candidate_total else 1.0
+    recall = matched / reference_total if reference_total else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    print(f"样本数: {len(texts)}, 参照实体数: {reference_total}, ONNX实体数: {candidate_total}")
+    print(f"精确率: {precision:.4f}, 召回率: {recall:.4f}, F1: {f1:.4f}, 完全一致: {exact}/{len(texts)}")
+
+    # 单条推理延迟
+    print(f"{'后端':<16}{'p50(ms)':>10}{'p99(ms)':>10}{'平均(ms)':>10}")
+    results = {}
+    for name, ner in (('pytorch', reference), (f'onnx-{"int8" if candidate.ner_pipeline.quantized else "fp32"}', candidate)):
+        latencies = np.array(measure_latency(ner, texts, args.repeat))
+        results[name] = latencies
+        print(f"{name:<16}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}"
+              f"{latencies.mean():>10.2f}")
+    baseline, onnx_latencies = results.values()
+    print(f"p50加速比: {np.percentile(baseline, 50) / np.percentile(onnx_latencies, 50):.2f}x")
+
+    if f1 < args.min_f1:
+        print(f"实体级F1 {f1:.4f} 低于阈值 {args.min_f1}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
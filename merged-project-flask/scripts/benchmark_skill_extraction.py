@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+简历技能提取（ResumeNER.extract_skills）耗时基准
+实体识别结果预先计算，只统计技能提取本身的耗时
+
+用法:
+    python scripts/benchmark_skill_extraction.py --input-dir data/resumes --repeat 5
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.resume_ner import ResumeNER
+from utils.text_normalizer import normalize_text
+
+
+def load_corpus(input_dir):
+    """读取目录下的全部.txt简历文本（与extract_structured_info相同的规范化，实体位置才能与文本对应）"""
+    texts = []
+    for filename in sorted(os.listdir(input_dir)):
+        if filename.endswith('.txt'):
+            with open(os.path.join(input_dir, filename), 'r', encoding='utf-8') as f:
+                text = normalize_text(f.read())
+            if text:
+                texts.append(text)
+    return texts
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='简历技能提取耗时基准')
+    parser.add_argument('--input-dir', type=str, required=True, help='简历文本目录（每份简历一个.txt文件）')
+    parser.add_argument('--repeat', type=int, default=5, help='每份简历的重复次数')
+    parser.add_argument('--model-path', type=str, default=None, help='模型路径或ModelScope模型ID')
+
+    args = parser.parse_args()
+
+    texts = load_corpus(args.input_dir)
+    if not texts:
+        print(f"目录中没有简历文本: {args.input_dir}")
+        sys.exit(1)
+
+    ner = ResumeNER(args.model_path, use_cache=False)
+    # 预先计算实体识别结果，不计入技能提取耗时
+    infos = [ner.extract_structured_info(text) for text in texts]
+    ner.extract_skills(texts[0], infos[0])
+
+    latencies = []
+    skill_counts = []
+    for text, info in zip(texts, infos):
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            skills = ner.extract_skills(text, info)
+            latencies.append((time.perf_counter() - start) * 1000)
+        skill_counts.append(len(skills))
+
+    latencies = np.array(latencies)
+    total_chars = sum(len(text) for text in texts) * args.repeat
+    print(f"简历数: {len(texts)}, 平均长度: {total_chars / args.repeat / len(texts):.0f}字符, "
+          f"平均技能数: {np.mean(skill_counts):.1f}")
+    print(f"单份耗时(ms): p50={np.percentile(latencies, 50):.2f}, p95={np.percentile(latencies, 95):.2f}, "
+          f"平均={latencies.mean():.2f}")
+    print(f"吞吐: {total_chars / (latencies.sum() / 1000):.0f}字符/秒")
+
+
+if __name__ == '__main__':
+    main()
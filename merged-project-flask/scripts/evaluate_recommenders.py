@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+推荐算法离线评估与性能基准脚本
+
+用法:
+    python scripts/evaluate_recommenders.py --users 500 --top-n 10
+    python scripts/evaluate_recommenders.py --benchmark --sizes 200,500,1000
+"""
+
+import os
+import sys
+import argparse
+import json
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from algorithm.evaluation import ENGINE_NAMES, run_evaluation, run_benchmark
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='推荐算法离线评估与性能基准')
+    parser.add_argument('--users', type=int, default=500, help='评估数据的用户数量')
+    parser.add_argument('--items', type=int, default=500, help='评估数据的职位数量')
+    parser.add_argument('--interactions', type=int, default=20, help='每个用户的平均交互数量')
+    parser.add_argument('--top-n', type=int, default=10, help='推荐列表长度')
+    parser.add_argument('--seed', type=int, default=42, help='数据生成与训练集划分的随机种子')
+    parser.add_argument('--engines', type=str, default=','.join(ENGINE_NAMES), help='参与评估的推荐器，逗号分隔')
+    parser.add_argument('--benchmark', action='store_true', help='在规模递增的数据上测量训练耗时、峰值内存和延迟')
+    parser.add_argument('--sizes', type=str, default='200,500,1000', help='基准测试的数据规模（用户数量），逗号分隔')
+    parser.add_argument('--output', type=str, help='输出结果到JSON文件')
+
+    args = parser.parse_args()
+    engines = [name.strip() for name in args.engines.split(',') if name.strip()]
+
+    print(f"=== 离线评估 (用户={args.users}, 职位={args.items}, top-{args.top_n}, seed={args.seed}) ===")
+    metrics = run_evaluation(args.users, args.items, args.interactions, args.seed, args.top_n, engines)
+    print(f"{'推荐器':<12}{'precision':>12}{'recall':>12}{'coverage':>12}{'popularity':>12}{'pop_bias':>12}")
+    for row in metrics:
+        print(f"{row['engine']:<12}{row['precision']:>12.4f}{row['recall']:>12.4f}{row['coverage']:>12.4f}"
+              f"{row['popularity']:>12.4f}{row['popularity_bias']:>12.4f}")
+
+    benchmark = []
+    if args.benchmark:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+        print(f"\n=== 性能基准 (规模={sizes}) ===")
+        benchmark = run_benchmark(sizes, args.interactions, args.seed, args.top_n, engines=engines)
+        print(f"{'推荐器':<12}{'规模':>8}{'评分数':>10}{'训练(s)':>10}{'峰值RSS(MB)':>14}{'p50(ms)':>10}{'p99(ms)':>10}")
+        for row in benchmark:
+            print(f"{row['engine']:<12}{row['users']:>8}{row['ratings']:>10}{row['train_time_s']:>10.2f}"
+                  f"{row['peak_rss_mb']:>14.1f}{row['p50_ms']:>10.3f}{row['p99_ms']:>10.3f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'metrics': metrics, 'benchmark': benchmark}, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存到: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+导出情绪识别模型为TorchScript和ONNX（默认用校准集做int8静态量化）
+
+用法:
+    python scripts/export_emotion_model.py --calibration-dir data/faces_calib
+    python scripts/export_emotion_model.py --backends onnx --no-quantize
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config import EMOTION_EXPORT_PATH
+from utils.emotion_analyzer import EmotionClassifier
+from utils.emotion_backends import (export_emotion_model, load_calibration_faces, BACKEND_TORCHSCRIPT, BACKEND_ONNX,
+                                    ONNX_OPSET)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='导出情绪识别模型为TorchScript和ONNX')
+    parser.add_argument('--model-path', type=str,
+                        default=os.path.join(project_root, 'weights', 'model_best.pth.tar'), help='模型权重文件路径')
+    parser.add_argument('--output-dir', type=str, default=EMOTION_EXPORT_PATH, help='导出目录')
+    parser.add_argument('--backends', type=str, nargs='+', choices=[BACKEND_TORCHSCRIPT, BACKEND_ONNX],
+                        default=[BACKEND_TORCHSCRIPT, BACKEND_ONNX], help='要导出的后端')
+    parser.add_argument('--calibration-dir', type=str, default=None,
+                        help='校准用的人脸裁剪图目录；不指定时只做动态量化')
+    parser.add_argument('--calibration-limit', type=int, default=256, help='最多使用的校准图像数')
+    parser.add_argument('--no-quantize', action='store_true', help='不做int8量化，只导出fp32模型')
+    parser.add_argument('--opset', type=int, default=ONNX_OPSET, help='ONNX算子集版本')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    classifier = EmotionClassifier(args.model_path, 'cpu')
+    faces = []
+    if args.calibration_dir and not args.no_quantize:
+        faces = load_calibration_faces(args.calibration_dir, args.calibration_limit)
+        print(f"校准图像: {len(faces)} 张")
+
+    meta = export_emotion_model(classifier, args.output_dir, faces, backends=args.backends,
+                                quantize=not args.no_quantize, opset=args.opset)
+    for backend in args.backends:
+        path = os.path.join(args.output_dir, meta[backend]['file'])
+        print(f"{backend}: {path} ({os.path.getsize(path) / 1024 / 1024:.1f}MB, 量化: {meta[backend]['quantization']})")
+    print("启用方式: 设置环境变量 EMOTION_BACKEND=torchscript 或 onnx，"
+          "并运行 scripts/benchmark_emotion_backends.py 检查标签分布一致性")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+导出简历实体识别模型为ONNX（默认动态int8量化）
+
+用法:
+    python scripts/export_resume_ner_onnx.py
+    python scripts/export_resume_ner_onnx.py --model-path models/nlp/raner_resume --no-quantize
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config import RESUME_NER_ONNX_PATH
+from utils.resume_ner import resolve_model_path
+from utils.ner_onnx import export_onnx, ONNX_OPSET
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='导出简历实体识别模型为ONNX')
+    parser.add_argument('--model-path', type=str, default=None, help='模型路径或ModelScope模型ID')
+    parser.add_argument('--output-dir', type=str, default=RESUME_NER_ONNX_PATH, help='ONNX模型导出目录')
+    parser.add_argument('--no-quantize', action='store_true', help='不做int8量化，只导出fp32模型')
+    parser.add_argument('--opset', type=int, default=ONNX_OPSET, help='ONNX算子集版本')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    model_path = resolve_model_path(args.model_path)
+    onnx_path = export_onnx(model_path, args.output_dir, quantize=not args.no_quantize, opset=args.opset)
+    print(f"导出完成: {onnx_path} ({os.path.getsize(onnx_path) / 1024 / 1024:.1f}MB)")
+    print("启用方式: 设置环境变量 RESUME_NER_BACKEND=onnx，并运行 scripts/benchmark_resume_ner_onnx.py 检查一致性")
+
+
+if __name__ == '__main__':
+    main()
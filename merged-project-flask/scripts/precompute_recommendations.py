@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量预计算用户职位推荐
+
+用法:
+    python scripts/precompute_recommendations.py --workers 4 --top-n 50
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config import RECOMMENDATION_MODEL_DIR, RECOMMENDATION_TOP_N, RECOMMENDATION_CF_K
+from algorithm.ItemCF import ItemBasedCF
+from algorithm.batch_recommend import precompute_recommendations
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='批量预计算用户职位推荐')
+    parser.add_argument('--db', type=str, default=os.path.join(project_root, 'merged_job_interview.db'),
+                        help='写入结果表的SQLite数据库')
+    parser.add_argument('--model-dir', type=str, default=RECOMMENDATION_MODEL_DIR, help='内存映射模型输出目录')
+    parser.add_argument('--top-n', type=int, default=RECOMMENDATION_TOP_N, help='每个用户保存的推荐数量')
+    parser.add_argument('--k', type=int, default=RECOMMENDATION_CF_K, help='每个职位使用的近邻数量')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认CPU核数')
+    parser.add_argument('--shard-size', type=int, default=1000, help='每个分片的用户数量')
+    parser.add_argument('--seed', type=int, default=None, help='训练集划分的随机种子')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    cf = ItemBasedCF(seed=args.seed)
+    stats = precompute_recommendations(cf, args.db, args.model_dir, n=args.top_n, k=args.k,
+                                       workers=args.workers, shard_size=args.shard_size)
+    print(f"预计算完成: 用户={stats['users']}, 写入={stats['written']}, 分片={stats['shards']}, "
+          f"进程={stats['workers']}, 耗时={stats['elapsed_s']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
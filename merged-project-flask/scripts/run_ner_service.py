@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+单独运行简历实体识别服务（gunicorn部署时由gunicorn.conf.py自动拉起，无需手动运行）
+客户端与服务需使用相同的认证密钥（环境变量RESUME_NER_SERVICE_AUTHKEY），
+socket所在目录必须属于当前用户且其他用户不可写
+
+用法:
+    RESUME_NER_SERVICE_AUTHKEY=<密钥> python scripts/run_ner_service.py --socket ~/.resume_ner/resume_ner.sock
+    RESUME_NER_SERVICE_AUTHKEY=<密钥> python scripts/run_ner_service.py --socket run/resume_ner.sock --max-batch 16 --max-wait-ms 10
+"""
+
+import os
+import sys
+import argparse
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from config import (
+    RESUME_NER_BACKEND, RESUME_NER_ONNX_PATH, RESUME_NER_ONNX_THREADS, RESUME_NER_SERVICE_SOCKET,
+    RESUME_NER_SERVICE_MAX_BATCH, RESUME_NER_SERVICE_MAX_WAIT_MS
+)
+from utils.ner_service import run_service
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='简历实体识别服务')
+    parser.add_argument('--socket', type=str, default=RESUME_NER_SERVICE_SOCKET or None,
+                        help='Unix socket路径，默认使用环境变量RESUME_NER_SERVICE_SOCKET')
+    parser.add_argument('--model-path', type=str, default=None, help='模型路径或ModelScope模型ID')
+    parser.add_argument('--backend', type=str, default=RESUME_NER_BACKEND, choices=['pytorch', 'onnx'],
+                        help='推理后端')
+    parser.add_argument('--max-batch', type=int, default=RESUME_NER_SERVICE_MAX_BATCH, help='单个微批次最多合并的请求数')
+    parser.add_argument('--max-wait-ms', type=float, default=RESUME_NER_SERVICE_MAX_WAIT_MS,
+                        help='收到请求后等待合并更多请求的最长时间（毫秒）')
+
+    args = parser.parse_args()
+    run_service(args.socket, args.model_path, args.max_batch, args.max_wait_ms,
+                ner_options={'backend': args.backend, 'onnx_path': RESUME_NER_ONNX_PATH,
+                             'onnx_threads': RESUME_NER_ONNX_THREADS})
+
+
+if __name__ == '__main__':
+    main()
@@ -3,18 +3,46 @@
 
 """
 文档文本提取模块
-用于从PDF和Word文档中提取文本内容
+用于从PDF和Word文档中提取文本内容，也支持用iter_document_pages逐页提取
 """
 
 import os
 import sys
 import io
 import traceback
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from pdf_extraction_orchestrator import extract_pdf, iter_pdf_pages
+
+# 添加项目根目录到路径（文本规范化模块位于utils）
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from utils.text_normalizer import clean_lines
+from utils.docx_stream import iter_docx_blocks, docx_text, BLOCK_PARAGRAPH, BLOCK_TABLE, BLOCK_PAGE_BREAK
+
+# 逐页提取的结果：(页码, 页面文本, 表格列表)，表格为行列表，每行为单元格文本列表
+Page = Tuple[int, str, List[List[List[str]]]]
+# 内存中的文档内容
+Buffer = Union[bytes, bytearray, memoryview]
+
+# 提取器版本，修改提取/清理逻辑后递增以使旧的缓存结果失效
+DOCUMENT_EXTRACTOR_VERSION = 3
+# 文档文本缓存的命名空间
+DOCUMENT_CACHE_NAMESPACE = 'document_text'
+# 文档文本缓存的磁盘预算（压缩后），超出后淘汰最久未使用的文档
+DOCUMENT_CACHE_MAX_BYTES = int(os.getenv('DOCUMENT_CACHE_MAX_MB', '256')) * 1024 * 1024
+# 进程内保留的文档数量
+DOCUMENT_CACHE_MEMORY_ITEMS = 32
+
+# 文件头标识 -> 扩展名（DOCX为zip格式，DOC为OLE2复合文档）
+_FILE_SIGNATURES = (
+    (b'%PDF', '.pdf'),
+    (b'PK\x03\x04', '.docx'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', '.doc')
+)
 
 def extract_text_from_document(file_path: str) -> Optional[str]:
     """
-    从文档中提取文本内容
+    从文档中提取文本内容（相同内容的文档直接使用缓存的提取结果）
     
     Args:
         file_path: 文档文件路径
@@ -31,176 +59,258 @@ def extract_text_from_document(file_path: str) -> Optional[str]:
         # 获取文件扩展名
         _, file_extension = os.path.splitext(file_path)
         file_extension = file_extension.lower()
-        
-        # 根据文件类型选择不同的提取方法
-        if file_extension == '.pdf':
-            return extract_text_from_pdf(file_path)
-        elif file_extension in ['.doc', '.docx']:
-            return extract_text_from_word(file_path)
-        else:
+        if file_extension not in ('.pdf', '.doc', '.docx'):
             print(f"不支持的文件类型: {file_extension}")
             return None
+
+        # 文件只读取一次：同一份内容既用于计算缓存键，也直接交给提取器
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        result = extract_document(data, file_path, file_path=file_path)
+        return result['text'] if result else None
     
     except Exception as e:
         print(f"文本提取失败: {str(e)}")
         traceback.print_exc()
         return None
 
-def extract_text_from_pdf(pdf_path: str) -> Optional[str]:
+def detect_document_type(data: Buffer, name_hint: Optional[str] = None) -> Optional[str]:
     """
-    从PDF文档中提取文本（优化版）
-    使用智能回退机制：PyPDF2 → PyMuPDF → pdfplumber
+    根据文件头判断文档类型，无法识别时使用文件名/URL的扩展名
 
     Args:
-        pdf_path: PDF文件路径
+        data: 文档内容
+        name_hint: 文件名或URL
 
     Returns:
-        提取的文本内容，如果提取失败则返回None
+        '.pdf'、'.docx'、'.doc'，无法判断时返回None
     """
-    if not os.path.exists(pdf_path):
-        print(f"错误：PDF文件不存在: {pdf_path}")
+    head = bytes(data[:8])
+    for signature, file_extension in _FILE_SIGNATURES:
+        if head.startswith(signature):
+            return file_extension
+    if name_hint:
+        file_extension = os.path.splitext(name_hint.split('?', 1)[0])[1].lower()
+        if file_extension in ('.pdf', '.docx', '.doc'):
+            return file_extension
+    return None
+
+def _get_document_cache():
+    """获取文档文本缓存，项目根目录不在sys.path中（单独运行本模块）时不使用缓存"""
+    try:
+        from utils.result_cache import get_result_cache
+    except ImportError:
         return None
+    return get_result_cache(DOCUMENT_CACHE_NAMESPACE, max_memory_items=DOCUMENT_CACHE_MEMORY_ITEMS,
+                            max_disk_bytes=DOCUMENT_CACHE_MAX_BYTES, compress=True)
 
-    print(f"正在提取PDF文本: {pdf_path}")
+def _extract_document(data: Buffer, file_extension: str, file_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """按文档类型提取文本和分页文本（不经过缓存）"""
+    if file_extension == '.pdf':
+        # PDF提取调度器以bytes为输入（bytes时不复制）
+        result = extract_pdf(file_path, data=data if isinstance(data, bytes) else bytes(data))
+        if not result['success']:
+            print(f"❌ PDF提取失败: {result.get('error')}")
+            return None
+        print(f"✅ PDF提取成功，文本长度: {len(result['text'])} 字符，页数: {result['total_pages']}，"
+              f"回退页数: {len(result['fallback_pages'])}，耗时: {result['elapsed_ms']}ms")
+        pages = [{'page_no': page['page_no'], 'text': page['text'], 'engine': page['engine']}
+                 for page in result['pages']]
+        return {'text': result['text'], 'pages': pages, 'method': result['method'], 'file_type': file_extension}
 
-    # 方法1: PyPDF2 (文本最完整)
-    try:
-        import PyPDF2
-
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text_blocks = []
-
-            for page_num, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text()
-                if page_text and page_text.strip():
-                    # 清理多余空格和格式
-                    cleaned_text = _clean_extracted_text(page_text)
-                    text_blocks.append(cleaned_text)
-
-            if text_blocks:
-                full_text = '\n\n'.join(text_blocks)
-                print(f"✅ PyPDF2提取成功，文本长度: {len(full_text)} 字符")
-                return full_text
-            else:
-                print("⚠️ PyPDF2未提取到文本内容")
+    if file_extension == '.docx':
+        pages = [{'page_no': page_no, 'text': text}
+                 for page_no, text, _ in iter_docx_pages(io.BytesIO(data) if file_path is None else file_path)]
+        text = '\n'.join(page['text'] for page in pages if page['text'])
+        print(f"成功提取Word文本，长度: {len(text)} 字符，页数: {len(pages)}")
+        return {'text': text, 'pages': pages, 'method': 'docx-stream', 'file_type': file_extension} if text else None
 
-    except ImportError:
-        print("⚠️ PyPDF2未安装，跳过此方法")
-    except Exception as e:
-        print(f"⚠️ PyPDF2提取失败: {str(e)}")
+    if file_extension == '.doc':
+        if file_path is not None:
+            text = extract_text_from_word(file_path)
+        else:
+            # textract/antiword只能读取文件，旧版DOC仍通过临时文件提取
+            import tempfile
 
-    # 方法2: PyMuPDF (速度最快)
-    try:
-        import fitz
+            with tempfile.NamedTemporaryFile(suffix='.doc') as temp_file:
+                temp_file.write(data)
+                temp_file.flush()
+                text = extract_text_from_word(temp_file.name)
+        if not text:
+            return None
+        return {'text': text, 'pages': [{'page_no': 0, 'text': clean_lines(text)}],
+                'method': 'textract', 'file_type': file_extension}
 
-        doc = fitz.open(pdf_path)
-        text_blocks = []
+    return None
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_text = page.get_text()
-            if page_text and page_text.strip():
-                cleaned_text = _clean_extracted_text(page_text)
-                text_blocks.append(cleaned_text)
+def extract_document(data: Buffer, name_hint: Optional[str] = None, file_path: Optional[str] = None,
+                     use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    提取文档内容，结果按“文件内容SHA-256 + 提取器版本”缓存，重复上传的文件不再解析
 
-        doc.close()
+    Args:
+        data: 文档内容（bytes/bytearray/memoryview）
+        name_hint: 文件名或URL，文件头无法识别类型时用于判断
+        file_path: 文档已在磁盘上时传入（DOC直接按路径提取，不再写临时文件）
+        use_cache: 是否使用缓存
 
-        if text_blocks:
-            full_text = '\n\n'.join(text_blocks)
-            print(f"✅ PyMuPDF提取成功，文本长度: {len(full_text)} 字符")
-            return full_text
-        else:
-            print("⚠️ PyMuPDF未提取到文本内容")
+    Returns:
+        {'text', 'pages': [{'page_no', 'text', ...}], 'method', 'file_type', 'cached'}，提取失败时返回None
+    """
+    file_extension = detect_document_type(data, name_hint)
+    if file_extension is None:
+        print(f"无法识别的文档类型: {name_hint}")
+        return None
 
-    except ImportError:
-        print("⚠️ PyMuPDF未安装，跳过此方法")
-    except Exception as e:
-        print(f"⚠️ PyMuPDF提取失败: {str(e)}")
+    cache = _get_document_cache() if use_cache else None
+    cache_key = None
+    if cache is not None:
+        from utils.result_cache import make_cache_key
 
-    # 方法3: pdfplumber (表格处理较好)
-    try:
-        import pdfplumber
-
-        text_blocks = []
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                page_text = page.extract_text()
-                if page_text and page_text.strip():
-                    cleaned_text = _clean_extracted_text(page_text)
-                    text_blocks.append(cleaned_text)
-
-        if text_blocks:
-            full_text = '\n\n'.join(text_blocks)
-            print(f"✅ pdfplumber提取成功，文本长度: {len(full_text)} 字符")
-            return full_text
-        else:
-            print("⚠️ pdfplumber未提取到文本内容")
+        cache_key = make_cache_key(data, str(DOCUMENT_EXTRACTOR_VERSION))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"文档内容命中缓存，跳过解析，文本长度: {len(cached['text'])} 字符")
+            return dict(cached, cached=True)
 
-    except ImportError:
-        print("⚠️ pdfplumber未安装，跳过此方法")
+    result = _extract_document(data, file_extension, file_path)
+    if result is None:
+        return None
+    # 只缓存成功的结果，提取失败的文档下次仍会重试
+    if cache_key is not None:
+        cache.set(cache_key, result)
+    return dict(result, cached=False)
+
+def extract_text_from_bytes(data: Buffer, name_hint: Optional[str] = None) -> Optional[str]:
+    """
+    从内存中的文档内容提取文本，不写临时文件（相同内容的文档直接使用缓存的提取结果）
+
+    Args:
+        data: 文档内容（bytes/bytearray/memoryview）
+        name_hint: 文件名或URL，文件头无法识别类型时用于判断
+
+    Returns:
+        提取的文本内容，如果提取失败则返回None
+    """
+    try:
+        result = extract_document(data, name_hint)
+        return result['text'] if result else None
     except Exception as e:
-        print(f"⚠️ pdfplumber提取失败: {str(e)}")
+        print(f"文本提取失败: {str(e)}")
+        traceback.print_exc()
+        return None
 
-    print("❌ 所有PDF提取方法都失败了，可能是扫描版PDF需要OCR处理")
-    return None
+def iter_document_pages(file_path: str, with_tables: bool = False) -> Iterator[Page]:
+    """
+    逐页提取文档内容（生成器），每解析完一页立即产出，下游可以边提取边处理
+
+    PDF按物理页产出；DOCX没有固定分页，按文档中的分页符切分；DOC整体作为一页
+
+    Args:
+        file_path: 文档文件路径
+        with_tables: PDF是否识别页面中的表格（DOCX的表格总是产出）
 
-def _clean_extracted_text(text: str) -> str:
+    Yields:
+        (page_no, text, tables)：页码（从0开始）、清理后的页面文本、表格列表
     """
-    清理提取的文本，优化格式
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    _, file_extension = os.path.splitext(file_path)
+    file_extension = file_extension.lower()
+
+    if file_extension == '.pdf':
+        yield from iter_pdf_pages(file_path, with_tables=with_tables)
+    elif file_extension == '.docx':
+        yield from iter_docx_pages(file_path)
+    elif file_extension == '.doc':
+        text = extract_text_from_word(file_path)
+        if text:
+            yield 0, clean_lines(text), []
+    else:
+        raise ValueError(f"不支持的文件类型: {file_extension}")
+
+def iter_docx_pages(docx_path: Union[str, io.BytesIO]) -> Iterator[Page]:
+    """
+    按分页符逐页产出DOCX内容，段落和表格保持文档中的原始顺序（流式解析，见utils.docx_stream）
+
+    表格内容同时以“单元格 | 单元格”的行文本出现在页面文本中，合并单元格只保留一次
 
     Args:
-        text: 原始提取的文本
+        docx_path: DOCX文件路径，或内存中的DOCX文件对象
+
+    Yields:
+        (page_no, text, tables)
+    """
+    page_no = 0
+    lines = []
+    tables = []
+
+    for kind, content in iter_docx_blocks(docx_path):
+        if kind == BLOCK_PAGE_BREAK:
+            if lines or tables:
+                yield page_no, clean_lines('\n'.join(lines)), tables
+                page_no += 1
+                lines, tables = [], []
+        elif kind == BLOCK_PARAGRAPH:
+            lines.append(content)
+        elif kind == BLOCK_TABLE and content:
+            lines.extend(' | '.join(cell for cell in row if cell) for row in content)
+            tables.append(content)
+
+    if lines or tables:
+        yield page_no, clean_lines('\n'.join(lines)), tables
+
+def extract_text_from_pdf(pdf_path: str) -> Optional[str]:
+    """
+    从PDF文档中提取文本（优化版）
+    文件只读取一次：PyMuPDF逐页提取（页数多时并行），只对文本质量不达标的页面回退到pdfplumber、PyPDF2
+
+    Args:
+        pdf_path: PDF文件路径
 
     Returns:
-        清理后的文本
+        提取的文本内容，如果提取失败则返回None
     """
-    if not text:
-        return ""
+    if not os.path.exists(pdf_path):
+        print(f"错误：PDF文件不存在: {pdf_path}")
+        return None
 
-    # 移除多余的空格和换行
-    lines = []
-    for line in text.split('\n'):
-        line = line.strip()
-        if line:  # 只保留非空行
-            # 清理多余的空格
-            line = ' '.join(line.split())
-            lines.append(line)
+    print(f"正在提取PDF文本: {pdf_path}")
+
+    result = extract_pdf(pdf_path)
+    if result['success']:
+        engines = sorted({page['engine'] for page in result['pages'] if page['engine']})
+        print(f"✅ PDF提取成功，文本长度: {len(result['text'])} 字符，页数: {result['total_pages']}，"
+              f"引擎: {', '.join(engines)}，回退页数: {len(result['fallback_pages'])}，耗时: {result['elapsed_ms']}ms")
+        return result['text']
 
-    return '\n'.join(lines)
+    print(f"❌ PDF提取失败: {result.get('error')}")
+    return None
 
-def extract_text_from_word(word_path: str) -> Optional[str]:
+def extract_text_from_word(word_path: Union[str, io.BytesIO]) -> Optional[str]:
     """
     从Word文档中提取文本
     
     Args:
-        word_path: Word文件路径
+        word_path: Word文件路径，或内存中的DOCX文件对象
         
     Returns:
         提取的文本内容，如果提取失败则返回None
     """
     try:
-        # 动态导入python-docx，避免全局依赖
-        try:
-            import docx
-        except ImportError:
-            print("python-docx库未安装，尝试安装...")
-            import subprocess
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "python-docx"])
-            import docx
-        
-        print(f"正在从Word文档提取文本: {word_path}")
+        print(f"正在从Word文档提取文本: {word_path if isinstance(word_path, str) else '内存文档'}")
         
-        # 检查文件扩展名
-        _, file_extension = os.path.splitext(word_path)
-        file_extension = file_extension.lower()
+        # 检查文件扩展名（文件对象只能是DOCX）
+        if isinstance(word_path, str):
+            _, file_extension = os.path.splitext(word_path)
+            file_extension = file_extension.lower()
+        else:
+            file_extension = '.docx'
         
         if file_extension == '.docx':
-            # 打开DOCX文件
-            doc = docx.Document(word_path)
-            
-            # 提取所有段落的文本
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+            # 流式解析document.xml，段落和表格按文档顺序提取
+            text = docx_text(word_path)
             
             print(f"成功提取Word文本，长度: {len(text)} 字符")
             return text
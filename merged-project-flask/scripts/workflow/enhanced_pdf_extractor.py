@@ -3,7 +3,7 @@
 
 """
 增强版PDF文本提取器 - 优化版
-使用智能回退机制：PyPDF2 → PyMuPDF → pdfplumber
+自动模式按页调度：PyMuPDF优先，质量不达标的页面回退到pdfplumber、PyPDF2（见pdf_extraction_orchestrator）
 """
 
 import os
@@ -11,6 +11,12 @@ import sys
 import logging
 from typing import Optional, Dict, Any
 
+from pdf_extraction_orchestrator import extract_pdf
+
+# 添加项目根目录到路径（文本规范化模块位于utils）
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from utils.text_normalizer import clean_lines
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,7 +25,7 @@ class EnhancedPDFExtractor:
     """增强版PDF文本提取器 - 优化版"""
     
     def __init__(self):
-        # 使用优化的提取方法顺序：PyPDF2 → PyMuPDF → pdfplumber
+        # 单一引擎的提取方法（自动模式由PDFExtractionOrchestrator按页调度）
         self.extraction_methods = [
             self._extract_with_pypdf2,
             self._extract_with_pymupdf,
@@ -56,24 +62,20 @@ class EnhancedPDFExtractor:
     def _auto_extract_optimized(self, pdf_path: str) -> Dict[str, Any]:
         """
         优化的自动提取方法
-        按优先级尝试：PyPDF2 → PyMuPDF → pdfplumber
+        由PDFExtractionOrchestrator按页调度：PyMuPDF优先，只对质量不达标的页面回退到pdfplumber、PyPDF2
         """
-        for method_func in self.extraction_methods:
-            try:
-                result = method_func(pdf_path)
-                if result['success'] and len(result['text'].strip()) > 50:
-                    result['auto_selected'] = True
-                    logger.info(f"自动选择方法: {result['method']}")
-                    return result
-            except Exception as e:
-                logger.warning(f"方法 {method_func.__name__} 失败: {str(e)}")
-                continue
-        
+        result = extract_pdf(pdf_path)
+        if result['success']:
+            result['auto_selected'] = True
+            logger.info(f"自动提取完成: {result['total_pages']}页, 回退页数 {len(result['fallback_pages'])}, "
+                        f"耗时 {result['elapsed_ms']}ms")
+            return result
+
         return {
             'text': '',
             'success': False,
             'method': 'auto',
-            'error': '所有提取方法都失败了'
+            'error': result.get('error', '所有提取方法都失败了')
         }
     
     def _extract_with_pypdf2(self, pdf_path: str) -> Dict[str, Any]:
@@ -88,7 +90,7 @@ class EnhancedPDFExtractor:
                 for page_num, page in enumerate(pdf_reader.pages):
                     page_text = page.extract_text()
                     if page_text and page_text.strip():
-                        cleaned_text = self._clean_text(page_text)
+                        cleaned_text = clean_lines(page_text)
                         text_blocks.append(cleaned_text)
                 
                 full_text = '\n\n'.join(text_blocks)
@@ -128,7 +130,7 @@ class EnhancedPDFExtractor:
                 page = doc[page_num]
                 page_text = page.get_text()
                 if page_text and page_text.strip():
-                    cleaned_text = self._clean_text(page_text)
+                    cleaned_text = clean_lines(page_text)
                     text_blocks.append(cleaned_text)
             
             doc.close()
@@ -166,7 +168,7 @@ class EnhancedPDFExtractor:
                 for page_num, page in enumerate(pdf.pages):
                     page_text = page.extract_text()
                     if page_text and page_text.strip():
-                        cleaned_text = self._clean_text(page_text)
+                        cleaned_text = clean_lines(page_text)
                         text_blocks.append(cleaned_text)
             
             full_text = '\n\n'.join(text_blocks)
@@ -192,30 +194,6 @@ class EnhancedPDFExtractor:
                 'method': 'pdfplumber',
                 'error': str(e)
             }
-    
-    def _clean_text(self, text: str) -> str:
-        """
-        清理提取的文本，优化格式
-        
-        Args:
-            text: 原始提取的文本
-            
-        Returns:
-            清理后的文本
-        """
-        if not text:
-            return ""
-        
-        # 移除多余的空格和换行
-        lines = []
-        for line in text.split('\n'):
-            line = line.strip()
-            if line:  # 只保留非空行
-                # 清理多余的空格
-                line = ' '.join(line.split())
-                lines.append(line)
-        
-        return '\n'.join(lines)
 
 # 兼容性函数，保持与现有代码的兼容
 def extract_text_from_pdf_enhanced(pdf_path: str, method: str = 'auto') -> Optional[str]:
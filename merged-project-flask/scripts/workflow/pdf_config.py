@@ -16,8 +16,10 @@ PDF_CONFIG = {
     'quality_threshold': 50,  # 文本质量评分阈值
     'min_text_length': 50,    # 最小文本长度
     
-    # OCR配置
+    # OCR配置（没有文本层的扫描页面在本地OCR，见pdf_ocr）
     'ocr_config': {
+        'engine': 'tesseract',    # OCR引擎：tesseract, paddleocr, none(不使用OCR)
+        'max_workers': min(4, os.cpu_count() or 1),  # OCR进程数（多页时并行）
         'use_angle_cls': True,    # 是否使用角度分类
         'lang': 'ch',             # 语言：ch(中文), en(英文)
         'confidence_threshold': 0.5,  # 置信度阈值
@@ -84,6 +86,9 @@ def load_config():
     if os.getenv('PDF_OCR_LANG'):
         config['ocr_config']['lang'] = os.getenv('PDF_OCR_LANG')
     
+    if os.getenv('PDF_OCR_ENGINE'):
+        config['ocr_config']['engine'] = os.getenv('PDF_OCR_ENGINE')
+    
     if os.getenv('PDF_MAX_FILE_SIZE'):
         try:
             config['file_config']['max_file_size'] = int(os.getenv('PDF_MAX_FILE_SIZE'))
@@ -113,6 +118,10 @@ def validate_config(config):
     if config['default_method'] not in valid_methods:
         errors.append(f"无效的默认方法: {config['default_method']}")
     
+    # 验证OCR引擎
+    if config['ocr_config']['engine'] not in ['tesseract', 'paddleocr', 'none']:
+        errors.append(f"无效的OCR引擎: {config['ocr_config']['engine']}")
+    
     # 验证语言
     valid_langs = ['ch', 'en', 'fr', 'german', 'korean', 'japan']
     if config['ocr_config']['lang'] not in valid_langs:
@@ -134,6 +143,7 @@ def print_config():
     config = get_config()
     print("=== PDF处理配置 ===")
     print(f"默认方法: {config['default_method']}")
+    print(f"OCR引擎: {config['ocr_config']['engine']}")
     print(f"OCR语言: {config['ocr_config']['lang']}")
     print(f"最大文件大小: {config['file_config']['max_file_size'] / 1024 / 1024:.1f}MB")
     print(f"超时时间: {config['performance_config']['timeout']}秒")
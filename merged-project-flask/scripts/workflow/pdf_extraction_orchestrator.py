@@ -0,0 +1,504 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+PDF文本提取调度器
+文件只读取一次，先用最快的PyMuPDF逐页提取（页数较多时分发到进程池并行），
+按页评估文本质量，只对质量不达标的页面依次尝试pdfplumber、PyPDF2，达标后立即停止；
+所有引擎都没有提取到文本的页面（扫描页）交给本地OCR（见pdf_ocr）；
+也可以用iter_pages逐页产出结果，边解析边交给下游处理
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# 添加项目根目录到路径（文本规范化模块位于utils）
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from utils.text_normalizer import clean_lines
+
+logger = logging.getLogger(__name__)
+
+# 页面文本质量阈值，低于该值的页面交给后备引擎重新提取
+DEFAULT_QUALITY_THRESHOLD = 0.6
+# 质量评分中视为完整页面的最少字符数
+MIN_PAGE_CHARS = 20
+# 页数达到该值时分发到进程池并行提取
+PARALLEL_MIN_PAGES = 16
+# 进程池默认大小
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+# OCR单页耗时较长，页数达到该值即并行识别
+OCR_PARALLEL_MIN_PAGES = 2
+
+# 正常文本字符：中日韩文字、全角标点、ASCII可打印字符和空白
+_VALID_CHAR_RE = re.compile(r'[一-鿿　-〿＀-￯ -~\s·‐-‧]')
+# 提取失败的常见痕迹：替换字符、私有区字符、pdfminer的(cid:xx)
+_GARBLED_RE = re.compile(r'[�-]|\(cid:\d+\)')
+
+# 提取源：文件内容（bytes）或文件路径
+Source = Union[bytes, str]
+# 表格：行列表，每行为单元格文本列表
+Table = List[List[str]]
+
+
+def clean_page_text(text: str) -> str:
+    """
+    清理单页文本：全角转半角、去除不可见字符，去掉空行并合并行内多余空格（见text_normalizer.clean_lines）
+
+    Args:
+        text: 原始提取的文本
+
+    Returns:
+        清理后的文本
+    """
+    return clean_lines(text)
+
+
+def score_text_quality(text: str) -> float:
+    """
+    评估页面文本质量
+
+    Args:
+        text: 清理后的页面文本
+
+    Returns:
+        0~1之间的分数：正常字符占比（扣除乱码痕迹），文本过短时按长度折减
+    """
+    if not text:
+        return 0.0
+    valid = len(_VALID_CHAR_RE.findall(text))
+    garbled = sum(len(match) for match in _GARBLED_RE.findall(text))
+    ratio = max(0.0, valid - garbled) / len(text)
+    return ratio * min(1.0, len(text) / MIN_PAGE_CHARS)
+
+
+def _open_stream(source: Source):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _pymupdf_pages(source: Source, page_numbers: Sequence[int]) -> List[Tuple[int, str]]:
+    """使用PyMuPDF提取指定页面（速度最快）"""
+    import fitz
+
+    doc = fitz.open(stream=source, filetype='pdf') if isinstance(source, bytes) else fitz.open(source)
+    try:
+        return [(page_no, doc[page_no].get_text()) for page_no in page_numbers]
+    finally:
+        doc.close()
+
+
+def _pdfplumber_pages(source: Source, page_numbers: Sequence[int]) -> List[Tuple[int, str]]:
+    """使用pdfplumber提取指定页面（表格处理较好）"""
+    import pdfplumber
+
+    with pdfplumber.open(_open_stream(source)) as pdf:
+        return [(page_no, pdf.pages[page_no].extract_text() or '') for page_no in page_numbers]
+
+
+def _pypdf2_pages(source: Source, page_numbers: Sequence[int]) -> List[Tuple[int, str]]:
+    """使用PyPDF2提取指定页面"""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(_open_stream(source))
+    return [(page_no, reader.pages[page_no].extract_text() or '') for page_no in page_numbers]
+
+
+def _pymupdf_tables(page) -> List[Table]:
+    """使用PyMuPDF识别页面中的表格（单元格文本已清理，空行已去掉）"""
+    tables = []
+    for table in page.find_tables().tables:
+        rows = []
+        for row in table.extract():
+            cells = [' '.join((cell or '').split()) for cell in row]
+            if any(cells):
+                rows.append(cells)
+        if rows:
+            tables.append(rows)
+    return tables
+
+
+# 提取引擎（按尝试顺序）
+ENGINES: Dict[str, Callable[[Source, Sequence[int]], List[Tuple[int, str]]]] = OrderedDict([
+    ('pymupdf', _pymupdf_pages),
+    ('pdfplumber', _pdfplumber_pages),
+    ('pypdf2', _pypdf2_pages)
+])
+
+
+def _open_pymupdf(source: Source):
+    import fitz
+
+    return fitz.open(stream=source, filetype='pdf') if isinstance(source, bytes) else fitz.open(source)
+
+
+def _open_pdfplumber(source: Source):
+    import pdfplumber
+
+    return pdfplumber.open(_open_stream(source))
+
+
+def _open_pypdf2(source: Source):
+    import PyPDF2
+
+    return PyPDF2.PdfReader(_open_stream(source))
+
+
+# 逐页提取时各引擎的 (打开文档, 取单页文本)
+PAGE_READERS: Dict[str, Tuple[Callable[[Source], Any], Callable[[Any, int], str]]] = {
+    'pymupdf': (_open_pymupdf, lambda doc, page_no: doc[page_no].get_text()),
+    'pdfplumber': (_open_pdfplumber, lambda pdf, page_no: pdf.pages[page_no].extract_text() or ''),
+    'pypdf2': (_open_pypdf2, lambda reader, page_no: reader.pages[page_no].extract_text() or '')
+}
+
+
+class OpenDocuments:
+    """逐页提取期间各引擎常开的文档：每个引擎首次用到时解析一次整个PDF，之后逐页复用，close时统一关闭"""
+
+    def __init__(self, source: Source):
+        self.source = source
+        # 引擎 -> 已打开的文档，None表示该引擎不可用或打开失败（不再重试）
+        self._docs: Dict[str, Any] = {}
+
+    def document(self, engine: str) -> Any:
+        """获取引擎的文档（首次调用时打开），引擎不可用时返回None"""
+        if engine not in self._docs:
+            try:
+                self._docs[engine] = PAGE_READERS[engine][0](self.source)
+            except ImportError:
+                self._docs[engine] = None
+            except Exception as e:
+                logger.warning(f"{engine}打开PDF失败: {str(e)}")
+                self._docs[engine] = None
+        return self._docs[engine]
+
+    def page_text(self, engine: str, page_no: int) -> Optional[str]:
+        """用指定引擎提取单页的原始文本，引擎不可用时返回None"""
+        doc = self.document(engine)
+        if doc is None:
+            return None
+        return PAGE_READERS[engine][1](doc, page_no)
+
+    def close(self) -> None:
+        for doc in self._docs.values():
+            close = getattr(doc, 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+        self._docs.clear()
+
+
+def count_pages(source: Source) -> int:
+    """获取PDF页数（优先使用PyMuPDF）"""
+    try:
+        import fitz
+
+        doc = fitz.open(stream=source, filetype='pdf') if isinstance(source, bytes) else fitz.open(source)
+        try:
+            return doc.page_count
+        finally:
+            doc.close()
+    except ImportError:
+        import PyPDF2
+
+        return len(PyPDF2.PdfReader(_open_stream(source)).pages)
+
+
+# 进程池（首次并行提取时创建，进程内复用）
+_process_pool = None
+_process_pool_pid = None
+
+
+def get_process_pool(max_workers: int = DEFAULT_MAX_WORKERS) -> ProcessPoolExecutor:
+    """
+    获取提取用的进程池（spawn方式，不继承web worker中已加载的模型等状态）
+
+    Args:
+        max_workers: 进程数
+
+    Returns:
+        ProcessPoolExecutor实例
+    """
+    global _process_pool, _process_pool_pid
+    if _process_pool is None or _process_pool_pid != os.getpid():
+        _process_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        _process_pool_pid = os.getpid()
+    return _process_pool
+
+
+def reset_process_pool() -> None:
+    """关闭并丢弃进程池（下次并行提取时重新创建）"""
+    global _process_pool
+    pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+class PDFExtractionOrchestrator:
+    """PDF文本提取调度器：PyMuPDF优先 + 按页质量评估 + 低质量页面回退"""
+
+    def __init__(self, quality_threshold: float = DEFAULT_QUALITY_THRESHOLD,
+                 parallel_min_pages: int = PARALLEL_MIN_PAGES, max_workers: int = DEFAULT_MAX_WORKERS,
+                 engines: Optional[Sequence[str]] = None, ocr=None, use_ocr: bool = True):
+        """
+        Args:
+            quality_threshold: 页面文本质量阈值
+            parallel_min_pages: 页数达到该值时使用进程池并行提取，0表示不并行
+            max_workers: 进程池大小
+            engines: 引擎尝试顺序，默认 pymupdf → pdfplumber → pypdf2
+            ocr: 本地OCR（pdf_ocr.LocalOCR），默认使用pdf_config中配置的引擎
+            use_ocr: 是否对没有文本层的页面做OCR
+        """
+        self.quality_threshold = quality_threshold
+        self.parallel_min_pages = parallel_min_pages
+        self.max_workers = max(1, max_workers)
+        self.engines = list(engines or ENGINES.keys())
+        self.ocr = ocr
+        self.use_ocr = use_ocr
+
+    def _get_ocr(self):
+        """获取可用的本地OCR，未启用或引擎不可用时返回None"""
+        if not self.use_ocr:
+            return None
+        if self.ocr is None:
+            from pdf_ocr import get_local_ocr
+
+            self.ocr = get_local_ocr()
+        return self.ocr if self.ocr.available() else None
+
+    def _run_engine(self, engine: str, source: Source, pdf_path: Optional[str],
+                    page_numbers: List[int]) -> List[Tuple[int, str]]:
+        """用一个引擎提取指定页面，页数较多时按页段分发到进程池"""
+        return self._run_pages(ENGINES[engine], source, pdf_path, page_numbers,
+                               self.parallel_min_pages, self.max_workers)
+
+    def _run_pages(self, func: Callable[[Source, Sequence[int]], List[Tuple[int, str]]], source: Source,
+                   pdf_path: Optional[str], page_numbers: List[int], parallel_min_pages: int,
+                   max_workers: int) -> List[Tuple[int, str]]:
+        """用func处理指定页面，页数达到parallel_min_pages时按页段分发到进程池"""
+        if not parallel_min_pages or len(page_numbers) < parallel_min_pages or max_workers < 2:
+            return func(source, page_numbers)
+        # 守护进程（如multiprocessing.Pool的worker）不能创建子进程，直接在当前进程中提取
+        if multiprocessing.current_process().daemon:
+            return func(source, page_numbers)
+
+        # 子进程按路径打开文件（由系统页缓存共享），避免把整个文件内容序列化给每个进程
+        worker_source = pdf_path if pdf_path else source
+        chunk_size = -(-len(page_numbers) // max_workers)
+        chunks = [page_numbers[i:i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]
+        results = []
+        try:
+            pool = get_process_pool(max_workers)
+            for chunk_result in pool.map(func, [worker_source] * len(chunks), chunks):
+                results.extend(chunk_result)
+        except (BrokenProcessPool, AssertionError, OSError) as e:
+            # 进程池无法创建子进程，或子进程异常退出后不可再用：重建进程池，本次在当前进程中提取
+            logger.warning(f"PDF提取进程池不可用，改为在当前进程中提取: {str(e)}")
+            reset_process_pool()
+            return func(source, page_numbers)
+        return results
+
+    def extract(self, pdf_path: Optional[str] = None, data: Optional[bytes] = None) -> Dict[str, Any]:
+        """
+        提取PDF文本
+
+        Args:
+            pdf_path: PDF文件路径
+            data: PDF文件内容（已在内存中时传入，不再读取文件）
+
+        Returns:
+            {'text', 'success', 'method', 'pages': [{'page_no', 'text', 'engine', 'quality'}],
+             'page_count', 'total_pages', 'fallback_pages', 'elapsed_ms', 'error'}
+        """
+        start_time = time.time()
+        if data is None:
+            # 文件只读取一次，各引擎共享同一份内容
+            with open(pdf_path, 'rb') as f:
+                data = f.read()
+
+        try:
+            total_pages = count_pages(data)
+        except Exception as e:
+            return {'text': '', 'success': False, 'method': 'orchestrated', 'error': f"无法打开PDF: {str(e)}"}
+
+        # 每页当前最好的结果：(质量分, 文本, 引擎)
+        best: Dict[int, Tuple[float, str, Optional[str]]] = {page_no: (0.0, '', None) for page_no in range(total_pages)}
+        pending = list(range(total_pages))
+        fallback_pages = set()
+        errors = []
+
+        for index, engine in enumerate(self.engines):
+            if not pending:
+                break
+            if index > 0:
+                fallback_pages.update(pending)
+                logger.info(f"{len(pending)}页文本质量不达标，使用{engine}重新提取")
+            try:
+                page_texts = self._run_engine(engine, data, pdf_path, pending)
+            except ImportError:
+                errors.append(f"{engine}未安装")
+                continue
+            except Exception as e:
+                errors.append(f"{engine}: {str(e)}")
+                logger.warning(f"{engine}提取失败: {str(e)}")
+                continue
+
+            for page_no, raw_text in page_texts:
+                text = clean_page_text(raw_text)
+                quality = score_text_quality(text)
+                if quality > best[page_no][0]:
+                    best[page_no] = (quality, text, engine)
+            # 只有仍不达标的页面进入下一个引擎
+            pending = [page_no for page_no in pending if best[page_no][0] < self.quality_threshold]
+
+        # 所有引擎都没有提取到文本的页面（没有文本层的扫描页）做本地OCR
+        ocr_pages = [page_no for page_no in pending if not best[page_no][1]]
+        ocr = self._get_ocr() if ocr_pages else None
+        if ocr is not None:
+            engine = f'ocr:{ocr.engine}'
+            logger.info(f"{len(ocr_pages)}页没有文本层，使用本地OCR({ocr.engine})识别")
+            try:
+                page_texts = self._run_pages(ocr.page_func(), data, pdf_path, ocr_pages,
+                                             OCR_PARALLEL_MIN_PAGES, ocr.max_workers)
+                for page_no, raw_text in page_texts:
+                    text = clean_page_text(raw_text)
+                    best[page_no] = (score_text_quality(text), text, engine)
+            except Exception as e:
+                errors.append(f"OCR: {str(e)}")
+                logger.warning(f"本地OCR失败: {str(e)}")
+
+        pages = [
+            {'page_no': page_no, 'text': text, 'engine': engine, 'quality': round(quality, 3)}
+            for page_no, (quality, text, engine) in sorted(best.items())
+        ]
+        text_blocks = [page['text'] for page in pages if page['text']]
+        result = {
+            'text': '\n\n'.join(text_blocks),
+            'success': bool(text_blocks),
+            'method': 'orchestrated',
+            'pages': pages,
+            'page_count': len(text_blocks),
+            'total_pages': total_pages,
+            'fallback_pages': sorted(fallback_pages),
+            'ocr_pages': [page['page_no'] for page in pages if page['engine'] and page['engine'].startswith('ocr:')],
+            'elapsed_ms': round((time.time() - start_time) * 1000, 1)
+        }
+        if not text_blocks:
+            result['error'] = '; '.join(errors) or '未提取到文本内容，可能是扫描版PDF且本地OCR不可用'
+        return result
+
+    def _fallback_page(self, documents: OpenDocuments, page_no: int, engines: Sequence[str],
+                       best: Tuple[float, str, Optional[str]]) -> Tuple[float, str, Optional[str]]:
+        """单页依次尝试后备引擎（复用已打开的文档），达到质量阈值后立即停止"""
+        for engine in engines:
+            if best[0] >= self.quality_threshold:
+                break
+            try:
+                raw_text = documents.page_text(engine, page_no)
+            except Exception as e:
+                logger.warning(f"{engine}提取第{page_no}页失败: {str(e)}")
+                continue
+            if raw_text is None:
+                continue
+            text = clean_page_text(raw_text)
+            quality = score_text_quality(text)
+            if quality > best[0]:
+                best = (quality, text, engine)
+        return best
+
+    def iter_pages(self, pdf_path: Optional[str] = None, data: Optional[bytes] = None,
+                   with_tables: bool = False) -> Iterator[Tuple[int, str, List[Table]]]:
+        """
+        逐页提取PDF文本（生成器）：每解析完一页立即产出，不等待整个文件提取完成。
+        质量不达标的页面当场回退到后备引擎；各引擎的文档在生成器存续期间保持打开，只解析一次；
+        逐页模式不使用进程池
+
+        Args:
+            pdf_path: PDF文件路径
+            data: PDF文件内容（已在内存中时传入，不再读取文件）
+            with_tables: 是否识别页面中的表格（需要PyMuPDF，较慢）
+
+        Yields:
+            (page_no, text, tables)：页码（从0开始，与extract结果中的page_no一致）、清理后的页面文本、表格列表
+        """
+        if data is None:
+            with open(pdf_path, 'rb') as f:
+                data = f.read()
+
+        documents = OpenDocuments(data)
+        primary = self.engines[0] if self.engines else None
+        doc = documents.document('pymupdf') if primary == 'pymupdf' else None
+        try:
+            if doc is None:
+                # 没有PyMuPDF时不识别表格，每页按引擎顺序提取（页数取自已打开的PyPDF2文档）
+                reader = documents.document('pypdf2')
+                page_count = len(reader.pages) if reader is not None else count_pages(data)
+                for page_no in range(page_count):
+                    _, text, _ = self._fallback_page(documents, page_no, self.engines, (0.0, '', None))
+                    yield page_no, text or self._ocr_page(data, page_no), []
+                return
+
+            for page_no in range(doc.page_count):
+                page = doc[page_no]
+                text = clean_page_text(page.get_text())
+                best = self._fallback_page(documents, page_no, self.engines[1:],
+                                           (score_text_quality(text), text, primary))
+                tables = []
+                if with_tables:
+                    try:
+                        tables = _pymupdf_tables(page)
+                    except Exception as e:
+                        logger.warning(f"识别第{page_no}页表格失败: {str(e)}")
+                yield page_no, best[1] or self._ocr_page(data, page_no), tables
+        finally:
+            documents.close()
+
+    def _ocr_page(self, source: Source, page_no: int) -> str:
+        """对单个没有文本层的页面做本地OCR，OCR不可用或失败时返回空文本"""
+        ocr = self._get_ocr()
+        if ocr is None:
+            return ''
+        try:
+            [(_, raw_text)] = ocr.page_func()(source, [page_no])
+        except Exception as e:
+            logger.warning(f"本地OCR识别第{page_no}页失败: {str(e)}")
+            return ''
+        return clean_page_text(raw_text)
+
+
+# 默认调度器
+_default_orchestrator = None
+
+
+def get_pdf_orchestrator() -> PDFExtractionOrchestrator:
+    """获取默认的PDF提取调度器（单例模式）"""
+    global _default_orchestrator
+    if _default_orchestrator is None:
+        _default_orchestrator = PDFExtractionOrchestrator()
+    return _default_orchestrator
+
+
+def set_pdf_orchestrator(orchestrator: PDFExtractionOrchestrator) -> None:
+    """替换默认的PDF提取调度器（如批量处理的子进程中使用不开进程池的调度器）"""
+    global _default_orchestrator
+    _default_orchestrator = orchestrator
+
+
+def extract_pdf(pdf_path: Optional[str] = None, data: Optional[bytes] = None) -> Dict[str, Any]:
+    """使用默认调度器提取PDF文本（见PDFExtractionOrchestrator.extract）"""
+    return get_pdf_orchestrator().extract(pdf_path, data)
+
+
+def iter_pdf_pages(pdf_path: Optional[str] = None, data: Optional[bytes] = None,
+                   with_tables: bool = False) -> Iterator[Tuple[int, str, List[Table]]]:
+    """使用默认调度器逐页提取PDF文本（见PDFExtractionOrchestrator.iter_pages）"""
+    return get_pdf_orchestrator().iter_pages(pdf_path, data, with_tables)
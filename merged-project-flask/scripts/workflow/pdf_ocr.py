@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+扫描版PDF的本地OCR
+只对没有文本层的页面栅格化后在本地识别（Tesseract或PaddleOCR，CPU运行），不调用远程服务；
+识别结果按页面图像的哈希缓存，同一扫描页再次出现时不再识别
+"""
+
+import os
+import sys
+import shutil
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from pdf_config import get_config
+
+# 添加项目根目录到路径（结果缓存模块位于utils）
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+logger = logging.getLogger(__name__)
+
+# OCR结果版本，修改栅格化或识别参数的处理方式后递增以使旧缓存失效
+OCR_VERSION = 1
+# OCR结果缓存的命名空间
+OCR_CACHE_NAMESPACE = 'pdf_ocr'
+# OCR结果缓存的磁盘预算
+OCR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# 支持的引擎
+ENGINE_TESSERACT = 'tesseract'
+ENGINE_PADDLEOCR = 'paddleocr'
+ENGINE_NONE = 'none'
+
+# pdf_config中的语言 -> Tesseract语言包
+TESSERACT_LANGS = {'ch': 'chi_sim+eng', 'en': 'eng', 'japan': 'jpn+eng', 'korean': 'kor+eng',
+                   'fr': 'fra+eng', 'german': 'deu+eng'}
+
+# 提取源：文件内容（bytes）或文件路径
+Source = Union[bytes, str]
+
+
+def rasterize_page(doc, page_no: int, zoom: float = 2.0) -> bytes:
+    """
+    将PDF页面渲染为灰度PNG
+
+    Args:
+        doc: 已打开的PyMuPDF文档
+        page_no: 页码（从0开始）
+        zoom: 缩放倍数（1.0为72dpi）
+
+    Returns:
+        PNG图像数据
+    """
+    import fitz
+
+    pixmap = doc[page_no].get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+    return pixmap.tobytes('png')
+
+
+def _ocr_tesseract(image: bytes, options: Dict[str, Any]) -> str:
+    """Tesseract识别"""
+    import io
+    import pytesseract
+    from PIL import Image
+
+    lang = TESSERACT_LANGS.get(options['lang'], options['lang'])
+    return pytesseract.image_to_string(Image.open(io.BytesIO(image)), lang=lang)
+
+
+# 进程内的PaddleOCR实例（首次使用时加载）
+_paddle_ocr = None
+
+
+def _ocr_paddle(image: bytes, options: Dict[str, Any]) -> str:
+    """PaddleOCR识别（按置信度阈值过滤文本行）"""
+    global _paddle_ocr
+    import numpy as np
+    import cv2
+
+    if _paddle_ocr is None:
+        from paddleocr import PaddleOCR
+
+        _paddle_ocr = PaddleOCR(use_angle_cls=options['use_angle_cls'], lang=options['lang'], show_log=False)
+    array = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    lines = []
+    for page in _paddle_ocr.ocr(array, cls=options['use_angle_cls']) or []:
+        for _, (text, confidence) in page or []:
+            if confidence >= options['confidence_threshold']:
+                lines.append(text)
+    return '\n'.join(lines)
+
+
+# OCR引擎
+OCR_ENGINES: Dict[str, Callable[[bytes, Dict[str, Any]], str]] = {
+    ENGINE_TESSERACT: _ocr_tesseract,
+    ENGINE_PADDLEOCR: _ocr_paddle
+}
+
+
+def _get_ocr_cache():
+    """获取OCR结果缓存，项目根目录不可导入时不使用缓存"""
+    try:
+        from utils.result_cache import get_result_cache
+    except ImportError:
+        return None
+    return get_result_cache(OCR_CACHE_NAMESPACE, max_disk_bytes=OCR_CACHE_MAX_BYTES, compress=True)
+
+
+def ocr_pages(source: Source, page_numbers: Sequence[int], options: Dict[str, Any]) -> List[Tuple[int, str]]:
+    """
+    识别指定页面（可在子进程中执行）：逐页栅格化，按页面图像哈希查询缓存，未命中时识别并写入缓存
+
+    Args:
+        source: PDF文件内容或路径
+        page_numbers: 页码列表
+        options: OCR配置（pdf_config中的ocr_config）
+
+    Returns:
+        [(页码, 识别的文本), ...]
+    """
+    import fitz
+
+    cache = _get_ocr_cache()
+    recognize = OCR_ENGINES[options['engine']]
+    results = []
+    doc = fitz.open(stream=source, filetype='pdf') if isinstance(source, bytes) else fitz.open(source)
+    try:
+        for page_no in page_numbers:
+            image = rasterize_page(doc, page_no, options['image_resolution'])
+            cache_key = None
+            if cache is not None:
+                from utils.result_cache import make_cache_key
+
+                cache_key = make_cache_key(image, f"{OCR_VERSION}:{options['engine']}:{options['lang']}")
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    results.append((page_no, cached))
+                    continue
+            text = recognize(image, options)
+            if cache_key is not None:
+                cache.set(cache_key, text)
+            results.append((page_no, text))
+    finally:
+        doc.close()
+    return results
+
+
+class LocalOCR:
+    """本地OCR（配置来自pdf_config的ocr_config）"""
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            options: OCR配置，默认使用pdf_config中的ocr_config
+        """
+        self.options = dict(options or get_config()['ocr_config'])
+        self.engine = self.options.get('engine', ENGINE_TESSERACT)
+        self.max_workers = max(1, self.options.get('max_workers', 1))
+        self._available = None
+
+    def available(self) -> bool:
+        """OCR引擎是否可用（依赖是否安装）"""
+        if self._available is None:
+            if self.engine == ENGINE_TESSERACT:
+                try:
+                    import pytesseract  # noqa: F401
+                    self._available = shutil.which('tesseract') is not None
+                except ImportError:
+                    self._available = False
+            elif self.engine == ENGINE_PADDLEOCR:
+                try:
+                    import paddleocr  # noqa: F401
+                    self._available = True
+                except ImportError:
+                    self._available = False
+            else:
+                self._available = False
+            if not self._available and self.engine != ENGINE_NONE:
+                logger.warning(f"本地OCR引擎{self.engine}不可用，扫描页面将无法提取文本")
+        return self._available
+
+    def page_func(self) -> Callable[[Source, Sequence[int]], List[Tuple[int, str]]]:
+        """与PDF提取引擎签名一致的页面识别函数 (source, page_numbers) -> [(页码, 文本)]，可序列化到子进程"""
+        return partial(ocr_pages, options=self.options)
+
+
+# 默认OCR
+_default_ocr = None
+
+
+def get_local_ocr() -> LocalOCR:
+    """获取默认的本地OCR（单例模式）"""
+    global _default_ocr
+    if _default_ocr is None:
+        _default_ocr = LocalOCR()
+    return _default_ocr
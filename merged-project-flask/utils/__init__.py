@@ -6,4 +6,15 @@
 """
 
 # 导出情感分析器相关类和函数
-from .emotion_analyzer import EmotionAnalyzer, get_emotion_analyzer, EMOTION_LABELS_CN, analyze_emotion, get_emotion_distribution, reset_emotion_stats 
\ No newline at end of file
+# 按需导入：情感分析器依赖torch/cv2，避免导入utils下的轻量模块时一并加载
+_EMOTION_EXPORTS = ('EmotionAnalyzer', 'get_emotion_analyzer', 'EMOTION_LABELS_CN', 'analyze_emotion',
+                    'get_emotion_distribution', 'reset_emotion_stats')
+
+__all__ = list(_EMOTION_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EMOTION_EXPORTS:
+        from . import emotion_analyzer
+        return getattr(emotion_analyzer, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
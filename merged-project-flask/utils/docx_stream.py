@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+DOCX流式解析
+直接从zip中用iterparse读取word/document.xml，按文档顺序产出段落和表格，不构建python-docx的对象模型；
+每个顶层段落/表格处理完后立即从树中清除，内存占用与文档长度无关。
+合并单元格只保留一次：横向合并在XML中本来就是一个单元格，纵向合并的后续单元格按空单元格处理
+"""
+
+import zipfile
+from datetime import datetime
+from xml.etree.ElementTree import iterparse, parse
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+# WordprocessingML命名空间
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MC_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+CORE_NS = {
+    'cp': 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'dcterms': 'http://purl.org/dc/terms/'
+}
+
+# 产出的块类型
+BLOCK_PARAGRAPH = 'paragraph'
+BLOCK_TABLE = 'table'
+BLOCK_PAGE_BREAK = 'page_break'
+
+# DOCX来源：文件路径或文件对象（如io.BytesIO）
+Source = Union[str, IO[bytes]]
+# 块：(类型, 内容)，段落为文本，表格为行列表（每行为单元格文本列表），分页为None
+Block = Tuple[str, Any]
+
+
+def _w(tag: str) -> str:
+    return f'{{{W_NS}}}{tag}'
+
+
+_P = _w('p')
+_TBL = _w('tbl')
+_TR = _w('tr')
+_TC = _w('tc')
+_T = _w('t')
+_BR = _w('br')
+_SDT = _w('sdt')
+_SDT_CONTENT = _w('sdtContent')
+_BODY = _w('body')
+_TYPE = _w('type')
+_VAL = _w('val')
+
+# 可以包裹顶层段落/表格的容器（内容控件）
+_BLOCK_CONTAINERS = frozenset((_SDT, _SDT_CONTENT))
+# 段落中不计入文本的子树：文本框、图形、兼容内容（与python-docx的Paragraph.text一致）、删除的修订
+_SKIPPED_TAGS = frozenset((_w('txbxContent'), _w('drawing'), _w('pict'), _w('del'), _w('pPr'), _w('rPr'),
+                           f'{{{MC_NS}}}AlternateContent'))
+# 产生空白的元素
+_CHAR_TAGS = {_w('tab'): '\t', _w('ptab'): '\t', _w('cr'): '\n', _w('noBreakHyphen'): '-'}
+# 表示关闭的开关属性值
+_OFF_VALUES = ('0', 'false', 'off')
+
+
+def _paragraph_text(element) -> str:
+    """段落文本：按顺序拼接w:t，制表符、换行符转为对应字符，手动分页符忽略"""
+    parts = []
+
+    def walk(node) -> None:
+        for child in node:
+            tag = child.tag
+            if tag == _T:
+                if child.text:
+                    parts.append(child.text)
+            elif tag == _BR:
+                if child.get(_TYPE) not in ('page', 'column'):
+                    parts.append('\n')
+            elif tag in _CHAR_TAGS:
+                parts.append(_CHAR_TAGS[tag])
+            elif tag not in _SKIPPED_TAGS:
+                walk(child)
+
+    walk(element)
+    return ''.join(parts)
+
+
+def _page_breaks(element) -> Tuple[bool, bool]:
+    """(段前分页, 段内手动分页)"""
+    before = element.find(f'{_w("pPr")}/{_w("pageBreakBefore")}')
+    before = before is not None and before.get(_VAL, 'true') not in _OFF_VALUES
+    after = any(br.get(_TYPE) == 'page' for br in element.iter(_BR))
+    return before, after
+
+
+def _iter_children(node, tag: str) -> Iterator[Any]:
+    """指定标签的直接子元素（穿过内容控件，不进入嵌套表格）"""
+    for child in node:
+        if child.tag == tag:
+            yield child
+        elif child.tag in _BLOCK_CONTAINERS:
+            yield from _iter_children(child, tag)
+
+
+def _cell_text(cell) -> str:
+    """单元格文本：单元格内段落（含嵌套表格中的段落）按顺序以空格连接，合并多余空白"""
+    texts = []
+
+    def walk(node) -> None:
+        for child in node:
+            if child.tag == _P:
+                texts.append(_paragraph_text(child))
+            elif child.tag == _TBL:
+                for tr in _iter_children(child, _TR):
+                    for tc in _iter_children(tr, _TC):
+                        walk(tc)
+            elif child.tag in _BLOCK_CONTAINERS:
+                walk(child)
+
+    walk(cell)
+    return ' '.join(' '.join(texts).split())
+
+
+def _table_rows(table) -> List[List[str]]:
+    """表格的行列表（去掉全空的行）"""
+    rows = []
+    for tr in _iter_children(table, _TR):
+        cells = []
+        for tc in _iter_children(tr, _TC):
+            v_merge = tc.find(f'{_w("tcPr")}/{_w("vMerge")}')
+            if v_merge is not None and v_merge.get(_VAL) != 'restart':
+                # 纵向合并的后续单元格，内容已在首行出现
+                cells.append('')
+            else:
+                cells.append(_cell_text(tc))
+        if any(cells):
+            rows.append(cells)
+    return rows
+
+
+def iter_docx_blocks(source: Source) -> Iterator[Block]:
+    """
+    按文档顺序流式产出DOCX的段落、表格和分页
+
+    Args:
+        source: DOCX文件路径，或内存中的DOCX文件对象
+
+    Yields:
+        (BLOCK_PARAGRAPH, 段落文本) / (BLOCK_TABLE, 行列表) / (BLOCK_PAGE_BREAK, None)；
+        “段前分页”在段落之前产出分页，手动分页符近似为在段落之后产出分页
+    """
+    with zipfile.ZipFile(source) as archive:
+        with archive.open('word/document.xml') as stream:
+            # 从根节点到当前元素的路径
+            path = []
+            for event, element in iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    path.append(element)
+                    continue
+                path.pop()
+                if element.tag != _P and element.tag != _TBL:
+                    continue
+                # 只处理body下（或内容控件中）的顶层段落和表格，嵌套的由所在的顶层元素处理
+                containers = [node.tag for node in path]
+                if _BODY not in containers:
+                    continue
+                body_index = containers.index(_BODY)
+                if not all(tag in _BLOCK_CONTAINERS for tag in containers[body_index + 1:]):
+                    continue
+
+                if element.tag == _P:
+                    break_before, break_after = _page_breaks(element)
+                    if break_before:
+                        yield BLOCK_PAGE_BREAK, None
+                    yield BLOCK_PARAGRAPH, _paragraph_text(element)
+                    if break_after:
+                        yield BLOCK_PAGE_BREAK, None
+                else:
+                    yield BLOCK_TABLE, _table_rows(element)
+                # 已处理的元素从树中移除，保持内存占用平稳
+                element.clear()
+                path[-1].remove(element)
+
+
+def docx_text(source: Source, paragraph_separator: str = '\n') -> str:
+    """
+    DOCX全文（段落和表格按文档顺序，表格每行为“单元格 | 单元格”）
+
+    Args:
+        source: DOCX文件路径，或内存中的DOCX文件对象
+        paragraph_separator: 块之间的分隔符
+
+    Returns:
+        文档文本（空段落已去掉）
+    """
+    parts = []
+    for kind, content in iter_docx_blocks(source):
+        if kind == BLOCK_PARAGRAPH:
+            text = content.strip()
+            if text:
+                parts.append(text)
+        elif kind == BLOCK_TABLE and content:
+            parts.append('\n'.join(' | '.join(cell for cell in row if cell) for row in content))
+    return paragraph_separator.join(parts)
+
+
+def _format_datetime(value: Optional[str]) -> str:
+    """W3CDTF时间转为与python-docx core_properties一致的字符串"""
+    if not value:
+        return ''
+    try:
+        return str(datetime.strptime(value.strip().replace('Z', '+00:00'), '%Y-%m-%dT%H:%M:%S%z'))
+    except ValueError:
+        return value.strip()
+
+
+def read_docx_properties(source: Source) -> Dict[str, str]:
+    """
+    读取DOCX的文档属性（docProps/core.xml）
+
+    Args:
+        source: DOCX文件路径，或内存中的DOCX文件对象
+
+    Returns:
+        {'title', 'author', 'created', 'modified', 'last_modified_by'}，缺失的属性为空字符串
+    """
+    properties = {'title': '', 'author': '', 'created': '', 'modified': '', 'last_modified_by': ''}
+    with zipfile.ZipFile(source) as archive:
+        if 'docProps/core.xml' not in archive.namelist():
+            return properties
+        with archive.open('docProps/core.xml') as stream:
+            root = parse(stream).getroot()
+
+    def value(path: str) -> Optional[str]:
+        node = root.find(path, CORE_NS)
+        return node.text if node is not None else None
+
+    properties['title'] = value('dc:title') or ''
+    properties['author'] = value('dc:creator') or ''
+    properties['created'] = _format_datetime(value('dcterms:created'))
+    properties['modified'] = _format_datetime(value('dcterms:modified'))
+    properties['last_modified_by'] = value('cp:lastModifiedBy') or ''
+    return properties
@@ -7,13 +7,14 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 from torchvision import transforms
-from PIL import Image
 import cv2
 import numpy as np
 import time
 import base64
+import threading
 from flask import current_app
 from models.EfficientFace import efficient_face
+from utils.emotion_backends import BACKEND_PYTORCH, load_emotion_runtime
 
 # 英文情绪标签到中文情绪标签的映射
 # EfficientFace使用RAF-DB数据集的标签顺序: 0: Neutral; 1: Happiness; 2: Sadness; 3: Surprise; 4: Fear; 5: Disgust; 6: Anger
@@ -38,6 +39,14 @@ EMOTION_INDEX_TO_LABEL = {
     6: 'anger'
 }
 
+# 批量推理时单次前向计算的最大人脸数
+EMOTION_BATCH_SIZE = 16
+
+# 模型输入尺寸与归一化参数（RGB顺序，与训练时一致）
+EMOTION_INPUT_SIZE = 224
+EMOTION_MEAN = (0.57535914, 0.44928582, 0.40079932)
+EMOTION_STD = (0.20735591, 0.18981615, 0.18132027)
+
 # 全局情感分析器实例
 _emotion_analyzer_instance = None
 
@@ -45,23 +54,50 @@ _emotion_analyzer_instance = None
 class EmotionClassifier:
     """情绪分类器，基于EfficientFace"""
     
-    def __init__(self, model_path, device='cpu'):
+    def __init__(self, model_path, device='cpu', backend=BACKEND_PYTORCH, export_dir=None, num_threads=0):
         """
         初始化情绪分类器
         
         Args:
             model_path: 模型权重文件路径
             device: 设备，可以是'cpu'或'cuda'
+            backend: 推理后端，'pytorch'、'torchscript'或'onnx'（导出模型不可用时退回pytorch）
+            export_dir: TorchScript/ONNX模型导出目录（scripts/export_emotion_model.py）
+            num_threads: TorchScript/ONNX推理的算子内线程数，0表示自动
         """
         self.device = device
+        self.backend = backend
         self.class_names = list(EMOTION_INDEX_TO_LABEL.values())
-        self.model = self.load_model(model_path)
+        self.model = None
+        
+        if backend != BACKEND_PYTORCH:
+            try:
+                self.model = load_emotion_runtime(backend, export_dir, num_threads)
+                # 导出的运行时只在CPU上推理
+                self.device = 'cpu'
+                print(f"已加载{backend}情绪模型: {self.model.model_path}（量化: {self.model.quantization}，"
+                      f"线程数: {self.model.num_threads}）")
+            except Exception as e:
+                print(f"加载{backend}情绪模型失败，退回PyTorch后端: {e}")
+                self.backend = BACKEND_PYTORCH
+        if self.model is None:
+            self.model = self.load_model(model_path)
         self.transform = transforms.Compose([
-            transforms.Resize((224, 224)),
+            transforms.Resize((EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE)),
             transforms.ToTensor(),
-            transforms.Normalize(mean=[0.57535914, 0.44928582, 0.40079932],
-                                 std=[0.20735591, 0.18981615, 0.18132027])
+            transforms.Normalize(mean=list(EMOTION_MEAN), std=list(EMOTION_STD))
         ])
+        
+        # OpenCV预处理：(x / 255 - mean) / std 合并为 x * scale - offset，通道按BGR顺序排列，与输入帧一致
+        mean_bgr = np.array(EMOTION_MEAN[::-1], dtype=np.float32)
+        std_bgr = np.array(EMOTION_STD[::-1], dtype=np.float32)
+        self._scale = (1.0 / (255.0 * std_bgr)).reshape(1, 1, 3)
+        self._offset = (mean_bgr / std_bgr).reshape(1, 1, 3)
+        # 复用的缓冲区：缩放结果、归一化结果和批次输入（多线程共用分类器时由锁保护）
+        self._resize_buffer = np.empty((EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE, 3), dtype=np.uint8)
+        self._float_buffer = np.empty((EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE, 3), dtype=np.float32)
+        self._batch_buffer = np.empty((EMOTION_BATCH_SIZE, 3, EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE), dtype=np.float32)
+        self._buffer_lock = threading.Lock()
 
     def load_model(self, model_path):
         """
@@ -121,22 +157,84 @@ class EmotionClassifier:
             image: PIL Image对象
             
         Returns:
-            tuple: (预测的情绪类别, 置信度)
+            tuple: (预测的情绪类别, 置信度, 各情绪的概率)
         """
-        image = self.transform(image).unsqueeze(0).to(self.device)
-        with torch.no_grad():
-            outputs = self.model(image)
-            # 获取所有类别的概率
-            probs = F.softmax(outputs, dim=1)[0]
-            _, predicted = torch.max(outputs, 1)
+        return self.predict_batch([image])[0]
+
+    def predict_batch(self, images, batch_size=EMOTION_BATCH_SIZE):
+        """
+        批量预测多张图像的情绪：图像堆叠为一个批次只做一次前向计算，softmax/argmax按批次向量化
+        
+        Args:
+            images: PIL Image对象列表（如同一帧中的所有人脸）
+            batch_size: 单次前向计算的最大图像数
             
-        predicted_class = self.class_names[predicted.item()]
-        confidence = probs[predicted.item()].item()
+        Returns:
+            list: 与images顺序一致的 (预测的情绪类别, 置信度, 各情绪的概率) 列表
+        """
+        results = []
+        for start in range(0, len(images), batch_size):
+            batch = torch.stack([self.transform(image) for image in images[start:start + batch_size]])
+            results.extend(self._predict_tensor(batch))
+        return results
+
+    def preprocess_faces(self, faces):
+        """
+        OpenCV/NumPy预处理（不经过PIL）：缩放到预分配的缓冲区，按通道归一化后写入批次缓冲区
+        
+        缩小时使用INTER_AREA（接近torchvision对PIL图像的抗锯齿缩放），放大时使用INTER_LINEAR；
+        BGR→RGB在写入批次缓冲区时按通道倒序完成，不额外复制整幅图像。调用方需持有self._buffer_lock
         
-        # 获取所有情绪的概率分布
-        emotion_scores = {emotion: probs[i].item() for i, emotion in enumerate(self.class_names)}
+        Args:
+            faces: BGR格式的人脸区域（numpy数组）列表，数量不超过批次缓冲区大小
+            
+        Returns:
+            np.ndarray: 批次缓冲区的视图，形状为 (N, 3, 224, 224) 的连续float32数组
+        """
+        if len(faces) > len(self._batch_buffer):
+            self._batch_buffer = np.empty((len(faces),) + self._batch_buffer.shape[1:], dtype=np.float32)
+        size = (EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE)
+        for i, face in enumerate(faces):
+            h, w = face.shape[:2]
+            interpolation = cv2.INTER_AREA if h > EMOTION_INPUT_SIZE or w > EMOTION_INPUT_SIZE else cv2.INTER_LINEAR
+            cv2.resize(face, size, dst=self._resize_buffer, interpolation=interpolation)
+            # x * scale - offset，在float缓冲区中原地计算
+            np.multiply(self._resize_buffer, self._scale, out=self._float_buffer)
+            np.subtract(self._float_buffer, self._offset, out=self._float_buffer)
+            # HWC(BGR) → CHW(RGB)
+            self._batch_buffer[i] = self._float_buffer[:, :, ::-1].transpose(2, 0, 1)
+        return self._batch_buffer[:len(faces)]
+
+    def predict_faces(self, faces, batch_size=EMOTION_BATCH_SIZE):
+        """
+        批量预测OpenCV人脸区域的情绪（预处理不经过PIL，见preprocess_faces）
         
-        return predicted_class, confidence, emotion_scores
+        Args:
+            faces: BGR格式的人脸区域（numpy数组）列表
+            batch_size: 单次前向计算的最大人脸数
+            
+        Returns:
+            list: 与faces顺序一致的 (预测的情绪类别, 置信度, 各情绪的概率) 列表
+        """
+        results = []
+        for start in range(0, len(faces), batch_size):
+            with self._buffer_lock:
+                batch = torch.from_numpy(self.preprocess_faces(faces[start:start + batch_size]))
+                results.extend(self._predict_tensor(batch))
+        return results
+
+    def _predict_tensor(self, batch):
+        """对预处理后的批次做一次前向计算，返回每张图像的 (类别, 置信度, 各情绪的概率)"""
+        with torch.no_grad():
+            outputs = self.model(batch.to(self.device))
+            probs = F.softmax(outputs, dim=1)
+            confidences, predicted = torch.max(probs, dim=1)
+        
+        # 一次性转换为Python数值，避免逐个元素调用item()
+        results = []
+        for index, confidence, scores in zip(predicted.tolist(), confidences.tolist(), probs.tolist()):
+            results.append((self.class_names[index], confidence, dict(zip(self.class_names, scores))))
+        return results
 
 
 class EmotionAnalyzer:
@@ -144,7 +242,8 @@ class EmotionAnalyzer:
     情感分析器类，用于处理图像和检测情绪
     """
     
-    def __init__(self, model_path=None, device='cpu', scale_factor=0.5, debug_mode=False):
+    def __init__(self, model_path=None, device='cpu', scale_factor=0.5, debug_mode=False,
+                 backend=BACKEND_PYTORCH, export_dir=None, num_threads=0):
         """
         初始化情感分析器
         
@@ -153,6 +252,9 @@ class EmotionAnalyzer:
             device: 设备，可以是'cpu'或'cuda'
             scale_factor: 图像缩放因子，用于加速处理
             debug_mode: 是否开启调试模式
+            backend: 推理后端，'pytorch'、'torchscript'或'onnx'
+            export_dir: TorchScript/ONNX模型导出目录，如果为None则使用默认路径
+            num_threads: TorchScript/ONNX推理的算子内线程数，0表示自动
         """
         if model_path is None:
             # 使用默认模型路径
@@ -170,7 +272,11 @@ class EmotionAnalyzer:
         if debug_mode:
             print(f"使用模型路径: {model_path}")
             
-        self.classifier = EmotionClassifier(model_path, device)
+        if export_dir is None:
+            export_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'weights', 'emotion_export')
+            
+        self.classifier = EmotionClassifier(model_path, device, backend=backend, export_dir=export_dir,
+                                            num_threads=num_threads)
         self.scale_factor = scale_factor
         self.debug_mode = debug_mode
         
@@ -206,13 +312,14 @@ class EmotionAnalyzer:
         if self.debug_mode:
             print(f"情感分析器初始化完成，使用模型: {model_path}")
     
-    def process_frame(self, frame, visualization_mode='basic'):
+    def process_frame(self, frame, visualization_mode='basic', tracker=None):
         """
         处理单个图像帧，检测人脸并分析情绪
         
         Args:
             frame: OpenCV格式的图像帧
             visualization_mode: 已废弃参数，保留仅用于兼容，始终使用基本可视化
+            tracker: 会话的人脸跟踪器（utils.face_tracker.FaceTracker），为None时每帧完整检测和推理
             
         Returns:
             tuple: (处理后的图像, 结果字典)
@@ -231,74 +338,39 @@ class EmotionAnalyzer:
         if self.scale_factor != 1.0:
             small_frame = cv2.resize(frame, (0, 0), fx=self.scale_factor, fy=self.scale_factor)
         else:
-            small_frame = frame.copy()
+            small_frame = frame
             
         # 转换为灰度图进行人脸检测
         gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
         
-        # 检测人脸
-        faces = self.face_cascade.detectMultiScale(
-            gray, 
-            scaleFactor=1.1, 
-            minNeighbors=5, 
-            minSize=(30, 30),
-            flags=cv2.CASCADE_SCALE_IMAGE
-        )
-        
-        # 更新人脸数量
-        results["face_count"] = len(faces)
-        
-        # 处理检测到的人脸
-        for face_idx, (x, y, w, h) in enumerate(faces):
-            # 调整回原始比例
-            if self.scale_factor != 1.0:
-                x = int(x / self.scale_factor)
-                y = int(y / self.scale_factor)
-                w = int(w / self.scale_factor)
-                h = int(h / self.scale_factor)
+        if tracker is not None:
+            with tracker.lock:
+                self._process_tracked(frame, gray, tracker, processed_frame, results)
+        else:
+            # 检测人脸
+            faces = self._detect_faces(gray)
             
-            # 在原始帧上提取人脸区域
-            face_roi = frame[y:y+h, x:x+w]
+            # 更新人脸数量
+            results["face_count"] = len(faces)
             
-            # 转换为PIL图像进行情感分析
-            pil_img = Image.fromarray(cv2.cvtColor(face_roi, cv2.COLOR_BGR2RGB))
+            # 裁剪所有人脸（调整回原始比例）
+            boxes = []
+            face_rois = []
+            for box in faces:
+                x, y, w, h = self._to_frame_box(box)
+                
+                # 在原始帧上提取人脸区域（视图，不复制），直接交给OpenCV预处理
+                face_roi = frame[y:y+h, x:x+w]
+                if face_roi.size == 0:
+                    continue
+                boxes.append((x, y, w, h))
+                face_rois.append(face_roi)
             
-            try:
-                # 预测情感
-                emotion, confidence, emotion_scores = self.classifier.predict_image(pil_img)
+            # 所有人脸一次批量推理
+            for face_idx, (box, (emotion, confidence, emotion_scores)) in enumerate(zip(boxes, self._predict(face_rois))):
                 self.processed_frames += 1
                 self.emotion_stats[emotion] += 1
-                
-                # 更新当前表情状态（只处理第一个检测到的人脸）
-                if face_idx == 0:
-                    # 更新当前表情
-                    self.current_emotion = {
-                        'main_emotion': emotion,
-                        'cn_emotion': EMOTION_LABELS_CN.get(emotion, emotion),
-                        'confidence': confidence,
-                        'timestamp': time.time(),
-                        'detailed_emotions': emotion_scores
-                    }
-                
-                # 将结果添加到列表
-                results["expressions"].append({
-                    "face_id": face_idx,
-                    "expression": EMOTION_LABELS_CN.get(emotion, emotion),
-                    "confidence": confidence,
-                    "details": {
-                        "en_emotion": emotion,
-                        "scores": {EMOTION_LABELS_CN.get(e, e): float(emotion_scores[e]) for e in self.classifier.class_names}
-                    }
-                })
-                
-                # 在帧上标记人脸和情感（始终显示）
-                color = self.emotion_colors.get(emotion, (255, 255, 255))
-                cv2.rectangle(processed_frame, (x, y), (x+w, y+h), color, 2)
-                label = f"{EMOTION_LABELS_CN.get(emotion, emotion)}: {confidence:.2f}"
-                cv2.putText(processed_frame, label, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
-            except Exception as e:
-                if self.debug_mode:
-                    print(f"处理人脸时出错: {e}")
+                self._add_expression(results, processed_frame, face_idx, box, emotion, confidence, emotion_scores)
                 
         # 更新FPS计数
         self.total_frames += 1
@@ -312,6 +384,103 @@ class EmotionAnalyzer:
         
         return processed_frame, results
     
+    def _process_tracked(self, frame, gray, tracker, processed_frame, results):
+        """
+        跟踪模式：只在检测间隔到达或跟踪丢失时检测人脸，只对变化超过阈值的人脸重新推理，输出平滑后的情绪
+        """
+        detected = tracker.update(gray, self._detect_faces)
+        
+        # 找出需要重新推理的人脸
+        pending = []
+        for track in tracker.tracks:
+            thumbnail = tracker.thumbnail(gray, track)
+            if tracker.needs_inference(track, thumbnail):
+                x, y, w, h = self._to_frame_box(track.int_box())
+                face_roi = frame[y:y+h, x:x+w]
+                if face_roi.size:
+                    pending.append((track, thumbnail, face_roi))
+        
+        predictions = self._predict([face_roi for _, _, face_roi in pending])
+        for (track, thumbnail, _), (emotion, _, emotion_scores) in zip(pending, predictions):
+            tracker.apply_scores(track, emotion_scores, thumbnail)
+            self.processed_frames += 1
+            self.emotion_stats[emotion] += 1
+        
+        results["face_count"] = len(tracker.tracks)
+        for face_idx, track in enumerate(track for track in tracker.tracks if track.scores is not None):
+            emotion = max(track.scores, key=track.scores.get)
+            self._add_expression(results, processed_frame, face_idx, self._to_frame_box(track.int_box()),
+                                 emotion, track.scores[emotion], track.scores)
+            results["expressions"][-1]["track_id"] = track.track_id
+        results["tracking"] = {
+            "frame_index": tracker.frame_index,
+            "detected": detected,
+            "inferred_faces": len(predictions),
+            "smoothed": True
+        }
+    
+    def _detect_faces(self, gray):
+        """Haar级联人脸检测，返回检测图像坐标的 (x, y, w, h) 列表"""
+        return self.face_cascade.detectMultiScale(
+            gray, 
+            scaleFactor=1.1, 
+            minNeighbors=5, 
+            minSize=(30, 30),
+            flags=cv2.CASCADE_SCALE_IMAGE
+        )
+    
+    def _to_frame_box(self, box):
+        """检测图像坐标调整回原始帧坐标"""
+        x, y, w, h = box
+        if self.scale_factor != 1.0:
+            x = int(x / self.scale_factor)
+            y = int(y / self.scale_factor)
+            w = int(w / self.scale_factor)
+            h = int(h / self.scale_factor)
+        return x, y, w, h
+    
+    def _predict(self, face_rois):
+        """批量推理人脸区域，失败时返回空列表"""
+        if not face_rois:
+            return []
+        try:
+            return self.classifier.predict_faces(face_rois)
+        except Exception as e:
+            if self.debug_mode:
+                print(f"处理人脸时出错: {e}")
+            return []
+    
+    def _add_expression(self, results, processed_frame, face_idx, box, emotion, confidence, emotion_scores):
+        """记录一个人脸的情绪结果，更新当前表情并在帧上标记"""
+        # 更新当前表情状态（只处理第一个检测到的人脸）
+        if face_idx == 0:
+            # 更新当前表情
+            self.current_emotion = {
+                'main_emotion': emotion,
+                'cn_emotion': EMOTION_LABELS_CN.get(emotion, emotion),
+                'confidence': confidence,
+                'timestamp': time.time(),
+                'detailed_emotions': emotion_scores
+            }
+        
+        # 将结果添加到列表
+        results["expressions"].append({
+            "face_id": face_idx,
+            "expression": EMOTION_LABELS_CN.get(emotion, emotion),
+            "confidence": confidence,
+            "details": {
+                "en_emotion": emotion,
+                "scores": {EMOTION_LABELS_CN.get(e, e): float(emotion_scores[e]) for e in self.classifier.class_names}
+            }
+        })
+        
+        # 在帧上标记人脸和情感（始终显示）
+        x, y, w, h = box
+        color = self.emotion_colors.get(emotion, (255, 255, 255))
+        cv2.rectangle(processed_frame, (x, y), (x+w, y+h), color, 2)
+        label = f"{EMOTION_LABELS_CN.get(emotion, emotion)}: {confidence:.2f}"
+        cv2.putText(processed_frame, label, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
+    
     def get_emotion_distribution(self):
         """
         获取情绪分布统计
@@ -373,10 +542,16 @@ def get_emotion_analyzer(debug_mode=False):
     
     if _emotion_analyzer_instance is None:
         try:
-            # 获取模型路径
+            # 获取模型路径和推理后端
             model_path = None
+            backend_options = {}
             if current_app:
                 model_path = current_app.config.get('EMOTION_MODEL_PATH')
+                backend_options = {
+                    'backend': current_app.config.get('EMOTION_BACKEND', BACKEND_PYTORCH),
+                    'export_dir': current_app.config.get('EMOTION_EXPORT_PATH'),
+                    'num_threads': current_app.config.get('EMOTION_NUM_THREADS', 0)
+                }
                 
             # 检查是否支持CUDA
             device = 'cuda' if torch.cuda.is_available() else 'cpu'
@@ -385,11 +560,13 @@ def get_emotion_analyzer(debug_mode=False):
             _emotion_analyzer_instance = EmotionAnalyzer(
                 model_path=model_path,
                 device=device,
-                debug_mode=debug_mode
+                debug_mode=debug_mode,
+                **backend_options
             )
             
             if debug_mode:
-                print(f"情感分析器初始化成功，使用设备: {device}")
+                print(f"情感分析器初始化成功，使用设备: {_emotion_analyzer_instance.classifier.device}，"
+                      f"后端: {_emotion_analyzer_instance.classifier.backend}")
         except Exception as e:
             print(f"情感分析器初始化失败: {str(e)}")
             raise
@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EfficientFace情绪模型的优化推理后端
+将模型（含RAF-DB 7类分类头）导出为TorchScript和ONNX，用校准集做int8静态量化
+（TorchScript使用FX图模式量化，ONNX使用ONNX Runtime的QDQ静态量化，没有校准集时退回动态量化），
+推理时固定算子内线程数。两种运行时都可以直接替换EmotionClassifier.model：输入预处理后的批次张量，输出logits
+"""
+
+import os
+import copy
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 推理后端
+BACKEND_PYTORCH = 'pytorch'  # 即时模式PyTorch（fp32）
+BACKEND_TORCHSCRIPT = 'torchscript'  # TorchScript（可为int8量化模型）
+BACKEND_ONNX = 'onnx'  # ONNX Runtime（可为int8量化模型）
+BACKENDS = (BACKEND_PYTORCH, BACKEND_TORCHSCRIPT, BACKEND_ONNX)
+
+# 导出文件名
+TORCHSCRIPT_FP32_FILENAME = 'emotion.ts'
+TORCHSCRIPT_INT8_FILENAME = 'emotion.int8.ts'
+ONNX_FP32_FILENAME = 'emotion.onnx'
+ONNX_INT8_FILENAME = 'emotion.int8.onnx'
+META_FILENAME = 'emotion_export_meta.json'
+
+# ONNX算子集版本
+ONNX_OPSET = 17
+# 校准时每个批次的人脸数
+CALIBRATION_BATCH_SIZE = 16
+# 支持的校准图像格式
+CALIBRATION_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def load_calibration_faces(calibration_dir: str, limit: int = 256) -> List[np.ndarray]:
+    """
+    读取校准用的人脸图像（BGR，建议使用与线上分布一致的人脸裁剪图）
+
+    Args:
+        calibration_dir: 图像目录（递归查找）
+        limit: 最多读取的图像数
+
+    Returns:
+        BGR图像列表
+    """
+    import cv2
+
+    faces = []
+    for root, _, files in os.walk(calibration_dir):
+        for filename in sorted(files):
+            if not filename.lower().endswith(CALIBRATION_EXTENSIONS):
+                continue
+            image = cv2.imread(os.path.join(root, filename), cv2.IMREAD_COLOR)
+            if image is not None:
+                faces.append(image)
+            if len(faces) >= limit:
+                return faces
+    return faces
+
+
+def _calibration_batches(classifier, faces: Sequence[np.ndarray]) -> List[Any]:
+    """按推理时的预处理把校准人脸转为批次张量（复制出缓冲区，避免被后续批次覆盖）"""
+    import torch
+
+    batches = []
+    for start in range(0, len(faces), CALIBRATION_BATCH_SIZE):
+        with classifier._buffer_lock:
+            batch = classifier.preprocess_faces(faces[start:start + CALIBRATION_BATCH_SIZE]).copy()
+        batches.append(torch.from_numpy(batch))
+    return batches
+
+
+def _example_input(batches: List[Any], input_size: int):
+    import torch
+
+    return batches[0][:1] if batches else torch.zeros(1, 3, input_size, input_size)
+
+
+def export_torchscript(model, output_dir: str, batches: List[Any], quantize: bool = True,
+                       input_size: int = 224) -> Dict[str, Any]:
+    """
+    导出TorchScript模型（可选int8量化）
+
+    有校准数据时使用FX图模式静态量化（卷积和全连接层都量化），否则只对全连接层做动态量化
+
+    Returns:
+        {'file', 'quantization'}
+    """
+    import torch
+
+    example = _example_input(batches, input_size)
+    model = copy.deepcopy(model).cpu().eval()
+    quantization = None
+    if quantize and batches:
+        try:
+            from torch.ao.quantization import get_default_qconfig_mapping
+            from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+            prepared = prepare_fx(model, get_default_qconfig_mapping('x86'), example_inputs=(example,))
+            with torch.no_grad():
+                for batch in batches:
+                    prepared(batch)
+            model = convert_fx(prepared)
+            quantization = 'static'
+        except Exception as e:
+            logger.warning(f"FX静态量化失败，改用动态量化: {str(e)}")
+            model = copy.deepcopy(model).cpu().eval()
+    if quantize and quantization is None:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        quantization = 'dynamic'
+
+    with torch.no_grad():
+        traced = torch.jit.freeze(torch.jit.trace(model, example).eval())
+    filename = TORCHSCRIPT_INT8_FILENAME if quantization else TORCHSCRIPT_FP32_FILENAME
+    traced.save(os.path.join(output_dir, filename))
+    logger.info(f"TorchScript模型导出完成: {filename}（量化: {quantization}）")
+    return {'file': filename, 'quantization': quantization}
+
+
+class _CalibrationReader:
+    """ONNX Runtime静态量化的校准数据（onnxruntime.quantization.CalibrationDataReader接口）"""
+
+    def __init__(self, batches: List[Any]):
+        self._batches = iter([{'input': batch.numpy()} for batch in batches])
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        return next(self._batches, None)
+
+
+def export_onnx(model, output_dir: str, batches: List[Any], quantize: bool = True, opset: int = ONNX_OPSET,
+                input_size: int = 224) -> Dict[str, Any]:
+    """
+    导出ONNX模型（批次维度动态，可选int8量化）
+
+    有校准数据时使用QDQ格式的逐通道静态量化，否则做动态量化
+
+    Returns:
+        {'file', 'quantization'}
+    """
+    import torch
+
+    example = _example_input(batches, input_size)
+    fp32_path = os.path.join(output_dir, ONNX_FP32_FILENAME)
+    with torch.no_grad():
+        torch.onnx.export(
+            copy.deepcopy(model).cpu().eval(),
+            (example,),
+            fp32_path,
+            input_names=['input'],
+            output_names=['logits'],
+            dynamic_axes={'input': {0: 'batch'}, 'logits': {0: 'batch'}},
+            opset_version=opset
+        )
+    logger.info(f"ONNX模型导出完成: {fp32_path}")
+    if not quantize:
+        return {'file': ONNX_FP32_FILENAME, 'quantization': None}
+
+    from onnxruntime.quantization import quantize_dynamic, quantize_static, QuantFormat, QuantType
+
+    int8_path = os.path.join(output_dir, ONNX_INT8_FILENAME)
+    if batches:
+        try:
+            quantize_static(fp32_path, int8_path, _CalibrationReader(batches), quant_format=QuantFormat.QDQ,
+                            per_channel=True, weight_type=QuantType.QInt8, activation_type=QuantType.QUInt8)
+            logger.info(f"ONNX静态int8量化完成: {int8_path}")
+            return {'file': ONNX_INT8_FILENAME, 'quantization': 'static'}
+        except Exception as e:
+            logger.warning(f"ONNX静态量化失败，改用动态量化: {str(e)}")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    logger.info(f"ONNX动态int8量化完成: {int8_path}")
+    return {'file': ONNX_INT8_FILENAME, 'quantization': 'dynamic'}
+
+
+def export_emotion_model(classifier, output_dir: str, calibration_faces: Sequence[np.ndarray] = (),
+                         backends: Iterable[str] = (BACKEND_TORCHSCRIPT, BACKEND_ONNX), quantize: bool = True,
+                         opset: int = ONNX_OPSET) -> Dict[str, Any]:
+    """
+    导出情绪模型为TorchScript和/或ONNX
+
+    Args:
+        classifier: 已加载PyTorch模型的EmotionClassifier
+        output_dir: 导出目录
+        calibration_faces: 校准用的BGR人脸图像（为空时只能做动态量化）
+        backends: 要导出的后端
+        quantize: 是否做int8量化
+        opset: ONNX算子集版本
+
+    Returns:
+        导出元数据（同时写入META_FILENAME）
+    """
+    from utils.emotion_analyzer import EMOTION_INPUT_SIZE, EMOTION_MEAN, EMOTION_STD
+
+    os.makedirs(output_dir, exist_ok=True)
+    batches = _calibration_batches(classifier, calibration_faces) if quantize else []
+
+    meta_path = os.path.join(output_dir, META_FILENAME)
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    meta.update({
+        'class_names': classifier.class_names,
+        'input_size': EMOTION_INPUT_SIZE,
+        'mean': list(EMOTION_MEAN),
+        'std': list(EMOTION_STD),
+        'calibration_faces': len(calibration_faces) if quantize else 0
+    })
+    for backend in backends:
+        if backend == BACKEND_TORCHSCRIPT:
+            meta[backend] = export_torchscript(classifier.model, output_dir, batches, quantize, EMOTION_INPUT_SIZE)
+        elif backend == BACKEND_ONNX:
+            meta[backend] = export_onnx(classifier.model, output_dir, batches, quantize, opset, EMOTION_INPUT_SIZE)
+        else:
+            raise ValueError(f"不支持导出的后端: {backend}")
+
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
+
+
+def _load_meta(export_dir: str, backend: str) -> Dict[str, Any]:
+    with open(os.path.join(export_dir, META_FILENAME), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if backend not in meta:
+        raise FileNotFoundError(f"{export_dir}中没有{backend}模型，请先运行 scripts/export_emotion_model.py")
+    return meta
+
+
+class TorchScriptEmotionModel:
+    """TorchScript运行时（CPU），调用方式与PyTorch模型一致"""
+
+    def __init__(self, export_dir: str, num_threads: int = 0):
+        """
+        Args:
+            export_dir: export_emotion_model的导出目录
+            num_threads: 算子内线程数，0表示使用PyTorch默认值（注意torch.set_num_threads对整个进程生效）
+        """
+        import torch
+
+        meta = _load_meta(export_dir, BACKEND_TORCHSCRIPT)
+        self.model_path = os.path.join(export_dir, meta[BACKEND_TORCHSCRIPT]['file'])
+        self.quantization = meta[BACKEND_TORCHSCRIPT]['quantization']
+        self.class_names = meta['class_names']
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+        self.num_threads = torch.get_num_threads()
+        self.model = torch.jit.load(self.model_path, map_location='cpu').eval()
+
+    def __call__(self, batch):
+        return self.model(batch.cpu())
+
+
+class OnnxEmotionModel:
+    """ONNX Runtime运行时（CPU），输入输出为torch张量，调用方式与PyTorch模型一致"""
+
+    def __init__(self, export_dir: str, num_threads: int = 0):
+        """
+        Args:
+            export_dir: export_emotion_model的导出目录
+            num_threads: ONNX Runtime算子内线程数，0表示由ONNX Runtime自行决定
+        """
+        import onnxruntime as ort
+
+        meta = _load_meta(export_dir, BACKEND_ONNX)
+        self.model_path = os.path.join(export_dir, meta[BACKEND_ONNX]['file'])
+        self.quantization = meta[BACKEND_ONNX]['quantization']
+        self.class_names = meta['class_names']
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+        self.num_threads = num_threads
+        self.session = ort.InferenceSession(self.model_path, options, providers=['CPUExecutionProvider'])
+
+    def __call__(self, batch):
+        import torch
+
+        logits = self.session.run(['logits'], {'input': np.ascontiguousarray(batch.cpu().numpy())})[0]
+        return torch.from_numpy(logits)
+
+
+def load_emotion_runtime(backend: str, export_dir: str, num_threads: int = 0):
+    """
+    加载导出的情绪模型运行时
+
+    Args:
+        backend: 'torchscript'或'onnx'
+        export_dir: 导出目录
+        num_threads: 算子内线程数，0表示自动
+
+    Returns:
+        TorchScriptEmotionModel或OnnxEmotionModel
+    """
+    if backend == BACKEND_TORCHSCRIPT:
+        return TorchScriptEmotionModel(export_dir, num_threads)
+    if backend == BACKEND_ONNX:
+        return OnnxEmotionModel(export_dir, num_threads)
+    raise ValueError(f"不支持的情绪模型后端: {backend}")
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+实时人脸跟踪
+同一会话的连续视频帧中人脸位置变化很小：每隔N帧（或跟踪丢失时）才做一次人脸检测，
+其余帧用金字塔LK光流跟踪人脸框；人脸区域的缩略图与上次推理时相比变化超过阈值才重新识别情绪，
+情绪分数做指数滑动平均，输出平滑后的结果
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 默认每隔多少帧做一次完整的人脸检测
+DEFAULT_DETECT_INTERVAL = 10
+# 默认的人脸变化阈值：缩略图平均灰度差（0~1）超过该值才重新推理
+DEFAULT_CHANGE_THRESHOLD = 0.06
+# 默认的情绪分数平滑系数（新结果的权重，1表示不平滑）
+DEFAULT_SMOOTHING = 0.4
+
+# 比较人脸变化时使用的缩略图边长
+THUMBNAIL_SIZE = 32
+# 每个人脸框内的光流特征点数量上限与跟踪所需的最少点数
+MAX_TRACK_POINTS = 40
+MIN_TRACK_POINTS = 6
+# 前后向光流误差上限（像素），超过的点视为跟踪失败
+MAX_FORWARD_BACKWARD_ERROR = 1.0
+# 检测结果与已有跟踪框的最小IoU（达到时沿用原跟踪的编号和平滑状态）
+MATCH_IOU = 0.3
+# 人脸框的最小边长（像素），小于该值视为跟踪丢失
+MIN_BOX_SIZE = 12
+# 光流参数
+LK_PARAMS = dict(winSize=(21, 21), maxLevel=2,
+                 criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+
+# 会话跟踪器的空闲过期时间（秒）和数量上限
+TRACKER_IDLE_TTL = 300
+MAX_TRACKERS = 256
+
+
+def box_iou(a: Sequence[float], b: Sequence[float]) -> float:
+    """两个 (x, y, w, h) 框的IoU"""
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+class FaceTrack:
+    """一个被跟踪的人脸"""
+
+    def __init__(self, track_id: int, box: Sequence[float]):
+        self.track_id = track_id
+        # 人脸框 (x, y, w, h)，检测图像（缩放后的灰度帧）坐标
+        self.box = np.asarray(box, dtype=np.float32)
+        # 光流特征点 (N, 1, 2)
+        self.points = None
+        # 上次推理时的人脸缩略图
+        self.thumbnail = None
+        # 平滑后的情绪分数
+        self.scores = None
+        # 推理次数
+        self.inferences = 0
+
+    def int_box(self):
+        """取整后的人脸框"""
+        x, y, w, h = self.box
+        return int(round(x)), int(round(y)), int(round(w)), int(round(h))
+
+
+class FaceTracker:
+    """单个会话的人脸跟踪器（同一会话的帧需串行处理，调用方持有lock）"""
+
+    def __init__(self, detect_interval: int = DEFAULT_DETECT_INTERVAL,
+                 change_threshold: float = DEFAULT_CHANGE_THRESHOLD, smoothing: float = DEFAULT_SMOOTHING):
+        """
+        Args:
+            detect_interval: 每隔多少帧做一次完整的人脸检测，1表示每帧检测（只保留推理跳过和平滑）
+            change_threshold: 人脸缩略图平均灰度差（0~1）超过该值才重新推理，0表示每帧推理
+            smoothing: 情绪分数的平滑系数（新结果的权重）
+        """
+        self.detect_interval = max(1, detect_interval)
+        self.change_threshold = change_threshold
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self.tracks: List[FaceTrack] = []
+        self.frame_index = 0
+        self.last_used = time.time()
+        self._last_detection = 0
+        self._prev_gray = None
+        self._next_id = 0
+
+    def update(self, gray: np.ndarray, detect: Callable[[np.ndarray], Sequence[Sequence[float]]]) -> bool:
+        """
+        处理一帧：到检测间隔或跟踪丢失时重新检测，否则用光流移动已有的人脸框
+
+        Args:
+            gray: 灰度帧（检测图像）
+            detect: 人脸检测函数，返回 (x, y, w, h) 列表
+
+        Returns:
+            本帧是否做了人脸检测
+        """
+        self.frame_index += 1
+        self.last_used = time.time()
+        tracked = (
+            bool(self.tracks)
+            and self._prev_gray is not None
+            and self._prev_gray.shape == gray.shape
+            and self.frame_index - self._last_detection < self.detect_interval
+            and self._track(gray)
+        )
+        if not tracked:
+            self._assign(detect(gray), gray)
+            self._last_detection = self.frame_index
+        self._prev_gray = gray
+        return not tracked
+
+    def _track(self, gray: np.ndarray) -> bool:
+        """用前后向LK光流移动所有人脸框（平移 + 缩放），任一人脸丢失时返回False"""
+        height, width = gray.shape[:2]
+        updates = []
+        for track in self.tracks:
+            if track.points is None or len(track.points) < MIN_TRACK_POINTS:
+                return False
+            points, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, track.points, None, **LK_PARAMS)
+            back, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, points, None, **LK_PARAMS)
+            error = np.linalg.norm((back - track.points).reshape(-1, 2), axis=1)
+            good = (status.ravel() == 1) & (back_status.ravel() == 1) & (error < MAX_FORWARD_BACKWARD_ERROR)
+            if good.sum() < MIN_TRACK_POINTS:
+                return False
+
+            old, new = track.points[good].reshape(-1, 2), points[good].reshape(-1, 2)
+            shift = np.median(new - old, axis=0)
+            old_spread = np.linalg.norm(old - old.mean(axis=0), axis=1)
+            new_spread = np.linalg.norm(new - new.mean(axis=0), axis=1)
+            valid = old_spread > 1e-3
+            scale = float(np.clip(np.median(new_spread[valid] / old_spread[valid]), 0.8, 1.25)) if valid.any() else 1.0
+
+            x, y, w, h = track.box
+            cx, cy = x + w / 2 + shift[0], y + h / 2 + shift[1]
+            w, h = w * scale, h * scale
+            x0, y0 = max(0.0, cx - w / 2), max(0.0, cy - h / 2)
+            x1, y1 = min(float(width), cx + w / 2), min(float(height), cy + h / 2)
+            if x1 - x0 < MIN_BOX_SIZE or y1 - y0 < MIN_BOX_SIZE:
+                return False
+            updates.append((np.array([x0, y0, x1 - x0, y1 - y0], dtype=np.float32), points[good]))
+
+        for track, (box, points) in zip(self.tracks, updates):
+            track.box = box
+            track.points = points
+        return True
+
+    def _assign(self, boxes: Sequence[Sequence[float]], gray: np.ndarray) -> None:
+        """用检测结果替换跟踪框：与已有跟踪重叠的沿用其编号和平滑状态，并重新选取特征点"""
+        previous = list(self.tracks)
+        tracks = []
+        for box in boxes:
+            box = [float(v) for v in box]
+            match = max(previous, key=lambda track: box_iou(track.box, box), default=None)
+            if match is not None and box_iou(match.box, box) >= MATCH_IOU:
+                previous.remove(match)
+                match.box = np.asarray(box, dtype=np.float32)
+                track = match
+            else:
+                track = FaceTrack(self._next_id, box)
+                self._next_id += 1
+            track.points = self._select_points(gray, track)
+            tracks.append(track)
+        self.tracks = tracks
+
+    @staticmethod
+    def _select_points(gray: np.ndarray, track: FaceTrack) -> Optional[np.ndarray]:
+        """在人脸框内选取光流特征点"""
+        x, y, w, h = track.int_box()
+        mask = np.zeros(gray.shape[:2], dtype=np.uint8)
+        mask[y:y + h, x:x + w] = 255
+        return cv2.goodFeaturesToTrack(gray, maxCorners=MAX_TRACK_POINTS, qualityLevel=0.01, minDistance=3,
+                                       mask=mask)
+
+    @staticmethod
+    def thumbnail(gray: np.ndarray, track: FaceTrack) -> Optional[np.ndarray]:
+        """人脸区域的缩略图（用于判断人脸是否变化）"""
+        x, y, w, h = track.int_box()
+        crop = gray[y:y + h, x:x + w]
+        if crop.size == 0:
+            return None
+        return cv2.resize(crop, (THUMBNAIL_SIZE, THUMBNAIL_SIZE), interpolation=cv2.INTER_AREA)
+
+    def needs_inference(self, track: FaceTrack, thumbnail: Optional[np.ndarray]) -> bool:
+        """人脸是否需要重新识别情绪：没有结果，或缩略图与上次推理时相比变化超过阈值"""
+        if track.scores is None or track.thumbnail is None or thumbnail is None:
+            return True
+        change = float(np.mean(cv2.absdiff(thumbnail, track.thumbnail))) / 255.0
+        return change > self.change_threshold
+
+    def apply_scores(self, track: FaceTrack, scores: Dict[str, float], thumbnail: Optional[np.ndarray]) -> None:
+        """记录一次推理结果：情绪分数做指数滑动平均"""
+        track.thumbnail = thumbnail
+        track.inferences += 1
+        if track.scores is None:
+            track.scores = dict(scores)
+        else:
+            alpha = self.smoothing
+            track.scores = {emotion: alpha * score + (1 - alpha) * track.scores.get(emotion, 0.0)
+                            for emotion, score in scores.items()}
+
+
+# 各会话的跟踪器（按最近使用排序）
+_trackers = OrderedDict()
+_trackers_lock = threading.Lock()
+
+
+def get_face_tracker(session_id: str, **options) -> FaceTracker:
+    """
+    获取会话的人脸跟踪器（不存在时创建），同时清理空闲过期的跟踪器
+
+    跟踪器保存在当前进程中：同一会话的帧被分发到其他worker时，该worker会重新检测
+
+    Args:
+        session_id: 会话ID
+        **options: 新建跟踪器时的参数（见FaceTracker）
+
+    Returns:
+        FaceTracker
+    """
+    now = time.time()
+    with _trackers_lock:
+        for key in [key for key, tracker in _trackers.items() if now - tracker.last_used > TRACKER_IDLE_TTL]:
+            del _trackers[key]
+        tracker = _trackers.get(session_id)
+        if tracker is None:
+            tracker = FaceTracker(**options)
+            _trackers[session_id] = tracker
+            while len(_trackers) > MAX_TRACKERS:
+                _trackers.popitem(last=False)
+        _trackers.move_to_end(session_id)
+        tracker.last_used = now
+        return tracker
+
+
+def release_face_tracker(session_id: str) -> bool:
+    """
+    释放会话的人脸跟踪器
+
+    Returns:
+        是否存在该会话的跟踪器
+    """
+    with _trackers_lock:
+        return _trackers.pop(session_id, None) is not None
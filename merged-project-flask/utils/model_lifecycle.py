@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+模型生命周期管理
+延迟加载重量级模型：可在worker启动（fork之后）时于后台线程预加载，
+请求到来时等待同一个Future而不是各自冷启动，并向健康检查接口报告就绪状态
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 模型状态
+STATE_IDLE = 'idle'        # 尚未开始加载
+STATE_LOADING = 'loading'  # 加载中
+STATE_READY = 'ready'      # 已就绪
+STATE_FAILED = 'failed'    # 加载失败
+
+
+class ModelLifecycle:
+    """单个模型的生命周期：同一进程内只加载一次，加载过程在后台线程中进行"""
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        """
+        Args:
+            name: 模型名称（用于日志和健康检查）
+            loader: 加载函数，返回模型实例
+        """
+        self.name = name
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._future: Optional[Future] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = os.getpid()
+        self.started_at = None
+        self.load_time_s = None
+        self.error = None
+
+    def _load(self) -> Any:
+        start = time.time()
+        try:
+            logger.info(f"开始加载模型: {self.name}")
+            model = self.loader()
+            self.load_time_s = time.time() - start
+            logger.info(f"模型加载完成: {self.name}, 耗时 {self.load_time_s:.2f}s")
+            return model
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"模型加载失败: {self.name}, {str(e)}")
+            raise
+
+    def start(self) -> Future:
+        """
+        开始后台加载（已开始时直接返回同一个Future）
+
+        Returns:
+            加载任务的Future
+        """
+        with self._lock:
+            # fork之后父进程的线程不会被继承，需要在子进程中重新加载
+            if self._pid != os.getpid():
+                self._reset()
+            if self._future is None:
+                self.started_at = time.time()
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'load-{self.name}')
+                self._future = self._executor.submit(self._load)
+                self._executor.shutdown(wait=False)
+            return self._future
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        获取模型实例，尚未加载时触发加载并等待
+
+        Args:
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            模型实例（加载失败时抛出加载异常，超时抛出TimeoutError）
+        """
+        return self.start().result(timeout=timeout)
+
+    def retry(self) -> Future:
+        """加载失败后重新加载"""
+        with self._lock:
+            if self._future is not None and self._future.done() and self._future.exception() is not None:
+                self._reset()
+        return self.start()
+
+    @property
+    def state(self) -> str:
+        future = self._future
+        if future is None or self._pid != os.getpid():
+            return STATE_IDLE
+        if not future.done():
+            return STATE_LOADING
+        return STATE_FAILED if future.exception() is not None else STATE_READY
+
+    @property
+    def ready(self) -> bool:
+        return self.state == STATE_READY
+
+    def status(self) -> Dict[str, Any]:
+        """生命周期状态（供健康检查使用）"""
+        state = self.state
+        return {
+            'name': self.name,
+            'state': state,
+            'ready': state == STATE_READY,
+            'pid': os.getpid(),
+            'loading_for_s': round(time.time() - self.started_at, 2) if state == STATE_LOADING else None,
+            'load_time_s': round(self.load_time_s, 2) if self.load_time_s is not None else None,
+            'error': self.error if state == STATE_FAILED else None
+        }
+
+
+# 已注册的模型
+_lifecycles: Dict[str, ModelLifecycle] = {}
+_registry_lock = threading.Lock()
+
+
+def register_model(name: str, loader: Callable[[], Any], replace: bool = False) -> ModelLifecycle:
+    """
+    注册模型加载函数
+
+    Args:
+        name: 模型名称
+        loader: 加载函数
+        replace: 已注册时是否替换（如模型路径变化）
+
+    Returns:
+        ModelLifecycle实例
+    """
+    with _registry_lock:
+        lifecycle = _lifecycles.get(name)
+        if lifecycle is None or replace:
+            lifecycle = ModelLifecycle(name, loader)
+            _lifecycles[name] = lifecycle
+        return lifecycle
+
+
+def get_model_lifecycle(name: str) -> Optional[ModelLifecycle]:
+    """获取已注册的模型生命周期，未注册时返回None"""
+    return _lifecycles.get(name)
+
+
+def get_models_status() -> Dict[str, Dict[str, Any]]:
+    """全部已注册模型的状态"""
+    return {name: lifecycle.status() for name, lifecycle in list(_lifecycles.items())}
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+简历实体识别的ONNX Runtime推理后端
+将RANER模型的编码器+发射层导出为ONNX并做动态int8量化，CRF解码和实体切分用NumPy实现，
+调用方式与ModelScope的NER pipeline一致（单条文本返回{'output': 实体列表}，列表输入返回结果列表）
+"""
+
+import os
+import json
+import shutil
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 导出文件名
+ONNX_FP32_FILENAME = 'model.onnx'
+ONNX_INT8_FILENAME = 'model.int8.onnx'
+CRF_PARAMS_FILENAME = 'crf.npz'
+META_FILENAME = 'ner_onnx_meta.json'
+
+# 与pipeline一致的最大序列长度
+SEQUENCE_LENGTH = 512
+# ONNX算子集版本
+ONNX_OPSET = 14
+
+
+def export_onnx(model_path: str, output_dir: str, quantize: bool = True, opset: int = ONNX_OPSET) -> str:
+    """
+    将RANER模型导出为ONNX（可选动态int8量化）
+
+    导出图只包含编码器和发射层（输出每个token的标签分数），CRF参数和标签表单独保存，
+    推理时由NumPy完成与原模型一致的label_mask压缩、维特比解码和实体切分
+
+    Args:
+        model_path: 模型路径，可以是本地路径或ModelScope模型ID
+        output_dir: 导出目录
+        quantize: 是否对权重做动态int8量化
+        opset: ONNX算子集版本
+
+    Returns:
+        推理使用的ONNX模型文件路径
+    """
+    import torch
+    from modelscope.models import Model
+    from modelscope.preprocessors import Preprocessor
+
+    os.makedirs(output_dir, exist_ok=True)
+    model = Model.from_pretrained(model_path)
+    model.eval()
+    preprocessor = Preprocessor.from_pretrained(model_path, sequence_length=SEQUENCE_LENGTH)
+
+    class EmissionModel(torch.nn.Module):
+        """编码器 + 发射层，不做label_mask压缩（由推理端完成）"""
+
+        def __init__(self, encoder, linear):
+            super().__init__()
+            self.encoder = encoder
+            self.linear = linear
+
+        def forward(self, input_ids, attention_mask):
+            outputs = self.encoder(input_ids=input_ids, attention_mask=attention_mask)
+            return self.linear(outputs[0])
+
+    emission_model = EmissionModel(model.encoder, model.head.linear).eval()
+    sample = preprocessor('张三，浙江大学计算机科学专业毕业。')
+    fp32_path = os.path.join(output_dir, ONNX_FP32_FILENAME)
+    with torch.no_grad():
+        torch.onnx.export(
+            emission_model,
+            (sample['input_ids'], sample['attention_mask']),
+            fp32_path,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['emissions'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'emissions': {0: 'batch', 1: 'sequence'}
+            },
+            opset_version=opset
+        )
+    logger.info(f"ONNX模型导出完成: {fp32_path}")
+
+    onnx_path = fp32_path
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        onnx_path = os.path.join(output_dir, ONNX_INT8_FILENAME)
+        quantize_dynamic(fp32_path, onnx_path, weight_type=QuantType.QInt8)
+        logger.info(f"动态int8量化完成: {onnx_path}")
+
+    crf = model.head.crf
+    np.savez(
+        os.path.join(output_dir, CRF_PARAMS_FILENAME),
+        start_transitions=crf.start_transitions.detach().cpu().numpy(),
+        end_transitions=crf.end_transitions.detach().cpu().numpy(),
+        transitions=crf.transitions.detach().cpu().numpy()
+    )
+
+    # 复制分词器等配置文件，推理端无需再访问原模型目录
+    if os.path.isdir(model_path):
+        for filename in os.listdir(model_path):
+            if filename.endswith(('.json', '.txt', '.model')) and filename != META_FILENAME:
+                shutil.copy(os.path.join(model_path, filename), output_dir)
+
+    meta = {
+        'source_model': model_path,
+        'model_file': os.path.basename(onnx_path),
+        'quantized': quantize,
+        'opset': opset,
+        'id2label': {str(k): v for k, v in preprocessor.id2label.items()}
+    }
+    with open(os.path.join(output_dir, META_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return onnx_path
+
+
+def viterbi_decode(emissions: np.ndarray, start_transitions: np.ndarray, end_transitions: np.ndarray,
+                   transitions: np.ndarray) -> np.ndarray:
+    """
+    单条序列的CRF维特比解码
+
+    Args:
+        emissions: 标签分数 (序列长度, 标签数)
+        start_transitions: 起始转移分数 (标签数,)
+        end_transitions: 结束转移分数 (标签数,)
+        transitions: 转移分数矩阵 (标签数, 标签数)，[i, j]为从标签i转移到j的分数
+
+    Returns:
+        最优标签序列 (序列长度,)
+    """
+    length = emissions.shape[0]
+    score = start_transitions + emissions[0]
+    history = np.empty((max(length - 1, 0), emissions.shape[1]), dtype=np.int64)
+    for i in range(1, length):
+        next_score = score[:, None] + transitions + emissions[i][None, :]
+        history[i - 1] = next_score.argmax(axis=0)
+        score = next_score.max(axis=0)
+    score = score + end_transitions
+
+    tags = np.empty(length, dtype=np.int64)
+    tags[-1] = score.argmax()
+    for i in range(length - 2, -1, -1):
+        tags[i] = history[i][tags[i + 1]]
+    return tags
+
+
+def chunk_entities(text: str, labels: Sequence[str], offsets: np.ndarray,
+                   probs: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+    """
+    将BIOES标签序列切分为实体（与ModelScope token分类pipeline的规则一致）
+
+    Args:
+        text: 原文本
+        labels: 每个字对应的标签
+        offsets: 每个字在原文中的位置 (长度, 2)
+        probs: 每个字所选标签的概率，为None时不输出prob
+
+    Returns:
+        实体列表 [{'type', 'start', 'end', 'span', 'prob'}, ...]
+    """
+    chunks = []
+    chunk = {}
+    for i, (label, (start, end)) in enumerate(zip(labels, offsets)):
+        tag = label[0]
+        opens_chunk = tag in 'BS' or (tag in 'IE' and not chunk)
+        if opens_chunk:
+            if chunk and tag in 'BS':
+                chunk['span'] = text[chunk['start']:chunk['end']]
+                chunks.append(chunk)
+            chunk = {'type': label[2:], 'start': int(start), 'end': int(end)}
+            if probs is not None:
+                chunk['prob'] = float(probs[i])
+        if tag in 'IES' and chunk:
+            chunk['end'] = int(end)
+        if tag in 'ES' and chunk:
+            chunk['span'] = text[chunk['start']:chunk['end']]
+            chunks.append(chunk)
+            chunk = {}
+
+    if chunk:
+        chunk['span'] = text[chunk['start']:chunk['end']]
+        chunks.append(chunk)
+    return chunks
+
+
+class OnnxNERPipeline:
+    """基于ONNX Runtime的简历实体识别，可直接替换ModelScope的NER pipeline"""
+
+    def __init__(self, onnx_dir: str, num_threads: int = 0, model_path: Optional[str] = None):
+        """
+        Args:
+            onnx_dir: export_onnx的导出目录
+            num_threads: ONNX Runtime算子内线程数，0表示由ONNX Runtime自行决定
+            model_path: 分词器所在的模型路径，为None时使用导出目录（其次是导出时记录的源模型）
+        """
+        import onnxruntime as ort
+        from modelscope.preprocessors import Preprocessor
+
+        with open(os.path.join(onnx_dir, META_FILENAME), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.onnx_path = os.path.join(onnx_dir, meta['model_file'])
+        self.quantized = meta.get('quantized', False)
+        self.id2label = {int(k): v for k, v in meta['id2label'].items()}
+
+        crf = np.load(os.path.join(onnx_dir, CRF_PARAMS_FILENAME))
+        self.start_transitions = crf['start_transitions'].astype(np.float32)
+        self.end_transitions = crf['end_transitions'].astype(np.float32)
+        self.transitions = crf['transitions'].astype(np.float32)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+        self.num_threads = num_threads
+        self.session = ort.InferenceSession(self.onnx_path, options, providers=['CPUExecutionProvider'])
+
+        # 不填充到最大长度，批量推理时按批内最长序列动态填充
+        if model_path is None:
+            has_tokenizer = os.path.exists(os.path.join(onnx_dir, 'configuration.json'))
+            model_path = onnx_dir if has_tokenizer else meta['source_model']
+        self.preprocessor = Preprocessor.from_pretrained(model_path, sequence_length=SEQUENCE_LENGTH,
+                                                         padding=False)
+
+    def _encode(self, text: str) -> Dict[str, np.ndarray]:
+        """分词，返回去掉batch维的numpy数组"""
+        encodings = self.preprocessor(text)
+        return {
+            key: np.asarray(encodings[key])[0]
+            for key in ('input_ids', 'attention_mask', 'label_mask', 'offset_mapping')
+        }
+
+    def _decode(self, text: str, emissions: np.ndarray, encoding: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """label_mask压缩 + 维特比解码 + 实体切分"""
+        label_mask = encoding['label_mask'][:emissions.shape[0]].astype(bool)
+        emissions = emissions[label_mask]
+        if emissions.shape[0] == 0:
+            return []
+
+        tags = viterbi_decode(emissions, self.start_transitions, self.end_transitions, self.transitions)
+        exp = np.exp(emissions - emissions.max(axis=-1, keepdims=True))
+        probs = (exp / exp.sum(axis=-1, keepdims=True))[np.arange(len(tags)), tags]
+        labels = [self.id2label[int(tag)] for tag in tags]
+        offsets = encoding['offset_mapping'][:len(tags)]
+        return chunk_entities(text, labels, offsets, probs)
+
+    def predict_batch(self, texts: Sequence[str]) -> List[List[Dict[str, Any]]]:
+        """
+        批量识别（一次前向计算）
+
+        Args:
+            texts: 文本列表
+
+        Returns:
+            与texts一一对应的实体列表
+        """
+        if not texts:
+            return []
+        encodings = [self._encode(text) for text in texts]
+        max_length = max(len(encoding['input_ids']) for encoding in encodings)
+        input_ids = np.zeros((len(texts), max_length), dtype=np.int64)
+        attention_mask = np.zeros((len(texts), max_length), dtype=np.int64)
+        for i, encoding in enumerate(encodings):
+            length = len(encoding['input_ids'])
+            input_ids[i, :length] = encoding['input_ids']
+            attention_mask[i, :length] = encoding['attention_mask']
+
+        emissions = self.session.run(['emissions'], {'input_ids': input_ids, 'attention_mask': attention_mask})[0]
+        return [
+            self._decode(text, emissions[i, :len(encoding['input_ids'])], encoding)
+            for i, (text, encoding) in enumerate(zip(texts, encodings))
+        ]
+
+    def __call__(self, inputs: Union[str, List[str]], batch_size: Optional[int] = None
+                 ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        与ModelScope pipeline一致的调用方式
+
+        Args:
+            inputs: 单条文本或文本列表
+            batch_size: 列表输入时每次前向计算的文本数，None表示全部一起计算
+
+        Returns:
+            单条文本返回{'output': 实体列表}，列表输入返回结果列表
+        """
+        if isinstance(inputs, str):
+            return {'output': self.predict_batch([inputs])[0]}
+
+        batch_size = batch_size or len(inputs) or 1
+        results = []
+        for start in range(0, len(inputs), batch_size):
+            results.extend({'output': entities} for entities in self.predict_batch(inputs[start:start + batch_size]))
+        return results
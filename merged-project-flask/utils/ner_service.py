@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+简历实体识别服务
+由独立进程持有唯一一份NER模型，通过Unix socket为所有gunicorn worker提供推理；
+并发到达的请求在短时间窗口内合并为一个微批次统一推理，worker进程只保留轻量客户端。
+socket建在只有当前用户可访问的目录中，连接使用认证密钥：gunicorn master启动服务前随机生成密钥、
+创建私有目录（prepare_service_environment），通过环境变量传给之后fork出的worker
+"""
+
+import os
+import time
+import stat
+import queue
+import secrets
+import logging
+import tempfile
+import threading
+import itertools
+from multiprocessing.connection import Listener, Client
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 传递socket路径和认证密钥的环境变量
+SOCKET_ENV = 'RESUME_NER_SERVICE_SOCKET'
+AUTHKEY_ENV = 'RESUME_NER_SERVICE_AUTHKEY'
+# 私有目录中的socket文件名
+SOCKET_FILENAME = 'resume_ner.sock'
+
+# 单个微批次最多合并的请求数
+DEFAULT_MAX_BATCH_SIZE = 16
+# 收到第一个请求后等待更多请求的最长时间（毫秒）
+DEFAULT_MAX_WAIT_MS = 10
+# 客户端等待结果的默认超时（秒），与gunicorn的请求超时一致
+DEFAULT_CLIENT_TIMEOUT = 120
+
+# 服务支持的方法
+METHOD_EXTRACT_STRUCTURED_INFO = 'extract_structured_info'
+METHOD_RECOGNIZE = 'recognize'
+METHOD_STATUS = 'status'
+
+
+class NERServiceError(RuntimeError):
+    """NER服务调用失败"""
+
+
+def get_service_address(address: Optional[str] = None) -> str:
+    """NER服务的socket路径：参数优先，其次环境变量RESUME_NER_SERVICE_SOCKET"""
+    address = address or os.getenv(SOCKET_ENV)
+    if not address:
+        raise NERServiceError(f"未配置NER服务的socket路径（环境变量{SOCKET_ENV}）")
+    return address
+
+
+def get_service_authkey(authkey: Optional[str] = None) -> bytes:
+    """NER服务的认证密钥：参数优先，其次环境变量RESUME_NER_SERVICE_AUTHKEY，没有默认值"""
+    authkey = authkey or os.getenv(AUTHKEY_ENV)
+    if not authkey:
+        raise NERServiceError(f"未配置NER服务的认证密钥（环境变量{AUTHKEY_ENV}）")
+    return authkey.encode('utf-8')
+
+
+def prepare_service_environment(address: Optional[str] = None) -> Tuple[str, str]:
+    """
+    准备NER服务的socket路径和认证密钥，并写入环境变量（供之后启动的服务进程和fork出的worker使用）
+
+    Args:
+        address: socket路径，为None时使用环境变量，都未配置时在新建的私有临时目录（权限0700）中创建
+
+    Returns:
+        (socket路径, 认证密钥)，未配置密钥时随机生成
+    """
+    address = address or os.getenv(SOCKET_ENV)
+    if not address:
+        address = os.path.join(tempfile.mkdtemp(prefix='resume-ner-'), SOCKET_FILENAME)
+    authkey = os.getenv(AUTHKEY_ENV) or secrets.token_hex(32)
+    os.environ[SOCKET_ENV] = address
+    os.environ[AUTHKEY_ENV] = authkey
+    return address, authkey
+
+
+def _ensure_private_directory(address: str) -> None:
+    """确保socket所在目录存在且其他用户不可写（否则他人可以抢先创建或替换socket文件）"""
+    directory = os.path.dirname(os.path.abspath(address))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.stat(directory)
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise NERServiceError(f"NER服务的socket目录必须属于当前用户且其他用户不可写: {directory}")
+
+
+class NERService:
+    """NER推理服务：Unix socket监听 + 微批处理"""
+
+    def __init__(self, address: Optional[str] = None, model_path: str = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 authkey: Optional[str] = None, ner_options: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            address: Unix socket路径，为None时使用环境变量RESUME_NER_SERVICE_SOCKET
+            model_path: 模型路径，可以是本地路径或ModelScope模型ID
+            max_batch_size: 单个微批次最多合并的请求数
+            max_wait_ms: 收到第一个请求后等待更多请求的最长时间（毫秒）
+            authkey: 连接认证密钥，为None时使用环境变量RESUME_NER_SERVICE_AUTHKEY
+            ner_options: 推理后端配置（见configure_resume_ner）
+        """
+        self.address = get_service_address(address)
+        self.model_path = model_path
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.authkey = get_service_authkey(authkey)
+        self.ner_options = ner_options or {}
+        self._queue = queue.Queue()
+        self.stats = {'requests': 0, 'batches': 0, 'max_batch': 0, 'errors': 0}
+
+    def serve_forever(self) -> None:
+        """启动服务：后台加载模型，立即开始监听（模型就绪前到达的请求排队等待）"""
+        from utils.resume_ner import configure_resume_ner, preload_resume_ner
+
+        _ensure_private_directory(self.address)
+        configure_resume_ner(**self.ner_options)
+        preload_resume_ner(self.model_path)
+
+        # 清理上次异常退出遗留的socket文件
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        os.chmod(self.address, 0o600)
+        logger.info(f"NER服务已启动: {self.address}, 微批次上限={self.max_batch_size}, "
+                    f"等待窗口={self.max_wait_s * 1000:.0f}ms")
+
+        threading.Thread(target=self._batch_loop, name='ner-batcher', daemon=True).start()
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # 认证失败等单个连接错误不影响服务
+                    logger.warning(f"接受NER服务连接失败: {str(e)}")
+                    continue
+                threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+
+    def _handle_connection(self, conn) -> None:
+        """读取一个客户端连接上的请求并放入队列（每个连接同一时间只有一个未完成请求）"""
+        try:
+            while True:
+                try:
+                    request_id, method, payload = conn.recv()
+                except (EOFError, OSError):
+                    break
+                if method == METHOD_STATUS:
+                    conn.send((request_id, True, self.status()))
+                    continue
+                self.stats['requests'] += 1
+                self._queue.put((conn, request_id, method, payload))
+        finally:
+            conn.close()
+
+    def _batch_loop(self) -> None:
+        """微批处理循环：取出第一个请求后在等待窗口内尽量多地合并请求"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait_s
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.stats['batches'] += 1
+            self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+            self._process_batch(batch)
+
+    def _process_batch(self, batch: List[tuple]) -> None:
+        """按方法分组批量推理并回复各客户端"""
+        from utils.resume_ner import get_resume_ner
+
+        replies = []
+        try:
+            ner = get_resume_ner(self.model_path)
+            for method, handler in ((METHOD_EXTRACT_STRUCTURED_INFO, ner.extract_structured_info_batch),
+                                    (METHOD_RECOGNIZE, ner.recognize_batch)):
+                requests = [item for item in batch if item[2] == method]
+                if requests:
+                    results = handler([item[3] for item in requests])
+                    replies.extend((item, True, result) for item, result in zip(requests, results))
+            known = (METHOD_EXTRACT_STRUCTURED_INFO, METHOD_RECOGNIZE)
+            replies.extend((item, False, f"不支持的方法: {item[2]}") for item in batch if item[2] not in known)
+        except Exception as e:
+            logger.error(f"NER服务批量推理失败: {str(e)}")
+            self.stats['errors'] += 1
+            replies = [(item, False, str(e)) for item in batch]
+
+        for (conn, request_id, _, _), ok, result in replies:
+            try:
+                conn.send((request_id, ok, result))
+            except (OSError, ValueError) as e:
+                # 客户端已断开（如请求超时），丢弃结果
+                logger.warning(f"回复NER服务客户端失败: {str(e)}")
+
+    def status(self) -> Dict[str, Any]:
+        """服务状态：模型加载状态 + 队列和批处理统计"""
+        from utils.resume_ner import get_resume_ner_status
+
+        status = get_resume_ner_status()
+        status['service'] = {
+            'address': self.address,
+            'pid': os.getpid(),
+            'queued': self._queue.qsize(),
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_s * 1000,
+            **self.stats
+        }
+        return status
+
+
+class NERServiceClient:
+    """NER服务客户端，提供与ResumeNER相同的extract_structured_info/recognize接口"""
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[str] = None,
+                 timeout: float = DEFAULT_CLIENT_TIMEOUT):
+        """
+        Args:
+            address: Unix socket路径，为None时使用环境变量RESUME_NER_SERVICE_SOCKET
+            authkey: 连接认证密钥，为None时使用环境变量RESUME_NER_SERVICE_AUTHKEY
+            timeout: 等待结果的最长秒数
+        """
+        self.address = get_service_address(address)
+        self.authkey = get_service_authkey(authkey)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._ids = itertools.count()
+
+    def _connect(self):
+        """获取当前线程（及进程）的连接，每个线程独占一个连接，请求与回复按顺序对应"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = Client(self.address, family='AF_UNIX', authkey=self.authkey)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _call(self, method: str, payload: Any = None, timeout: Optional[float] = None) -> Any:
+        """发送请求并等待结果，连接断开时重连一次"""
+        timeout = self.timeout if timeout is None else timeout
+        request_id = next(self._ids)
+        for attempt in range(2):
+            try:
+                conn = self._connect()
+                conn.send((request_id, method, payload))
+                if not conn.poll(timeout):
+                    # 超时后连接上可能还会收到迟到的回复，关闭连接避免错位
+                    self._close()
+                    raise NERServiceError(f"NER服务响应超时（{timeout}s）")
+                reply_id, ok, result = conn.recv()
+                break
+            except (EOFError, OSError) as e:
+                self._close()
+                if attempt == 1:
+                    raise NERServiceError(f"无法连接NER服务: {str(e)}")
+
+        if reply_id != request_id:
+            self._close()
+            raise NERServiceError('NER服务回复与请求不对应')
+        if not ok:
+            raise NERServiceError(result)
+        return result
+
+    def available(self) -> bool:
+        """服务是否可连接"""
+        try:
+            self._connect()
+            return True
+        except (OSError, EOFError):
+            return False
+
+    def extract_structured_info(self, text: str) -> Dict[str, Any]:
+        """提取简历文本的结构化信息（与ResumeNER.extract_structured_info一致）"""
+        return self._call(METHOD_EXTRACT_STRUCTURED_INFO, text)
+
+    def recognize(self, text: str) -> List[Dict[str, Any]]:
+        """识别文本中的命名实体（与ResumeNER.recognize一致）"""
+        return self._call(METHOD_RECOGNIZE, text)
+
+    def status(self, timeout: float = 2) -> Dict[str, Any]:
+        """服务端的模型加载状态与批处理统计"""
+        return self._call(METHOD_STATUS, timeout=timeout)
+
+
+def run_service(address: Optional[str] = None, model_path: str = None,
+                max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                ner_options: Optional[Dict[str, Any]] = None, authkey: Optional[str] = None) -> None:
+    """NER服务进程入口"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    NERService(address, model_path, max_batch_size, max_wait_ms, authkey=authkey,
+               ner_options=ner_options).serve_forever()
+
+
+def start_service_process(address: str, model_path: str = None,
+                          max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                          ner_options: Optional[Dict[str, Any]] = None, authkey: Optional[str] = None):
+    """
+    以独立进程启动NER服务（spawn方式，不继承调用方进程的状态；密钥为None时服务进程从环境变量读取）
+
+    Returns:
+        服务进程（multiprocessing.Process）
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    process = context.Process(target=run_service, name='resume-ner-service',
+                              args=(address, model_path, max_batch_size, max_wait_ms, ner_options, authkey),
+                              daemon=True)
+    process.start()
+    logger.info(f"NER服务进程已启动: pid={process.pid}, socket={address}")
+    return process
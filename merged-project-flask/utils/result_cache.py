@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+内容寻址的结果缓存
+进程内LRU + SQLite磁盘存储两级缓存，键为内容哈希（加上模型/算法版本），
+磁盘存储在多个worker进程间共享，重启后依然有效；可按磁盘占用预算淘汰最久未访问的结果
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# 获取项目根目录
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# 默认磁盘缓存路径
+DEFAULT_CACHE_DB_PATH = os.path.join(PROJECT_ROOT, 'cache', 'result_cache.db')
+
+# 进程内LRU默认容量
+DEFAULT_MEMORY_ITEMS = 256
+# 设置了磁盘预算时，每写入多少次检查一次磁盘占用
+EVICT_CHECK_INTERVAL = 64
+# 超出预算时淘汰到预算的该比例，避免每次写入都触发淘汰
+EVICT_TARGET_RATIO = 0.9
+# 压缩存储的值的前缀（JSON不会以该字节开头）
+_COMPRESSED_MARK = b'Z'
+
+
+def make_cache_key(content: Union[str, bytes], version: str = '') -> str:
+    """
+    计算内容寻址的缓存键
+
+    Args:
+        content: 文本或字节内容
+        version: 模型/算法版本，版本变化后旧结果自动失效
+
+    Returns:
+        sha256十六进制摘要
+    """
+    digest = hashlib.sha256()
+    digest.update(version.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(content.encode('utf-8') if isinstance(content, str) else content)
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    """序列化模型输出中的numpy数值等非标准类型"""
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+class ResultCache:
+    """两级结果缓存：进程内LRU + SQLite磁盘存储"""
+
+    def __init__(self, namespace: str, db_path: str = DEFAULT_CACHE_DB_PATH,
+                 max_memory_items: int = DEFAULT_MEMORY_ITEMS, max_disk_bytes: Optional[int] = None,
+                 compress: bool = False):
+        """
+        Args:
+            namespace: 命名空间，不同用途的缓存共用一个数据库时互不干扰
+            db_path: SQLite数据库路径，为None时只使用内存缓存
+            max_memory_items: 进程内LRU容量
+            max_disk_bytes: 当前命名空间的磁盘占用预算（字节），None表示不限制
+            compress: 是否用zlib压缩后存储（适合文档文本等较大的结果）
+        """
+        self.namespace = namespace
+        self.db_path = db_path
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.compress = compress
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evicted': 0}
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            conn = self._connect()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS result_cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_accessed "
+                         "ON result_cache (namespace, accessed_at)")
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程（及进程）的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            # WAL模式允许多个worker进程并发读写
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键（见make_cache_key）
+
+        Returns:
+            缓存的结果，未命中时返回None
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return value
+
+        if self.db_path:
+            try:
+                conn = self._connect()
+                row = conn.execute("SELECT value FROM result_cache WHERE namespace = ? AND key = ?",
+                                   (self.namespace, key)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE result_cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                                 (time.time(), self.namespace, key))
+                    conn.commit()
+                    payload = row[0]
+                    if payload[:1] == _COMPRESSED_MARK:
+                        payload = zlib.decompress(payload[1:])
+                    value = json.loads(payload)
+                    self._remember(key, value)
+                    self.stats['disk_hits'] += 1
+                    return value
+            except sqlite3.Error as e:
+                logger.warning(f"读取结果缓存失败: {str(e)}")
+
+        self.stats['misses'] += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 可JSON序列化的结果
+        """
+        try:
+            payload = json.dumps(value, ensure_ascii=False, default=_json_default).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            logger.warning(f"结果无法序列化，跳过缓存: {str(e)}")
+            return
+
+        # 内存中保存与磁盘一致的反序列化结果（numpy数值等已转换为Python类型）
+        self._remember(key, json.loads(payload))
+        if not self.db_path:
+            return
+        if self.compress:
+            payload = _COMPRESSED_MARK + zlib.compress(payload)
+        try:
+            now = time.time()
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO result_cache (namespace, key, value, size, created_at, accessed_at) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", (self.namespace, key, payload, len(payload), now, now))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"写入结果缓存失败: {str(e)}")
+            return
+
+        if self.max_disk_bytes:
+            self._writes += 1
+            if self._writes % EVICT_CHECK_INTERVAL == 1:
+                self.evict()
+
+    def disk_usage(self) -> int:
+        """当前命名空间在磁盘上的占用（字节）"""
+        if not self.db_path:
+            return 0
+        row = self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM result_cache WHERE namespace = ?",
+                                      (self.namespace,)).fetchone()
+        return row[0]
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        按最近访问时间淘汰当前命名空间的磁盘缓存，使占用不超过预算
+
+        Args:
+            max_bytes: 磁盘占用预算，默认使用max_disk_bytes
+
+        Returns:
+            淘汰的条目数
+        """
+        budget = max_bytes or self.max_disk_bytes
+        if not self.db_path or not budget:
+            return 0
+        try:
+            total = self.disk_usage()
+            if total <= budget:
+                return 0
+            # 超出预算时一次淘汰到预算的EVICT_TARGET_RATIO
+            to_free = total - int(budget * EVICT_TARGET_RATIO)
+            conn = self._connect()
+            keys = []
+            freed = 0
+            for key, size in conn.execute("SELECT key, size FROM result_cache WHERE namespace = ? "
+                                          "ORDER BY accessed_at", (self.namespace,)):
+                keys.append(key)
+                freed += size
+                if freed >= to_free:
+                    break
+            conn.executemany("DELETE FROM result_cache WHERE namespace = ? AND key = ?",
+                             [(self.namespace, key) for key in keys])
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"淘汰结果缓存失败: {str(e)}")
+            return 0
+
+        with self._lock:
+            for key in keys:
+                self._memory.pop(key, None)
+        self.stats['evicted'] += len(keys)
+        logger.info(f"结果缓存[{self.namespace}]超出磁盘预算{budget}字节，淘汰{len(keys)}条（{freed}字节）")
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空当前命名空间的缓存"""
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            conn = self._connect()
+            conn.execute("DELETE FROM result_cache WHERE namespace = ?", (self.namespace,))
+            conn.commit()
+
+
+# 各命名空间的缓存实例
+_result_caches: Dict[str, ResultCache] = {}
+
+
+def get_result_cache(namespace: str, db_path: str = DEFAULT_CACHE_DB_PATH, **options) -> ResultCache:
+    """
+    获取指定命名空间的结果缓存（单例模式）
+
+    Args:
+        namespace: 命名空间
+        db_path: SQLite数据库路径
+        **options: 首次创建时传给ResultCache的其他参数（max_memory_items、max_disk_bytes、compress）
+
+    Returns:
+        ResultCache实例
+    """
+    cache = _result_caches.get(namespace)
+    if cache is None:
+        cache = ResultCache(namespace, db_path, **options)
+        _result_caches[namespace] = cache
+    return cache
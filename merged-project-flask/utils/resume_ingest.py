@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+简历批量入库
+遍历目录或zip压缩包中的PDF/Word简历，在进程池中依次执行 提取 → 清理 → 实体识别 → 技能分类，
+结果逐条写入JSONL或Parquet，并统计各阶段的吞吐量和失败数
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import zipfile
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from utils.resume_ner import ENTITY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# 获取项目根目录
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# 文档提取模块所在目录（作为顶层模块导入）
+WORKFLOW_DIR = os.path.join(PROJECT_ROOT, 'scripts', 'workflow')
+
+# 支持的简历文件类型
+SUPPORTED_EXTENSIONS = ('.pdf', '.doc', '.docx')
+# 处理阶段（按执行顺序）
+STAGES = ('extract', 'clean', 'ner', 'classify')
+# 每个子进程处理多少份简历后重启（释放模型推理和文档解析累积的内存）
+DEFAULT_MAX_TASKS_PER_CHILD = 50
+# Parquet每个行组的记录数
+PARQUET_ROW_GROUP_SIZE = 500
+
+# 任务：(显示名称, 文件路径或zip路径, zip内的成员名或None)
+Task = Tuple[str, str, Optional[str]]
+
+
+def iter_resume_tasks(input_path: str) -> Iterator[Task]:
+    """
+    列出输入目录（递归）或zip压缩包中的简历文件
+
+    Args:
+        input_path: 目录或.zip文件路径
+
+    Yields:
+        (显示名称, 文件路径或zip路径, zip内的成员名或None)
+    """
+    if zipfile.is_zipfile(input_path) and not os.path.isdir(input_path):
+        with zipfile.ZipFile(input_path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield info.filename, input_path, info.filename
+        return
+
+    for root, _, files in os.walk(input_path):
+        for filename in sorted(files):
+            if filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, input_path), path, None
+
+
+# 子进程中的NER实例（每个进程加载一次），None表示不使用NER
+_worker_ner = None
+_worker_include_text = False
+
+
+def _init_worker(use_ner: bool, model_path: Optional[str], ner_service: Optional[str], include_text: bool) -> None:
+    """子进程初始化：导入文档提取模块并加载NER模型（或连接NER服务）"""
+    global _worker_ner, _worker_include_text
+    for path in (PROJECT_ROOT, WORKFLOW_DIR):
+        if path not in sys.path:
+            sys.path.append(path)
+    _worker_include_text = include_text
+
+    # Pool的worker是守护进程，不能再创建PDF提取/OCR进程池：本进程内串行提取，并行度由Pool本身提供
+    from pdf_config import get_config
+    from pdf_extraction_orchestrator import PDFExtractionOrchestrator, set_pdf_orchestrator
+    from pdf_ocr import LocalOCR
+
+    ocr = LocalOCR(dict(get_config()['ocr_config'], max_workers=1))
+    set_pdf_orchestrator(PDFExtractionOrchestrator(parallel_min_pages=0, ocr=ocr))
+    if not use_ner:
+        return
+
+    from config import RESUME_NER_BACKEND, RESUME_NER_ONNX_PATH, RESUME_NER_ONNX_THREADS
+    from utils.resume_ner import configure_resume_ner, configure_resume_ner_service, get_resume_ner
+
+    configure_resume_ner(RESUME_NER_BACKEND, RESUME_NER_ONNX_PATH, RESUME_NER_ONNX_THREADS)
+    configure_resume_ner_service(ner_service)
+    try:
+        _worker_ner = get_resume_ner(model_path)
+    except Exception as e:
+        # 模型不可用时该进程只做词典技能匹配，NER阶段记为失败
+        logger.error(f"子进程{os.getpid()}加载NER模型失败: {str(e)}")
+        _worker_ner = e
+
+
+def _read_task(task: Task) -> bytes:
+    _, path, member = task
+    if member is None:
+        with open(path, 'rb') as f:
+            return f.read()
+    with zipfile.ZipFile(path) as archive:
+        return archive.read(member)
+
+
+def process_resume(task: Task) -> Dict[str, Any]:
+    """
+    处理一份简历（在子进程中执行）
+
+    Args:
+        task: 见iter_resume_tasks
+
+    Returns:
+        结果记录：file、status（ok/failed）、failed_stage、error、各阶段耗时timings_ms及提取的结构化信息
+    """
+    import document_text_extractor
+    from utils.skill_matcher import get_skill_matcher, SOURCE_KEYWORD
+    from utils.skill_taxonomy import classify
+    from utils.text_normalizer import clean_lines
+
+    name = task[0]
+    record = {'file': name, 'status': 'ok', 'failed_stage': None, 'error': None, 'timings_ms': {}}
+    stage = 'extract'
+    start = time.perf_counter()
+
+    def finish_stage(next_stage: Optional[str]) -> None:
+        nonlocal stage, start
+        now = time.perf_counter()
+        record['timings_ms'][stage] = round((now - start) * 1000, 2)
+        stage, start = next_stage, now
+
+    try:
+        data = _read_task(task)
+        record['sha256'] = hashlib.sha256(data).hexdigest()
+        record['size'] = len(data)
+        extracted = document_text_extractor.extract_document(data, name)
+        del data
+        if extracted is None:
+            raise ValueError('未提取到文本内容')
+        record['file_type'] = extracted['file_type']
+        record['method'] = extracted['method']
+        record['page_count'] = len(extracted['pages'])
+        finish_stage('clean')
+
+        text = clean_lines(extracted['text'])
+        del extracted
+        if not text:
+            raise ValueError('清理后文本为空')
+        record['text_length'] = len(text)
+        if _worker_include_text:
+            record['text'] = text
+        finish_stage('ner')
+
+        skills = None
+        if isinstance(_worker_ner, Exception):
+            record['status'] = 'failed'
+            record['failed_stage'] = 'ner'
+            record['error'] = f"NER模型不可用: {str(_worker_ner)}"
+        elif _worker_ner is not None:
+            try:
+                structured_info = _worker_ner.extract_structured_info(text)
+                for field in ENTITY_FIELDS:
+                    record[field] = structured_info.get(field, [])
+                skills = structured_info.get('skills', [])
+            except Exception as e:
+                record['status'] = 'failed'
+                record['failed_stage'] = 'ner'
+                record['error'] = str(e)
+        if skills is None:
+            # 未使用NER或NER失败时，与接口的降级方法一致使用关键词匹配
+            skills = get_skill_matcher().find_skills(text, (SOURCE_KEYWORD,))
+        record['skills'] = skills
+        finish_stage('classify')
+
+        classified = classify(skills)
+        record['skill_categories'] = classified.skill_categories
+        record['canonical_skills'] = classified.canonical
+        finish_stage(None)
+    except Exception as e:
+        record['status'] = 'failed'
+        record['failed_stage'] = stage
+        record['error'] = str(e)
+        finish_stage(None)
+    return record
+
+
+class JsonlWriter:
+    """逐条写入JSONL"""
+
+    def __init__(self, output_path: str):
+        self._file = open(output_path, 'w', encoding='utf-8')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """按行组写入Parquet（列表字段为list<string>，耗时为JSON字符串）"""
+
+    def __init__(self, output_path: str, include_text: bool = False):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        fields = [
+            ('file', pa.string()), ('status', pa.string()), ('failed_stage', pa.string()), ('error', pa.string()),
+            ('sha256', pa.string()), ('size', pa.int64()), ('file_type', pa.string()), ('method', pa.string()),
+            ('page_count', pa.int32()), ('text_length', pa.int64())
+        ]
+        if include_text:
+            fields.append(('text', pa.string()))
+        fields += [(field, pa.list_(pa.string())) for field in ENTITY_FIELDS]
+        fields += [('skills', pa.list_(pa.string())), ('skill_categories', pa.list_(pa.string())),
+                   ('canonical_skills', pa.list_(pa.string())), ('timings_ms', pa.string())]
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(output_path, self._schema)
+        self._buffer = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        row = dict(record, timings_ms=json.dumps(record['timings_ms']))
+        self._buffer.append({name: row.get(name) for name in self._schema.names})
+        if len(self._buffer) >= PARQUET_ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._writer.write_table(self._pa.Table.from_pylist(self._buffer, schema=self._schema))
+            self._buffer = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def ingest_resumes(input_path: str, output_path: str, output_format: Optional[str] = None,
+                   workers: Optional[int] = None, max_tasks_per_child: int = DEFAULT_MAX_TASKS_PER_CHILD,
+                   use_ner: bool = True, model_path: Optional[str] = None, ner_service: Optional[str] = None,
+                   include_text: bool = False) -> Dict[str, Any]:
+    """
+    批量处理简历并写入结构化结果
+
+    Args:
+        input_path: 简历目录或zip压缩包
+        output_path: 输出文件路径
+        output_format: 'jsonl'或'parquet'，None时按输出文件扩展名判断
+        workers: 进程数，None时使用CPU核数
+        max_tasks_per_child: 每个子进程处理多少份简历后重启，限制单个进程的内存增长
+        use_ner: 是否使用NER模型（否则只做词典技能匹配）
+        model_path: NER模型路径
+        ner_service: NER服务的Unix socket路径，指定时各进程共享服务中的模型，不各自加载
+        include_text: 结果中是否包含清理后的全文
+
+    Returns:
+        统计信息：files、succeeded、failed、elapsed_s、files_per_s及各阶段的
+        {'count', 'failed', 'total_s', 'avg_ms', 'files_per_s'}
+    """
+    import multiprocessing
+
+    output_format = output_format or ('parquet' if output_path.endswith('.parquet') else 'jsonl')
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    writer = ParquetWriter(output_path, include_text) if output_format == 'parquet' else JsonlWriter(output_path)
+
+    tasks = list(iter_resume_tasks(input_path))
+    workers = workers or os.cpu_count() or 1
+    stage_stats = {stage: {'count': 0, 'failed': 0, 'total_s': 0.0} for stage in STAGES}
+    succeeded = failed = 0
+    start_time = time.time()
+    logger.info(f"开始批量处理{len(tasks)}份简历: 进程={workers}, 每进程任务上限={max_tasks_per_child}")
+
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(use_ner, model_path, ner_service, include_text),
+                                  maxtasksperchild=max_tasks_per_child or None) as pool:
+            for index, record in enumerate(pool.imap_unordered(process_resume, tasks), 1):
+                writer.write(record)
+                for stage, elapsed_ms in record['timings_ms'].items():
+                    stage_stats[stage]['count'] += 1
+                    stage_stats[stage]['total_s'] += elapsed_ms / 1000
+                if record['status'] == 'ok':
+                    succeeded += 1
+                else:
+                    failed += 1
+                    stage_stats[record['failed_stage']]['failed'] += 1
+                    logger.warning(f"处理失败 [{record['failed_stage']}] {record['file']}: {record['error']}")
+                if index % 100 == 0:
+                    logger.info(f"已处理 {index}/{len(tasks)}")
+    finally:
+        writer.close()
+
+    elapsed = time.time() - start_time
+    for stats in stage_stats.values():
+        stats['avg_ms'] = round(stats['total_s'] * 1000 / stats['count'], 2) if stats['count'] else 0.0
+        # 单进程吞吐量（份/秒），乘以进程数约为该阶段的总体吞吐量上限
+        stats['files_per_s'] = round(stats['count'] / stats['total_s'], 2) if stats['total_s'] else 0.0
+        stats['total_s'] = round(stats['total_s'], 3)
+    result = {
+        'files': len(tasks),
+        'succeeded': succeeded,
+        'failed': failed,
+        'workers': workers,
+        'output': output_path,
+        'format': output_format,
+        'elapsed_s': round(elapsed, 3),
+        'files_per_s': round(len(tasks) / elapsed, 2) if elapsed else 0.0,
+        'stages': stage_stats
+    }
+    logger.info(f"批量处理完成: {result}")
+    return result
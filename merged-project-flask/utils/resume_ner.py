@@ -7,12 +7,16 @@
 """
 
 import os
+import copy
 import logging
 import jieba
 import re
-from typing import Dict, List, Any, Optional, Tuple, Set
-from modelscope.pipelines import pipeline
-from modelscope.utils.constant import Tasks
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple, Set
+from utils.skill_lexicon import SKILL_DICT, TITLE_TO_SKILLS, MAJOR_TO_SKILLS
+from utils.skill_matcher import get_skill_matcher, SOURCE_TITLE, SOURCE_MAJOR
+from utils.result_cache import get_result_cache, make_cache_key
+from utils.text_normalizer import normalize_text
+from utils.model_lifecycle import register_model, get_model_lifecycle, STATE_FAILED
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -22,31 +26,145 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 # 本地模型路径
 LOCAL_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'nlp', 'raner_resume')
+# ModelScope模型ID（本地模型不存在时使用）
+MODELSCOPE_MODEL_ID = 'damo/nlp_raner_named-entity-recognition_chinese-base-resume'
+# 本地ONNX模型目录（scripts/export_resume_ner_onnx.py 的导出目录）
+LOCAL_ONNX_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'nlp', 'raner_resume_onnx')
+# 模型生命周期名称
+RESUME_NER_MODEL_NAME = 'resume_ner'
+# 预热使用的样例文本
+WARMUP_TEXT = '张三，浙江大学计算机科学专业毕业，现任软件工程师。'
+
+# 单次送入模型的最大文本长度
+MAX_SEGMENT_LENGTH = 450
+# 分句边界（中文句号、英文句号、感叹号、问号、换行）
+SENTENCE_BOUNDARY_RE = re.compile(r'[。.!！?？\n]')
+# 超长句子强制切分时优先使用的次级边界（逗号、顿号、分号、冒号、空白）
+SOFT_BOUNDARY_RE = re.compile(r'[，,、；;：:\s]')
+# 相邻分段窗口的重叠字符数（每侧各一半），避免实体在分段边界被截断
+SEGMENT_OVERLAP = 32
+# 长文本批量推理的批大小
+DEFAULT_BATCH_SIZE = 8
+# 结构化信息缓存的命名空间
+NER_CACHE_NAMESPACE = 'resume_ner'
+# 结构化信息缓存的磁盘预算，超出后淘汰最久未使用的结果
+NER_CACHE_MAX_BYTES = int(os.getenv('RESUME_NER_CACHE_MAX_MB', '64')) * 1024 * 1024
+# 结果格式版本，修改实体/技能提取逻辑后递增以使旧缓存失效
+NER_RESULT_VERSION = 2
+
+# 逐页识别时页面之间的分隔符（与文档提取时拼接全文的分隔符一致），用于换算实体在全文中的位置
+PAGE_SEPARATOR = '\n\n'
+# 结构化信息中按实体类型分组的字段
+ENTITY_FIELDS = ('name', 'education', 'organization', 'title', 'major', 'nationality', 'ethnicity', 'location')
+
+# 推理后端
+BACKEND_PYTORCH = 'pytorch'  # ModelScope pipeline（PyTorch）
+BACKEND_ONNX = 'onnx'  # ONNX Runtime（可为int8量化模型）
+
+# 技能短语字符（不含空白和标点）
+_SKILL_PHRASE = r'([^\s，。、；：""''（）,.;:\'\"]+)'
+# "熟练掌握/精通/熟悉/了解/掌握 + 技能"合并为一个前瞻正则，每个位置都尝试匹配（允许重叠）
+SKILL_PREFIX_RE = re.compile(r'(?=(熟练掌握|精通|熟悉|了解|掌握)\s*' + _SKILL_PHRASE + ')')
+# 其余技能模式（各自独立匹配）
+SKILL_PATTERNS = [re.compile(pattern) for pattern in (
+    r'使用\s*' + _SKILL_PHRASE + '经验',
+    _SKILL_PHRASE + r'\s*开发经验',
+    _SKILL_PHRASE + r'\s*工程师',
+    _SKILL_PHRASE + r'\s*专员',
+    _SKILL_PHRASE + r'\s*经理'
+)]
+# 项目经验上下文模式
+PROJECT_CONTEXT_PATTERNS = [re.compile(pattern) for pattern in (
+    r'项目[中使用了|采用了|运用了]\s*([^。，；\n]+)',
+    r'负责\s*([^。，；\n]*?)(开发|设计|实现)',
+    r'参与\s*([^。，；\n]*?)(项目|系统|平台)',
+    r'开发了\s*([^。，；\n]+)',
+    r'设计了\s*([^。，；\n]+)',
+    r'实现了\s*([^。，；\n]+)'
+)]
+# 实体前后用于提取技能的上下文长度
+ENTITY_CONTEXT_WINDOW = 50
+
+# 技能别名归一
+SKILL_ALIASES = {
+    'js': 'javascript', 'javascripts': 'javascript',
+    'py': 'python',
+    'java语言': 'java',
+    'r': 'R语言', 'r语言': 'R语言'  # 将r标准化为R语言
+}
+# 单字符技能白名单（只有这些单字符才被认为是有效技能）
+SINGLE_CHAR_SKILLS = frozenset({'r'})  # R语言（但会被标准化为"R语言"）
+# 无效技能黑名单
+INVALID_SKILLS = frozenset({
+    '的', '了', '在', '和', '与', '或', '及', '等', '有', '是', '为',
+    'c',  # 移除单字符c，因为它通常是误提取
+    'a', 'b', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm',
+    'n', 'o', 'p', 'q', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z',
+    '1', '2', '3', '4', '5', '6', '7', '8', '9', '0'
+})
+# 数量/序号开头的无效技能（如"3名初级"、"2023年网页"、"99.8%"、"第1段"）
+INVALID_SKILL_PREFIX_RE = re.compile(r'\d+(?:[名年个万]|\.?\d*%)|第\d+')
+# 技能中不应出现的动词短语（如"曾在阿里巴巴担任高级软件"、"熟悉PostgreSQL"）
+SKILL_STOP_PHRASE_RE = re.compile('|'.join((
+    '担任', '具有', '拥有', '负责', '主导', '指导', '参与', '使用', '利用', '通过', '基于', '进行', '实现',
+    '完成', '掌握', '熟悉', '精通', '了解'
+)))
+
+
+class SkillTokens:
+    """
+    简历文本的分词结果（全文只分词一次），供技能提取的各个阶段共享
+
+    上下文/实体窗口中的技能对窗口片段重新分词后匹配：片段边界会改变jieba的切分
+    （如全文中被并入更长词的技能在片段中被单独切出），复用全文分词会漏掉这些技能。
+    同一窗口只分词一次
+
+    Attributes:
+        words: 全文的jieba分词结果
+    """
+
+    def __init__(self, text: str, skill_dict: Dict[str, Any]):
+        self.text = text
+        self.skill_dict = skill_dict
+        self.words = jieba.lcut(text)
+        self._segment_skills = {}
+
+    def skills_between(self, start: int, end: int) -> List[str]:
+        """原文[start, end)片段中的技能词（对片段单独分词）"""
+        skills = self._segment_skills.get((start, end))
+        if skills is None:
+            skills = []
+            for word in jieba.lcut(self.text[start:end]):
+                word_lower = word.lower().strip()
+                if len(word_lower) > 1 and word_lower in self.skill_dict:
+                    skills.append(word_lower)
+            self._segment_skills[(start, end)] = skills
+        return skills
 
 
 class ResumeNER:
     """简历命名实体识别类"""
     
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, batch_size: int = DEFAULT_BATCH_SIZE, use_cache: bool = True,
+                 backend: str = BACKEND_PYTORCH, onnx_path: str = None, onnx_threads: int = 0):
         """
         初始化简历命名实体识别模型
         
         Args:
             model_path: 模型路径，可以是本地路径或ModelScope模型ID
                        如果为None，则使用本地模型路径
+            batch_size: 长文本分段后批量推理的批大小，1表示逐段推理
+            use_cache: 是否缓存结构化信息提取结果
+            backend: 推理后端，'pytorch'或'onnx'（ONNX模型不可用时退回pytorch）
+            onnx_path: ONNX模型目录，为None时使用本地ONNX模型目录
+            onnx_threads: ONNX Runtime算子内线程数，0表示自动
         """
-        # 如果没有指定模型路径，则使用本地模型路径
-        if model_path is None:
-            if os.path.exists(LOCAL_MODEL_PATH):
-                self.model_path = LOCAL_MODEL_PATH
-                logger.info(f"使用本地模型路径: {self.model_path}")
-            else:
-                # 如果本地模型不存在，则使用ModelScope模型ID
-                self.model_path = 'damo/nlp_raner_named-entity-recognition_chinese-base-resume'
-                logger.info(f"本地模型不存在，使用ModelScope模型ID: {self.model_path}")
-        else:
-            self.model_path = model_path
+        self.model_path = resolve_model_path(model_path)
+        self.onnx_path = onnx_path or LOCAL_ONNX_MODEL_PATH
+        self.backend = backend
             
+        self.batch_size = max(1, batch_size)
+        self.cache = get_result_cache(NER_CACHE_NAMESPACE, max_disk_bytes=NER_CACHE_MAX_BYTES) if use_cache else None
         self.ner_pipeline = None
         self.entity_types = {
             'CONT': '国籍',
@@ -59,129 +177,98 @@ class ResumeNER:
             'TITLE': '职称'
         }
         
-        # 技能词典：常见技术技能和专业技能
-        self.skill_dict = {
-            # 编程语言
-            'python', 'java', 'c++', 'c#', 'javascript', 'typescript', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'r',
-            # 前端技术
-            'html', 'css', 'react', 'vue', 'angular', 'jquery', 'bootstrap', 'webpack', 'sass', 'less',
-            # 后端技术
-            'node.js', 'django', 'flask', 'spring', 'express', 'laravel', 'asp.net', 'ruby on rails',
-            # 数据库
-            'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'sqlite', 'oracle', 'sql server',
-            # 大数据技术
-            'hadoop', 'spark', 'hive', 'flink', 'kafka', 'storm',
-            # 云计算
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'openstack',
-            # AI/机器学习
-            '机器学习', '深度学习', 'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'nlp', '自然语言处理',
-            '计算机视觉', '图像处理', '推荐系统',
-            # 移动开发
-            'android', 'ios', 'flutter', 'react native', 'swift', 'objective-c',
-            # 测试
-            '自动化测试', '单元测试', '集成测试', '性能测试', 'selenium', 'junit', 'pytest',
-            # 运维
-            'devops', 'ci/cd', 'jenkins', 'git', 'linux', 'shell', 'ansible', 'puppet', 'chef',
-            # 项目管理
-            '敏捷开发', 'scrum', '项目管理', 'pmp', 'prince2',
-            # 办公软件
-            'office', 'word', 'excel', 'powerpoint', 'visio', 'project',
-            # 设计
-            'photoshop', 'illustrator', 'sketch', 'figma', 'ui设计', 'ux设计',
-            # 通用技能
-            '沟通能力', '团队协作', '问题解决', '时间管理', '领导力', '创新思维', '分析能力', '批判性思维',
-            '英语', '日语', '法语', '德语', '西班牙语',
-            # 金融领域
-            '财务分析', '风险管理', '投资分析', '会计', '审计', '税务', 'cpa', 'cfa', 'frm',
-            # 市场营销
-            '市场分析', '品牌管理', '数字营销', '内容营销', 'seo', 'sem', '社交媒体营销',
-            # 人力资源
-            '招聘', '培训', '绩效管理', '薪酬福利', '员工关系', '人才发展',
-            # 销售
-            '客户关系管理', '销售策略', '谈判技巧', '客户开发', '销售管理',
-            # 其他常见技能
-            '数据分析', '报告撰写', '研究能力', '演讲能力', '谈判能力'
-        }
-        
-        # 职称到技能的映射
-        self.title_to_skills = {
-            '软件工程师': ['编程', '软件开发', '代码审查', '调试', '单元测试'],
-            '前端工程师': ['html', 'css', 'javascript', '前端框架', '响应式设计', 'ui开发'],
-            '后端工程师': ['服务器开发', 'api设计', '数据库', '性能优化', '系统架构'],
-            '全栈工程师': ['前端开发', '后端开发', '数据库设计', 'api开发', '全栈开发'],
-            '数据分析师': ['数据分析', '数据可视化', '统计分析', '报告撰写', '数据挖掘'],
-            '数据科学家': ['机器学习', '统计建模', '数据挖掘', '算法设计', '预测分析'],
-            '产品经理': ['产品规划', '用户需求分析', '市场分析', '产品设计', '项目管理'],
-            '项目经理': ['项目管理', '团队管理', '风险管理', '资源规划', '进度控制'],
-            '测试工程师': ['软件测试', '测试用例设计', '自动化测试', '性能测试', '缺陷管理'],
-            '运维工程师': ['系统运维', '服务器管理', '网络配置', '安全维护', '监控系统'],
-            '网络工程师': ['网络配置', '网络安全', '路由器配置', '防火墙管理', 'vpn设置'],
-            '安全工程师': ['网络安全', '安全审计', '漏洞分析', '安全测试', '安全策略'],
-            '人工智能工程师': ['机器学习', '深度学习', '自然语言处理', '计算机视觉', '算法设计'],
-            '区块链工程师': ['区块链开发', '智能合约', '分布式系统', '密码学', 'web3'],
-            '游戏开发工程师': ['游戏开发', '3d建模', '游戏引擎', '物理引擎', '动画设计'],
-            '移动开发工程师': ['移动应用开发', 'android开发', 'ios开发', '跨平台开发', '移动ui设计'],
-            '嵌入式工程师': ['嵌入式系统', '单片机开发', '实时操作系统', '硬件接口', '驱动开发'],
-            '云计算工程师': ['云服务', '虚拟化', '容器技术', '分布式系统', '云安全'],
-            '大数据工程师': ['大数据处理', '数据仓库', '数据挖掘', '分布式计算', '数据建模'],
-            'ui设计师': ['用户界面设计', '交互设计', '视觉设计', '原型设计', '用户体验'],
-            'ux设计师': ['用户体验设计', '用户研究', '交互设计', '信息架构', '可用性测试'],
-            '财务分析师': ['财务分析', '财务报告', '预算管理', '成本控制', '投资分析'],
-            '会计': ['财务会计', '成本会计', '税务会计', '审计', '财务报表'],
-            '市场营销专员': ['市场策略', '品牌推广', '市场调研', '营销活动', '市场分析'],
-            '人力资源专员': ['招聘', '培训发展', '绩效管理', '员工关系', '薪酬福利'],
-            '销售代表': ['销售技巧', '客户开发', '谈判能力', '关系管理', '销售策略'],
-            '客户服务代表': ['客户沟通', '问题解决', '服务意识', '投诉处理', '客户满意度'],
-            '研究员': ['研究方法', '数据分析', '文献综述', '报告撰写', '实验设计'],
-            '教师': ['教学设计', '课程开发', '教学评估', '班级管理', '教育心理学']
-        }
-        
-        # 专业到技能的映射
-        self.major_to_skills = {
-            '计算机科学': ['编程', '算法', '数据结构', '操作系统', '计算机网络', '数据库系统'],
-            '软件工程': ['软件开发', '软件测试', '软件设计', '需求分析', '项目管理', '软件架构'],
-            '信息技术': ['网络技术', '信息系统', '数据管理', 'it服务管理', '信息安全'],
-            '电子工程': ['电路设计', '信号处理', '嵌入式系统', '电子元件', '控制系统'],
-            '通信工程': ['通信系统', '信号处理', '无线通信', '网络协议', '移动通信'],
-            '自动化': ['控制理论', '自动控制', 'plc编程', '传感器技术', '机器人技术'],
-            '机械工程': ['机械设计', '机械制造', 'cad', '材料力学', '热力学'],
-            '土木工程': ['结构设计', '建筑材料', '工程力学', '建筑设计', '工程管理'],
-            '电气工程': ['电力系统', '电气控制', '高压技术', '电机学', '电力电子学'],
-            '化学工程': ['化学反应', '化工设计', '化学分析', '工艺流程', '化工安全'],
-            '材料科学': ['材料性能', '材料制备', '材料表征', '材料测试', '纳米材料'],
-            '生物工程': ['生物技术', '基因工程', '细胞培养', '生物反应器', '生物信息学'],
-            '环境工程': ['环境监测', '污染控制', '环境评估', '废物处理', '环境规划'],
-            '数学': ['数学分析', '代数学', '几何学', '统计学', '运筹学'],
-            '物理学': ['力学', '电磁学', '热学', '光学', '量子物理'],
-            '化学': ['有机化学', '无机化学', '物理化学', '分析化学', '化学实验'],
-            '生物学': ['分子生物学', '细胞生物学', '生态学', '遗传学', '生物化学'],
-            '医学': ['临床医学', '基础医学', '药理学', '病理学', '解剖学'],
-            '药学': ['药物化学', '药剂学', '药物分析', '临床药学', '药物设计'],
-            '心理学': ['认知心理学', '发展心理学', '社会心理学', '心理测量', '心理咨询'],
-            '经济学': ['微观经济学', '宏观经济学', '计量经济学', '国际经济学', '经济政策'],
-            '金融学': ['金融市场', '投资学', '公司金融', '风险管理', '金融分析'],
-            '会计学': ['财务会计', '管理会计', '成本会计', '审计学', '税务会计'],
-            '管理学': ['组织行为学', '战略管理', '人力资源管理', '运营管理', '市场营销'],
-            '市场营销': ['市场调研', '消费者行为', '品牌管理', '营销策略', '广告学'],
-            '人力资源管理': ['招聘选拔', '培训发展', '绩效管理', '薪酬福利', '员工关系'],
-            '国际贸易': ['国际商务', '贸易理论', '国际结算', '外贸实务', '国际市场营销'],
-            '法学': ['民法', '刑法', '商法', '国际法', '宪法'],
-            '新闻传播学': ['新闻学', '传播理论', '媒体研究', '广播电视', '网络传播'],
-            '教育学': ['教育心理学', '课程与教学', '教育管理', '教育评价', '教育技术'],
-            '艺术设计': ['视觉设计', '产品设计', '环境设计', '交互设计', '多媒体设计'],
-            '音乐': ['音乐理论', '器乐演奏', '声乐', '作曲', '音乐史'],
-            '体育': ['运动训练', '体育教育', '运动生理学', '体育管理', '体育心理学']
-        }
+        # 技能词典与职称/专业到技能的映射（定义见skill_lexicon）
+        self.skill_dict = SKILL_DICT
+        self.title_to_skills = TITLE_TO_SKILLS
+        self.major_to_skills = MAJOR_TO_SKILLS
         
+        if self.backend == BACKEND_ONNX:
+            try:
+                from utils.ner_onnx import OnnxNERPipeline
+
+                logger.info(f"正在加载ONNX NER模型: {self.onnx_path}")
+                self.ner_pipeline = OnnxNERPipeline(self.onnx_path, num_threads=onnx_threads)
+                logger.info(f"ONNX NER模型加载成功（量化: {self.ner_pipeline.quantized}）")
+            except Exception as e:
+                logger.warning(f"加载ONNX NER模型失败，退回PyTorch后端: {str(e)}")
+                self.backend = BACKEND_PYTORCH
+
+        if self.ner_pipeline is None:
+            try:
+                # 延迟导入modelscope：只有真正加载模型的进程才承担其导入开销
+                from modelscope.pipelines import pipeline
+                from modelscope.utils.constant import Tasks
+
+                logger.info(f"正在加载NER模型: {self.model_path}")
+                self.ner_pipeline = pipeline(Tasks.named_entity_recognition, self.model_path)
+                logger.info("NER模型加载成功")
+            except Exception as e:
+                logger.error(f"加载NER模型失败: {str(e)}")
+                raise RuntimeError(f"加载NER模型失败: {str(e)}")
+
+        # 不同后端（量化）的输出可能略有差异，版本中包含后端信息以区分缓存
+        self.model_version = self._compute_model_version()
+
+    def warm_up(self) -> None:
+        """预热：加载jieba词典并执行一次推理，避免首个请求承担初始化开销"""
         try:
-            logger.info(f"正在加载NER模型: {self.model_path}")
-            self.ner_pipeline = pipeline(Tasks.named_entity_recognition, self.model_path)
-            logger.info("NER模型加载成功")
+            jieba.initialize()
+            self.ner_pipeline(WARMUP_TEXT)
+            logger.info("NER模型预热完成")
         except Exception as e:
-            logger.error(f"加载NER模型失败: {str(e)}")
-            raise RuntimeError(f"加载NER模型失败: {str(e)}")
+            logger.warning(f"NER模型预热失败: {str(e)}")
     
-    def _split_text_into_segments(self, text: str, max_length: int = 450) -> List[str]:
+    def _split_text_into_spans(self, text: str, max_length: int = MAX_SEGMENT_LENGTH) -> List[Tuple[int, int]]:
+        """
+        将长文本分割成适合模型处理的段落，返回各段在原文中的位置（各段互不重叠）
+
+        Args:
+            text: 待分割的文本
+            max_length: 每段的最大长度
+
+        Returns:
+            段落位置列表 [(起始位置, 结束位置), ...]，text[start:end] 即为段落内容
+        """
+        if len(text) <= max_length:
+            return [(0, len(text))]
+
+        # 一次正则扫描得到所有句子的结束位置
+        sentence_ends = [match.end() for match in SENTENCE_BOUNDARY_RE.finditer(text)]
+        if not sentence_ends or sentence_ends[-1] < len(text):
+            sentence_ends.append(len(text))
+
+        # 将相邻句子组合成不超过max_length的段落，超长句子优先在次级边界处切分
+        spans = []
+        segment_start, segment_end = None, None
+        start = 0
+        for end in sentence_ends:
+            if segment_start is not None and end - segment_start <= max_length:
+                segment_end = end
+                start = end
+                continue
+            if segment_start is not None:
+                spans.append((segment_start, segment_end))
+            while end - start > max_length:
+                cut = self._find_soft_boundary(text, start, start + max_length)
+                spans.append((start, cut))
+                start = cut
+            segment_start, segment_end = start, end
+            start = end
+        if segment_start is not None:
+            spans.append((segment_start, segment_end))
+
+        # 去掉段落首尾空白（调整位置而不修改文本，保证偏移量准确）
+        trimmed = []
+        for start, end in spans:
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if start < end:
+                trimmed.append((start, end))
+        return trimmed
+
+    def _split_text_into_segments(self, text: str, max_length: int = MAX_SEGMENT_LENGTH) -> List[str]:
         """
         将长文本分割成适合模型处理的段落
 
@@ -192,51 +279,72 @@ class ResumeNER:
         Returns:
             分割后的文本段落列表
         """
+        return [text[start:end] for start, end in self._split_text_into_spans(text, max_length)]
+
+    @staticmethod
+    def _find_soft_boundary(text: str, start: int, end: int) -> int:
+        """在text[start:end]的后半部分寻找最后一个次级边界作为切分点，找不到时在end处切分"""
+        cut = end
+        for match in SOFT_BOUNDARY_RE.finditer(text, start + (end - start) // 2, end):
+            cut = match.end()
+        return cut
+
+    def _split_text_into_windows(self, text: str, max_length: int = MAX_SEGMENT_LENGTH,
+                                 overlap: int = SEGMENT_OVERLAP) -> List[Tuple[int, int, int, int]]:
+        """
+        将长文本分割成相互重叠的推理窗口
+
+        每个窗口在段落两侧各扩展overlap/2个字符，实体按起始位置归属于唯一的段落，
+        重叠区内的重复实体只保留归属段落的那一份（见_merge_window_entities）
+
+        Args:
+            text: 待分割的文本
+            max_length: 每个窗口的最大长度
+            overlap: 相邻窗口的重叠字符数
+
+        Returns:
+            [(窗口起点, 窗口终点, 归属区起点, 归属区终点), ...]
+        """
         if len(text) <= max_length:
-            return [text]
-
-        segments = []
-        current_segment = ""
-
-        # 按句子分割（中文句号、英文句号、感叹号、问号）
-        sentences = []
-        current_sentence = ""
-
-        for char in text:
-            current_sentence += char
-            if char in ['。', '.', '!', '！', '?', '？', '\n']:
-                if current_sentence.strip():
-                    sentences.append(current_sentence.strip())
-                current_sentence = ""
-
-        # 处理最后一个句子
-        if current_sentence.strip():
-            sentences.append(current_sentence.strip())
-
-        # 将句子组合成段落
-        for sentence in sentences:
-            if len(current_segment) + len(sentence) <= max_length:
-                current_segment += sentence + " "
-            else:
-                if current_segment.strip():
-                    segments.append(current_segment.strip())
-                current_segment = sentence + " "
-
-        # 处理最后一个段落
-        if current_segment.strip():
-            segments.append(current_segment.strip())
-
-        # 如果还有超长段落，强制按字符分割
-        final_segments = []
-        for segment in segments:
-            if len(segment) <= max_length:
-                final_segments.append(segment)
-            else:
-                # 强制分割超长段落
-                for i in range(0, len(segment), max_length):
-                    final_segments.append(segment[i:i + max_length])
-
-        return final_segments
+            return [(0, len(text), 0, len(text))]
+
+        overlap = max(0, min(overlap, max_length // 2))
+        half = overlap // 2
+        spans = self._split_text_into_spans(text, max_length - overlap)
+        windows = []
+        for i, (start, end) in enumerate(spans):
+            own_start = 0 if i == 0 else start
+            own_end = spans[i + 1][0] if i + 1 < len(spans) else len(text)
+            windows.append((max(0, start - half), min(len(text), end + half), own_start, own_end))
+        return windows
+
+    def _merge_window_entities(self, windows: List[Tuple[int, int, int, int]],
+                               window_entities: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        合并各窗口的实体：换算为原文位置，并丢弃起点不在窗口归属区内的实体（重叠区去重）
+
+        Args:
+            windows: _split_text_into_windows的结果
+            window_entities: 与windows一一对应的实体列表（位置相对于窗口）
+
+        Returns:
+            合并后的实体列表，start/end为在原文中的位置
+        """
+        merged = []
+        for (window_start, _, own_start, own_end), entities in zip(windows, window_entities):
+            for entity in entities:
+                entity_type = entity.get('type')
+                entity['type_zh'] = self.entity_types.get(entity_type, entity_type)
+
+                # 窗口是原文的切片，加上窗口起点即为在原文中的位置
+                if 'start' in entity:
+                    entity['start'] += window_start
+                    if not own_start <= entity['start'] < own_end:
+                        continue
+                if 'end' in entity:
+                    entity['end'] += window_start
+                merged.append(entity)
+        return merged
 
     def recognize(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -254,7 +362,7 @@ class ResumeNER:
 
         try:
             # 检查文本长度，如果超过限制则分段处理
-            if len(text) > 450:
+            if len(text) > MAX_SEGMENT_LENGTH:
                 logger.info(f"文本长度({len(text)})超过限制，进行分段处理")
                 return self._recognize_long_text(text)
 
@@ -271,54 +379,107 @@ class ResumeNER:
             logger.error(f"实体识别失败: {str(e)}")
             return []
 
-    def _recognize_long_text(self, text: str) -> List[Dict[str, Any]]:
+    def _run_pipeline_batched(self, segments: List[str]) -> List[List[Dict[str, Any]]]:
         """
-        处理长文本的实体识别
+        批量推理：按长度排序后分桶，每桶一次前向计算，减少逐段调用的开销和填充浪费
 
         Args:
-            text: 长文本
+            segments: 文本段落列表
 
         Returns:
-            合并后的实体列表
+            与segments一一对应的实体列表
         """
-        segments = self._split_text_into_segments(text)
-        all_entities = []
-        current_offset = 0
-
-        logger.info(f"将文本分为{len(segments)}段进行处理")
-
-        for i, segment in enumerate(segments):
+        outputs = [[] for _ in segments]
+        order = sorted(range(len(segments)), key=lambda i: len(segments[i]))
+        for bucket_start in range(0, len(order), self.batch_size):
+            bucket = order[bucket_start:bucket_start + self.batch_size]
             try:
-                logger.info(f"处理第{i+1}段，长度: {len(segment)}")
-                result = self.ner_pipeline(segment)
-                entities = result.get('output', [])
+                results = self.ner_pipeline([segments[i] for i in bucket], batch_size=len(bucket))
+                if not isinstance(results, list) or len(results) != len(bucket):
+                    raise ValueError('批量推理返回结果数量与输入不一致')
+            except Exception as e:
+                # 旧版本pipeline不支持批量输入时退回逐段推理
+                logger.warning(f"批量推理失败，退回逐段推理: {str(e)}")
+                results = []
+                for i in bucket:
+                    try:
+                        results.append(self.ner_pipeline(segments[i]))
+                    except Exception as segment_error:
+                        logger.error(f"处理段落时出错: {str(segment_error)}")
+                        results.append({})
+            for i, result in zip(bucket, results):
+                outputs[i] = (result or {}).get('output', [])
+        return outputs
+
+    def _recognize_long_text(self, text: str, batched: bool = True) -> List[Dict[str, Any]]:
+        """
+        处理长文本的实体识别（重叠窗口推理，合并时在重叠区去重）
+
+        Args:
+            text: 长文本
+            batched: 是否批量推理，False时逐段调用（用于基准对比）
 
-                # 调整实体位置偏移量
-                for entity in entities:
-                    entity_type = entity.get('type')
-                    entity['type_zh'] = self.entity_types.get(entity_type, entity_type)
+        Returns:
+            合并后的实体列表，start/end为在原文中的位置
+        """
+        windows = self._split_text_into_windows(text)
+        segments = [text[start:end] for start, end, _, _ in windows]
+        logger.info(f"将文本分为{len(segments)}段进行处理")
 
-                    # 调整在原文本中的位置
-                    if 'start' in entity:
-                        entity['start'] += current_offset
-                    if 'end' in entity:
-                        entity['end'] += current_offset
+        if batched and self.batch_size > 1:
+            segment_entities = self._run_pipeline_batched(segments)
+        else:
+            segment_entities = []
+            for i, segment in enumerate(segments):
+                try:
+                    segment_entities.append(self.ner_pipeline(segment).get('output', []))
+                except Exception as e:
+                    logger.error(f"处理第{i+1}段时出错: {str(e)}")
+                    segment_entities.append([])
+
+        all_entities = self._merge_window_entities(windows, segment_entities)
+        logger.info(f"长文本处理完成，共识别出{len(all_entities)}个实体")
+        return all_entities
 
-                all_entities.extend(entities)
+    def recognize_batch(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        批量识别多段文本的命名实体：所有文本的段落合并后一起分桶推理（供NER服务的微批处理使用）
 
-            except Exception as e:
-                logger.error(f"处理第{i+1}段时出错: {str(e)}")
-                continue
+        Args:
+            texts: 文本列表
 
-            # 更新偏移量（加上当前段落长度和一个空格）
-            current_offset += len(segment) + 1
+        Returns:
+            与texts一一对应的实体列表，start/end为在各自文本中的位置
+        """
+        if not self.ner_pipeline:
+            logger.error("NER模型未初始化")
+            return [[] for _ in texts]
+
+        # 所有文本的窗口合并后一起推理，再按文本拆回
+        text_windows = [self._split_text_into_windows(text) for text in texts]
+        segments = [text[start:end] for text, windows in zip(texts, text_windows) for start, end, _, _ in windows]
+        segment_entities = self._run_pipeline_batched(segments)
+
+        results = []
+        offset = 0
+        for windows in text_windows:
+            results.append(self._merge_window_entities(windows, segment_entities[offset:offset + len(windows)]))
+            offset += len(windows)
+        return results
+
+    def _compute_model_version(self) -> str:
+        """模型版本标识：模型路径 + 本地模型配置的修改时间 + 结果格式版本（ONNX后端另含模型文件的修改时间）"""
+        version = f"{self.model_path}:{NER_RESULT_VERSION}"
+        config_path = os.path.join(self.model_path, 'configuration.json')
+        if os.path.exists(config_path):
+            version += f":{int(os.path.getmtime(config_path))}"
+        if self.backend == BACKEND_ONNX:
+            version += f":onnx:{self.ner_pipeline.onnx_path}:{int(os.path.getmtime(self.ner_pipeline.onnx_path))}"
+        return version
 
-        logger.info(f"长文本处理完成，共识别出{len(all_entities)}个实体")
-        return all_entities
-    
     def extract_structured_info(self, text: str) -> Dict[str, Any]:
         """
-        提取文本中的结构化信息
+        提取文本中的结构化信息（结果按文本哈希+模型版本缓存）
         
         Args:
             text: 待提取的文本
@@ -326,7 +487,69 @@ class ResumeNER:
         Returns:
             结构化的简历信息，包含各类实体
         """
-        entities = self.recognize(text)
+        # 规范化（统一换行、全角转半角、去除不可见字符）后再识别和计算缓存键，保证缓存结果中的实体位置与文本一致
+        text = normalize_text(text)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(text, self.model_version)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                # 返回副本，避免调用方修改缓存中的结果
+                return copy.deepcopy(cached)
+
+        structured_info = self._extract_structured_info(text)
+
+        if cache_key is not None:
+            self.cache.set(cache_key, structured_info)
+            structured_info = copy.deepcopy(structured_info)
+        return structured_info
+
+    def extract_structured_info_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量提取结构化信息：未命中缓存的文本一起批量推理
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            与texts一一对应的结构化信息
+        """
+        texts = [normalize_text(text) for text in texts]
+        results = [None] * len(texts)
+        cache_keys = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if self.cache is not None:
+                cache_keys[i] = make_cache_key(text, self.model_version)
+                cached = self.cache.get(cache_keys[i])
+                if cached is not None:
+                    results[i] = copy.deepcopy(cached)
+                    continue
+            pending.append(i)
+
+        if pending:
+            batch_entities = self.recognize_batch([texts[i] for i in pending])
+            for i, entities in zip(pending, batch_entities):
+                structured_info = self._extract_structured_info(texts[i], entities)
+                if cache_keys[i] is not None:
+                    self.cache.set(cache_keys[i], structured_info)
+                    structured_info = copy.deepcopy(structured_info)
+                results[i] = structured_info
+        return results
+
+    def _extract_structured_info(self, text: str, entities: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        提取文本中的结构化信息（不经过缓存）
+        
+        Args:
+            text: 待提取的文本
+            entities: 已识别的实体（批量推理时传入），为None时调用recognize识别
+        
+        Returns:
+            结构化的简历信息，包含各类实体
+        """
+        if entities is None:
+            entities = self.recognize(text)
         
         # 按类型分组
         structured_info = {
@@ -381,88 +604,64 @@ class ResumeNER:
             提取的技能列表
         """
         skills = set()
+        matcher = get_skill_matcher()
         
         # 1. 基于职称提取技能
         if structured_info and 'title' in structured_info:
             for title in structured_info['title']:
-                # 将职称转换为小写，便于匹配
-                title_lower = title.lower()
-                # 检查是否在职称-技能映射中
-                for known_title, related_skills in self.title_to_skills.items():
-                    if known_title in title_lower:
-                        skills.update(related_skills)
+                # 一次扫描找出职称中包含的全部已知职称，并加入其关联技能
+                skills.update(matcher.related_skills(title, SOURCE_TITLE))
         
         # 2. 基于专业提取技能
         if structured_info and 'major' in structured_info:
             for major in structured_info['major']:
-                # 将专业转换为小写，便于匹配
-                major_lower = major.lower()
-                # 检查是否在专业-技能映射中
-                for known_major, related_skills in self.major_to_skills.items():
-                    if known_major in major_lower:
-                        skills.update(related_skills)
+                # 一次扫描找出专业中包含的全部已知专业，并加入其关联技能
+                skills.update(matcher.related_skills(major, SOURCE_MAJOR))
         
         # 3. 基于关键词匹配提取技能
-        # 使用jieba分词
-        words = jieba.lcut(text)
-        # 提取2-3个词的组合，可能是技能短语
-        phrases = []
-        for i in range(len(words)):
+        # 只分词一次，后续各阶段共享分词结果
+        tokens = SkillTokens(text, self.skill_dict)
+        words = tokens.words
+        # 单词以及2-3个词的组合（可能是技能短语）与技能词典匹配
+        for i, word in enumerate(words):
+            candidates = [word]
             if i < len(words) - 1:
-                phrases.append(words[i] + words[i+1])
+                candidates.append(word + words[i+1])
             if i < len(words) - 2:
-                phrases.append(words[i] + words[i+1] + words[i+2])
-        
-        # 将单词和短语与技能词典匹配
-        for word in words + phrases:
-            word_lower = word.lower()
-            if word_lower in self.skill_dict:
-                skills.add(word_lower)
+                candidates.append(word + words[i+1] + words[i+2])
+            for candidate in candidates:
+                candidate_lower = candidate.lower()
+                if candidate_lower in self.skill_dict:
+                    skills.add(candidate_lower)
         
         # 4. 使用正则表达式匹配常见技能模式
         # 例如：熟练掌握XXX、精通XXX、了解XXX等
-        skill_patterns = [
-            r'熟练掌握\s*([^\s，。、；：""''（）,.;:\'\"]+)',
-            r'精通\s*([^\s，。、；：""''（）,.;:\'\"]+)',
-            r'熟悉\s*([^\s，。、；：""''（）,.;:\'\"]+)',
-            r'了解\s*([^\s，。、；：""''（）,.;:\'\"]+)',
-            r'掌握\s*([^\s，。、；：""''（）,.;:\'\"]+)',
-            r'使用\s*([^\s，。、；：""''（）,.;:\'\"]+)经验',
-            r'([^\s，。、；：""''（）,.;:\'\"]+)\s*开发经验',
-            r'([^\s，。、；：""''（）,.;:\'\"]+)\s*工程师',
-            r'([^\s，。、；：""''（）,.;:\'\"]+)\s*专员',
-            r'([^\s，。、；：""''（）,.;:\'\"]+)\s*经理'
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
+        # 合并的前瞻正则会在每个位置匹配，按关键词记录上次匹配的终点，结果与逐个模式finditer一致
+        last_end = {}
+        for match in SKILL_PREFIX_RE.finditer(text):
+            keyword = match.group(1)
+            if match.start() < last_end.get(keyword, 0):
+                continue
+            last_end[keyword] = match.end(2)
+            skill = match.group(2).strip().lower()
+            if len(skill) > 1:  # 避免单个字符
+                skills.add(skill)
+        for pattern in SKILL_PATTERNS:
+            for match in pattern.finditer(text):
                 skill = match.group(1).strip().lower()
-                if len(skill) > 1:  # 避免单个字符
+                if len(skill) > 1:
                     skills.add(skill)
         
         # 5. 处理技能别名和规范化
-        normalized_skills = set()
-        for skill in skills:
-            # 处理一些常见的别名和缩写
-            if skill in ['js', 'javascript', 'javascripts']:
-                normalized_skills.add('javascript')
-            elif skill in ['py', 'python']:
-                normalized_skills.add('python')
-            elif skill in ['java', 'java语言']:
-                normalized_skills.add('java')
-            elif skill in ['r', 'r语言']:
-                normalized_skills.add('R语言')  # 将r标准化为R语言
-            else:
-                normalized_skills.add(skill)
-
+        normalized_skills = {SKILL_ALIASES.get(skill, skill) for skill in skills}
 
         # 6. 二次模型提取（基于NER实体信息进行深度技能推断）
-        enhanced_skills = self._enhance_skills_with_ner(text, list(normalized_skills), structured_info)
+        enhanced_skills = self._enhance_skills_with_ner(text, list(normalized_skills), structured_info, tokens)
 
         return enhanced_skills
 
-    def _enhance_skills_with_ner(self, text: str, initial_skills: List[str], structured_info: Dict[str, Any]) -> List[str]:
+    def _enhance_skills_with_ner(self, text: str, initial_skills: List[str], structured_info: Dict[str, Any],
+                                 tokens: SkillTokens = None) -> List[str]:
         """
         基于NER实体信息进行二次技能提取和增强
 
@@ -470,11 +669,14 @@ class ResumeNER:
             text: 原始文本
             initial_skills: 初次提取的技能列表
             structured_info: NER提取的结构化信息
+            tokens: 原始文本的分词结果，为None时重新分词
 
         Returns:
             增强后的技能列表
         """
         enhanced_skills = set(initial_skills)
+        if tokens is None:
+            tokens = SkillTokens(text, self.skill_dict)
 
         try:
             # 1. 基于组织名称推断技能
@@ -490,11 +692,11 @@ class ResumeNER:
                     enhanced_skills.update(edu_skills)
 
             # 3. 基于上下文分析提取技能
-            context_skills = self._extract_skills_from_context(text, structured_info)
+            context_skills = self._extract_skills_from_context(text, structured_info, tokens)
             enhanced_skills.update(context_skills)
 
             # 4. 基于实体周围文本提取技能
-            entity_skills = self._extract_skills_around_entities(text, structured_info)
+            entity_skills = self._extract_skills_around_entities(text, structured_info, tokens)
             enhanced_skills.update(entity_skills)
 
             # 5. 技能去重和过滤
@@ -561,176 +763,255 @@ class ResumeNER:
 
         return skills
 
-    def _extract_skills_from_context(self, text: str, structured_info: Dict[str, Any]) -> List[str]:
-        """基于上下文分析提取技能"""
+    def _extract_skills_from_context(self, text: str, structured_info: Dict[str, Any],
+                                     tokens: SkillTokens) -> List[str]:
+        """基于上下文分析提取技能（项目经验描述中出现的技能词）"""
         skills = []
 
-        # 项目经验相关技能提取
-        project_patterns = [
-            r'项目[中使用了|采用了|运用了]\s*([^。，；\n]+)',
-            r'负责\s*([^。，；\n]*?)(开发|设计|实现)',
-            r'参与\s*([^。，；\n]*?)(项目|系统|平台)',
-            r'开发了\s*([^。，；\n]+)',
-            r'设计了\s*([^。，；\n]+)',
-            r'实现了\s*([^。，；\n]+)'
-        ]
-
-        for pattern in project_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                context = match.group(1).strip()
-                # 从上下文中提取技能词汇
-                context_skills = self._extract_skills_from_text_segment(context)
-                skills.extend(context_skills)
+        for pattern in PROJECT_CONTEXT_PATTERNS:
+            for match in pattern.finditer(text):
+                context = match.group(1)
+                # 去掉首尾空白后的上下文位置
+                start = match.start(1) + len(context) - len(context.lstrip())
+                end = match.end(1) - (len(context) - len(context.rstrip()))
+                skills.extend(tokens.skills_between(start, end))
 
         return skills
 
-    def _extract_skills_around_entities(self, text: str, structured_info: Dict[str, Any]) -> List[str]:
+    def _extract_skills_around_entities(self, text: str, structured_info: Dict[str, Any],
+                                        tokens: SkillTokens) -> List[str]:
         """基于实体周围文本提取技能"""
         skills = []
 
         if not structured_info or 'raw_entities' not in structured_info:
             return skills
 
-        # 分析每个实体周围的文本
+        # 分析每个实体前后各ENTITY_CONTEXT_WINDOW个字符的上下文
         for entity in structured_info['raw_entities']:
             start = entity.get('start', 0)
             end = entity.get('end', 0)
-
-            # 获取实体前后的上下文（前后各50个字符）
-            context_start = max(0, start - 50)
-            context_end = min(len(text), end + 50)
-            context = text[context_start:context_end]
-
-            # 从上下文中提取技能
-            context_skills = self._extract_skills_from_text_segment(context)
-            skills.extend(context_skills)
-
-        return skills
-
-    def _extract_skills_from_text_segment(self, text_segment: str) -> List[str]:
-        """从文本片段中提取技能"""
-        skills = []
-
-        # 使用jieba分词
-        words = jieba.lcut(text_segment)
-
-        # 检查每个词是否在技能词典中
-        for word in words:
-            word_lower = word.lower().strip()
-            if len(word_lower) > 1 and word_lower in self.skill_dict:
-                skills.append(word_lower)
+            context_start = max(0, start - ENTITY_CONTEXT_WINDOW)
+            context_end = min(len(text), end + ENTITY_CONTEXT_WINDOW)
+            skills.extend(tokens.skills_between(context_start, context_end))
 
         return skills
 
     def _filter_and_deduplicate_skills(self, skills: List[str]) -> List[str]:
         """技能去重和过滤"""
-        # 去重
-        unique_skills = list(set(skills))
-
-        # 过滤掉过短或无意义的技能
         filtered_skills = []
 
-        # 单字符技能白名单（只有这些单字符才被认为是有效技能）
-        single_char_whitelist = {'r'}  # R语言（但会被标准化为"R语言"）
-
-        # 无效技能黑名单
-        invalid_skills = {
-            '的', '了', '在', '和', '与', '或', '及', '等', '有', '是', '为',
-            'c',  # 移除单字符c，因为它通常是误提取
-            'a', 'b', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm',
-            'n', 'o', 'p', 'q', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z',
-            '1', '2', '3', '4', '5', '6', '7', '8', '9', '0'
-        }
-
-        # 无效模式（正则表达式）
-        import re
-        invalid_patterns = [
-            r'^\d+名',  # 如"3名初级"
-            r'^\d+年',  # 如"2023年网页"
-            r'^\d+个',  # 如"5个模块"
-            r'^\d+%',   # 如"35%"
-            r'^\d+万',  # 如"10万次"
-            r'^\d+\.?\d*%',  # 如"99.8%"
-            r'^第\d+',  # 如"第1段"
-            r'.*担任.*',  # 如"曾在阿里巴巴担任高级软件"
-            r'.*具有.*',  # 如"具有5年python"
-            r'.*拥有.*',  # 如"拥有本科教育"
-            r'.*负责.*',  # 如"负责整合"
-            r'.*主导.*',  # 如"主导开发"
-            r'.*指导.*',  # 如"指导3名"
-            r'.*参与.*',  # 如"参与开发"
-            r'.*使用.*',  # 如"使用Java"
-            r'.*利用.*',  # 如"利用云计算"
-            r'.*通过.*',  # 如"通过自动化"
-            r'.*基于.*',  # 如"基于以太坊"
-            r'.*进行.*',  # 如"进行数据存储"
-            r'.*实现.*',  # 如"实现核心功能"
-            r'.*完成.*',  # 如"完成5个模块"
-            r'.*掌握.*',  # 如"掌握PHP开发技能"
-            r'.*熟悉.*',  # 如"熟悉PostgreSQL"
-            r'.*精通.*',  # 如"精通前端技术"
-            r'.*了解.*',  # 如"了解区块链"
-        ]
-
-        for skill in unique_skills:
+        for skill in set(skills):
             original_skill = skill.strip()
             skill_lower = original_skill.lower()
 
-            # 过滤条件
-            if skill_lower in invalid_skills:
-                continue
-
-            # 检查无效模式
-            is_invalid = False
-            for pattern in invalid_patterns:
-                if re.match(pattern, original_skill):
-                    is_invalid = True
-                    break
-
-            if is_invalid:
+            # 黑名单、数量/序号开头、包含动词短语的技能
+            if (skill_lower in INVALID_SKILLS or
+                    INVALID_SKILL_PREFIX_RE.match(original_skill) or
+                    SKILL_STOP_PHRASE_RE.search(original_skill)):
                 continue
 
             # 单字符技能特殊处理
             if len(skill_lower) == 1:
-                if skill_lower in single_char_whitelist:
+                if skill_lower in SINGLE_CHAR_SKILLS:
                     filtered_skills.append(skill_lower)
                 continue
 
-            # 长度大于1的技能
-            if (len(skill_lower) > 1 and
-                not skill_lower.isdigit() and
-                not skill_lower.isspace() and
-                len(skill_lower) <= 20):  # 限制最大长度，避免提取到句子
-
-                # 进一步检查是否是有效的技能词汇
-                # 技能通常是名词或技术术语，不应包含动词短语
-                if not any(word in skill_lower for word in ['担任', '具有', '拥有', '负责', '主导', '指导', '参与', '使用', '利用', '通过', '基于', '进行', '实现', '完成', '掌握', '熟悉', '精通', '了解']):
-                    filtered_skills.append(original_skill)
+            # 长度大于1的技能，限制最大长度，避免提取到句子
+            if not skill_lower.isdigit() and not skill_lower.isspace() and len(skill_lower) <= 20:
+                filtered_skills.append(original_skill)
 
         return filtered_skills
 
-# 单例模式，确保只加载一次模型
-_resume_ner_instance = None
+def iter_structured_info(ner, pages: Iterable[Tuple[int, str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    逐页提取结构化信息（生成器）：每识别完一页立即产出，不必等待整个文档提取完成
+    
+    Args:
+        ner: ResumeNER或NERServiceClient
+        pages: 逐页提取的结果 (page_no, text, tables)，如document_text_extractor.iter_document_pages
+    
+    Yields:
+        该页的结构化信息，另含page_no、text（清理后的页面文本）和offset（页面在全文中的起始位置），
+        raw_entities中的位置已换算为在全文（各页以PAGE_SEPARATOR拼接）中的位置
+    """
+    offset = 0
+    for page_no, text, _ in pages:
+        text = normalize_text(text)
+        if not text:
+            continue
+        structured_info = ner.extract_structured_info(text)
+        for entity in structured_info.get('raw_entities', []):
+            entity['start'] += offset
+            entity['end'] += offset
+        structured_info['page_no'] = page_no
+        structured_info['text'] = text
+        structured_info['offset'] = offset
+        yield structured_info
+        offset += len(text) + len(PAGE_SEPARATOR)
+
+def merge_structured_info(page_infos: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并逐页的结构化信息
+    
+    Args:
+        page_infos: iter_structured_info产出的各页结构化信息
+    
+    Returns:
+        与extract_structured_info格式一致的结构化信息（技能按首次出现顺序去重）
+    """
+    merged = {field: [] for field in ENTITY_FIELDS}
+    merged['raw_entities'] = []
+    merged['skills'] = []
+    seen_skills = set()
+    for structured_info in page_infos:
+        for field in ENTITY_FIELDS:
+            merged[field].extend(structured_info.get(field, []))
+        merged['raw_entities'].extend(structured_info.get('raw_entities', []))
+        for skill in structured_info.get('skills', []):
+            if skill.lower() not in seen_skills:
+                seen_skills.add(skill.lower())
+                merged['skills'].append(skill)
+    return merged
+
+def resolve_model_path(model_path: str = None) -> str:
+    """
+    解析模型路径：未指定时优先使用本地模型，本地模型不存在则使用ModelScope模型ID
+
+    Args:
+        model_path: 模型路径，可以是本地路径或ModelScope模型ID
 
-def get_resume_ner(model_path: str = None) -> ResumeNER:
+    Returns:
+        实际使用的模型路径
     """
-    获取ResumeNER实例（单例模式）
+    if model_path is not None:
+        return model_path
+    if os.path.exists(LOCAL_MODEL_PATH):
+        logger.info(f"使用本地模型路径: {LOCAL_MODEL_PATH}")
+        return LOCAL_MODEL_PATH
+    logger.info(f"本地模型不存在，使用ModelScope模型ID: {MODELSCOPE_MODEL_ID}")
+    return MODELSCOPE_MODEL_ID
+
+
+# 推理后端配置（见configure_resume_ner）
+_resume_ner_options = {}
+
+def configure_resume_ner(backend: str = BACKEND_PYTORCH, onnx_path: str = None, onnx_threads: int = 0) -> None:
+    """
+    配置ResumeNER单例的推理后端（应在预加载之前调用）
+    
+    Args:
+        backend: 推理后端，'pytorch'或'onnx'
+        onnx_path: ONNX模型目录
+        onnx_threads: ONNX Runtime算子内线程数，0表示自动
+    """
+    global _resume_ner_model_path
+    options = {'backend': backend, 'onnx_path': onnx_path, 'onnx_threads': onnx_threads}
+    if options != _resume_ner_options:
+        _resume_ner_options.clear()
+        _resume_ner_options.update(options)
+        # 配置变化后，下次获取时按新配置重新注册
+        _resume_ner_model_path = None
+
+# 共享NER服务的客户端（见configure_resume_ner_service）
+_resume_ner_service = None
+
+def configure_resume_ner_service(address: str = None, timeout: float = None, required: bool = False) -> None:
+    """
+    使用独立的NER服务进程（utils.ner_service）代替进程内模型
+    
+    配置服务后不再回退到进程内模型：服务不可用时get_resume_ner直接报错
+    
+    Args:
+        address: 服务的Unix socket路径，为None时使用环境变量RESUME_NER_SERVICE_SOCKET
+        timeout: 等待服务结果的最长秒数
+        required: 为False且未指定address时停用服务、使用进程内模型；
+                  为True时从环境变量读取socket路径，未配置则报错
+    """
+    global _resume_ner_service
+    if address is None and not required:
+        _resume_ner_service = None
+        return
+    from utils.ner_service import NERServiceClient, DEFAULT_CLIENT_TIMEOUT
+    _resume_ner_service = NERServiceClient(address, timeout=timeout or DEFAULT_CLIENT_TIMEOUT)
+
+def _load_resume_ner(model_path: str) -> ResumeNER:
+    """加载并预热ResumeNER（在生命周期管理器的后台线程中执行）"""
+    resume_ner = ResumeNER(model_path, **_resume_ner_options)
+    resume_ner.warm_up()
+    return resume_ner
+
+
+# 当前生命周期对应的模型路径
+_resume_ner_model_path = None
+
+def _get_resume_ner_lifecycle(model_path: str = None):
+    """获取ResumeNER的生命周期管理器，模型路径变化时重新注册"""
+    global _resume_ner_model_path
+
+    lifecycle = get_model_lifecycle(RESUME_NER_MODEL_NAME)
+    if lifecycle is not None and model_path is None and _resume_ner_model_path is not None:
+        return lifecycle
+
+    resolved_path = resolve_model_path(model_path)
+    if lifecycle is None or resolved_path != _resume_ner_model_path:
+        if lifecycle is not None:
+            # 如果指定了不同的模型路径，则重新创建实例
+            logger.info(f"重新加载模型，路径: {resolved_path}")
+        _resume_ner_model_path = resolved_path
+        lifecycle = register_model(RESUME_NER_MODEL_NAME, lambda: _load_resume_ner(resolved_path), replace=True)
+    return lifecycle
+
+def preload_resume_ner(model_path: str = None):
+    """
+    在后台线程中预加载ResumeNER（应在worker进程中、即fork之后调用）
     
     Args:
         model_path: 模型路径，可以是本地路径或ModelScope模型ID
-                  如果为None则使用默认路径
     
     Returns:
-        ResumeNER实例
+        加载任务的Future
+    """
+    return _get_resume_ner_lifecycle(model_path).start()
+
+def get_resume_ner(model_path: str = None, timeout: float = None) -> ResumeNER:
     """
-    global _resume_ner_instance
+    获取ResumeNER实例（单例模式）
+    
+    预加载进行中时等待同一个加载任务完成，不会重复加载；上次加载失败时重新尝试。
+    配置了NER服务时返回服务客户端（接口与ResumeNER一致），服务不可连接时抛出NERServiceError，
+    不在各进程中各自加载模型
     
-    if _resume_ner_instance is None:
-        _resume_ner_instance = ResumeNER(model_path)
-    elif model_path is not None and model_path != _resume_ner_instance.model_path:
-        # 如果指定了不同的模型路径，则重新创建实例
-        logger.info(f"重新加载模型，路径: {model_path}")
-        _resume_ner_instance = ResumeNER(model_path)
+    Args:
+        model_path: 模型路径，可以是本地路径或ModelScope模型ID
+                  如果为None则使用默认路径
+        timeout: 等待加载完成的最长秒数，None表示一直等待
     
-    return _resume_ner_instance 
\ No newline at end of file
+    Returns:
+        ResumeNER实例或NERServiceClient
+    """
+    if _resume_ner_service is not None:
+        if not _resume_ner_service.available():
+            from utils.ner_service import NERServiceError
+            raise NERServiceError(f"NER服务不可用: {_resume_ner_service.address}")
+        return _resume_ner_service
+
+    lifecycle = _get_resume_ner_lifecycle(model_path)
+    if lifecycle.state == STATE_FAILED:
+        lifecycle.retry()
+    return lifecycle.get(timeout)
+
+def get_resume_ner_status():
+    """ResumeNER的加载状态（供健康检查使用），使用NER服务时返回服务端的状态"""
+    if _resume_ner_service is not None:
+        try:
+            return _resume_ner_service.status()
+        except Exception as e:
+            logger.warning(f"查询NER服务状态失败: {str(e)}")
+
+    lifecycle = get_model_lifecycle(RESUME_NER_MODEL_NAME)
+    if lifecycle is None:
+        return {'name': RESUME_NER_MODEL_NAME, 'state': 'idle', 'ready': False}
+    status = lifecycle.status()
+    status['model_path'] = _resume_ner_model_path
+    status['backend'] = _resume_ner_options.get('backend', BACKEND_PYTORCH)
+    return status
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+技能匹配引擎
+将技能词典、技能分类、职称/专业映射编译为一个Aho-Corasick自动机，
+一次线性扫描即可找出文本中的全部技能命中（含位置和规范技能ID）
+"""
+
+import logging
+from collections import deque, namedtuple
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from utils.skill_lexicon import SKILL_DICT, TITLE_TO_SKILLS, MAJOR_TO_SKILLS, FALLBACK_SKILL_KEYWORDS
+from utils.skill_classifier import SKILL_CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+# 词条来源
+SOURCE_SKILL = 'skill'        # 技能词典
+SOURCE_CATEGORY = 'category'  # 技能分类中的技能
+SOURCE_TITLE = 'title'        # 职称（关联技能见TITLE_TO_SKILLS）
+SOURCE_MAJOR = 'major'        # 专业（关联技能见MAJOR_TO_SKILLS）
+SOURCE_KEYWORD = 'keyword'    # 降级提取关键词
+
+# 技能命中：[start, end) 为命中位置，skill为规范化（小写）的词条，skill_id为其规范技能ID
+SkillHit = namedtuple('SkillHit', ['start', 'end', 'skill', 'skill_id', 'source'])
+
+
+class AhoCorasick:
+    """Aho-Corasick多模式匹配自动机"""
+
+    def __init__(self):
+        # 状态转移表、失败指针、每个状态自身的模式及合并失败链后的输出
+        self._goto = [{}]
+        self._fail = [0]
+        self._patterns = [[]]
+        self._output = [[]]
+        self._built = False
+
+    def add(self, pattern: str, value: Any) -> None:
+        """
+        添加模式串
+
+        Args:
+            pattern: 模式串（调用方负责大小写规范化）
+            value: 命中时返回的值
+        """
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._patterns.append([])
+            state = next_state
+        self._patterns[state].append((len(pattern), value))
+        self._built = False
+
+    def build(self) -> 'AhoCorasick':
+        """按BFS计算失败指针，并将失败链上的输出合并到各状态"""
+        self._fail = [0] * len(self._goto)
+        self._output = [list(patterns) for patterns in self._patterns]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        扫描文本，按结束位置顺序产出全部命中
+
+        Yields:
+            (起始位置, 结束位置, 模式值)
+        """
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in output[state]:
+                yield i + 1 - length, i + 1, value
+
+    def __len__(self):
+        return len(self._goto)
+
+
+def _is_ascii_word_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+class SkillMatcher:
+    """基于Aho-Corasick的技能匹配器，每个词条带有规范技能ID和来源"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            entries: 词条 [(词条, 来源), ...]，词条统一按小写匹配
+        """
+        self.skill_ids = {}
+        self.skill_names = []
+        self.automaton = AhoCorasick()
+        seen = set()
+        for term, source in entries:
+            skill = term.strip().lower()
+            if not skill or (skill, source) in seen:
+                continue
+            seen.add((skill, source))
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is None:
+                skill_id = len(self.skill_names)
+                self.skill_ids[skill] = skill_id
+                self.skill_names.append(skill)
+            self.automaton.add(skill, (skill, skill_id, source))
+        self.automaton.build()
+
+    def find_all(self, text: str, sources: Optional[Sequence[str]] = None,
+                 word_boundary: bool = False) -> List[SkillHit]:
+        """
+        一次扫描找出文本中的全部技能命中
+
+        Args:
+            text: 待匹配文本
+            sources: 只返回这些来源的命中，None表示全部
+            word_boundary: 为True时，以英文字母/数字开头或结尾的词条两侧不能紧邻英文字母/数字
+                           （避免java命中javascript中的片段）
+
+        Returns:
+            技能命中列表，按结束位置排序
+        """
+        if not text:
+            return []
+        # 位置以小写文本为准（极少数字符小写后长度会变化）
+        text_lower = text.lower()
+
+        hits = []
+        for start, end, (skill, skill_id, source) in self.automaton.iter_matches(text_lower):
+            if sources is not None and source not in sources:
+                continue
+            if word_boundary:
+                if _is_ascii_word_char(skill[0]) and start > 0 and _is_ascii_word_char(text_lower[start - 1]):
+                    continue
+                if _is_ascii_word_char(skill[-1]) and end < len(text_lower) and _is_ascii_word_char(text_lower[end]):
+                    continue
+            hits.append(SkillHit(start, end, skill, skill_id, source))
+        return hits
+
+    def find_skills(self, text: str, sources: Optional[Sequence[str]] = None,
+                    word_boundary: bool = False) -> List[str]:
+        """
+        返回文本中命中的技能词条（去重，按首次出现顺序）
+
+        Args:
+            text: 待匹配文本
+            sources: 只返回这些来源的命中，None表示全部
+            word_boundary: 同find_all
+
+        Returns:
+            技能词条列表
+        """
+        skills = {}
+        for hit in self.find_all(text, sources, word_boundary):
+            skills.setdefault(hit.skill, None)
+        return list(skills)
+
+    def related_skills(self, text: str, source: str) -> List[str]:
+        """
+        找出文本中命中的职称或专业，并返回其关联技能
+
+        Args:
+            text: 职称或专业文本
+            source: SOURCE_TITLE 或 SOURCE_MAJOR
+
+        Returns:
+            关联技能列表（去重）
+        """
+        mapping = TITLE_TO_SKILLS if source == SOURCE_TITLE else MAJOR_TO_SKILLS
+        skills = {}
+        for term in self.find_skills(text, (source,)):
+            for skill in mapping.get(term, []):
+                skills.setdefault(skill, None)
+        return list(skills)
+
+
+def _lexicon_entries() -> Iterator[Tuple[str, str]]:
+    """技能词库中的全部词条"""
+    for skill in SKILL_DICT:
+        yield skill, SOURCE_SKILL
+    for category in SKILL_CATEGORIES.values():
+        for skill in category['skills']:
+            yield skill, SOURCE_CATEGORY
+    for title in TITLE_TO_SKILLS:
+        yield title, SOURCE_TITLE
+    for major in MAJOR_TO_SKILLS:
+        yield major, SOURCE_MAJOR
+    for keyword in FALLBACK_SKILL_KEYWORDS:
+        yield keyword, SOURCE_KEYWORD
+
+
+# 导入时编译全局技能匹配器
+_skill_matcher = SkillMatcher(_lexicon_entries())
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """获取全局技能匹配器"""
+    return _skill_matcher
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+技能分类体系服务
+从 data/skill_taxonomy.json 加载技能类别、同义词和别名（如 js/javascript、k8s/kubernetes），
+为规范技能建立整数ID驻留表，并对同一技能列表只分类一次（ClassifiedSkills被所有调用方复用）
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 获取项目根目录
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# 分类体系数据文件
+TAXONOMY_PATH = os.path.join(PROJECT_ROOT, 'data', 'skill_taxonomy.json')
+
+# 未分类技能的显示名称
+UNCATEGORIZED_NAME = '其他技能'
+
+# 分类结果缓存的最大条目数
+CLASSIFY_CACHE_SIZE = 1024
+
+
+class ClassifiedSkills:
+    """
+    一个技能列表的分类结果，由SkillTaxonomy.classify生成并缓存，调用方应视为只读
+
+    Attributes:
+        skills: 原始技能列表
+        canonical: 对应的规范技能名称（别名已归一）
+        skill_ids: 对应的规范技能ID，未收录的技能为None
+        weighted_skills: 带权重的规范技能列表 [(规范技能, 权重), ...]，按规范技能ID去重，用于职位匹配
+        skill_categories: 命中的技能类别名称（按首次出现顺序）
+        classified: 与classify_skills返回格式一致的分类字典
+        display: 与get_display_skills返回格式一致的显示信息
+    """
+
+    def __init__(self, skills: List[str], canonical: List[str], skill_ids: List[Optional[int]],
+                 infos: List[Optional[Dict[str, Any]]]):
+        self.skills = skills
+        self.canonical = canonical
+        self.skill_ids = skill_ids
+
+        # 职位匹配使用归一后的规范名称（js、k8s分别按javascript、kubernetes匹配），同一规范技能只保留一次
+        self.weighted_skills = []
+        seen = set()
+        for name, skill_id, info in zip(canonical, skill_ids, infos):
+            key = skill_id if skill_id is not None else name
+            if key not in seen:
+                seen.add(key)
+                self.weighted_skills.append((name, info['weight'] if info else 1.0))
+
+        self.classified = {
+            'categories': {},  # 按类别分组的技能
+            'uncategorized': [],  # 未分类的技能
+            'all_skills': list(skills)  # 所有原始技能
+        }
+        for skill, info in zip(skills, infos):
+            if info:
+                category = self.classified['categories'].setdefault(info['category'], {
+                    'name': info['name'],
+                    'skills': [],
+                    'weight': info['weight']
+                })
+                category['skills'].append(skill)
+            else:
+                self.classified['uncategorized'].append(skill)
+
+        self.skill_categories = [info['name'] for info in self.classified['categories'].values()]
+
+        self.display = {
+            'skill_categories': list(self.skill_categories),  # 技能类别列表
+            'categorized_skills': {info['name']: info['skills'] for info in self.classified['categories'].values()},
+            'all_skills': skills  # 所有原始技能
+        }
+        if self.classified['uncategorized']:
+            self.display['skill_categories'].append(UNCATEGORIZED_NAME)
+            self.display['categorized_skills'][UNCATEGORIZED_NAME] = self.classified['uncategorized']
+
+
+class SkillTaxonomy:
+    """技能分类体系"""
+
+    def __init__(self, path: str = TAXONOMY_PATH):
+        """
+        Args:
+            path: 分类体系JSON文件路径
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.version = data.get('version', 1)
+
+        # 与原SKILL_CATEGORIES格式一致的类别字典
+        self.categories = OrderedDict()
+        for category in data['categories']:
+            info = {'name': category['name'], 'skills': category['skills']}
+            if 'weight' in category:
+                info['weight'] = category['weight']
+            self.categories[category['id']] = info
+
+        # 规范技能驻留表：名称 <-> ID
+        self.skill_ids = {}
+        self.skill_names = []
+        # 规范技能ID -> 类别信息（同一技能出现在多个类别时以后出现的为准）
+        self.skill_info = {}
+        for category_id, info in self.categories.items():
+            weight = info.get('weight', 1.0)
+            for skill in info['skills']:
+                skill_id = self._intern(skill.lower())
+                self.skill_info[skill_id] = {
+                    'category': category_id,
+                    'name': info['name'],
+                    'weight': weight
+                }
+
+        # 别名 -> 规范技能ID
+        self.aliases = {}
+        for alias, canonical in data.get('aliases', {}).items():
+            self.aliases[alias.lower()] = self._intern(canonical.lower())
+
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        logger.info(f"技能分类体系加载完成: {len(self.categories)}个类别, {len(self.skill_names)}个规范技能, "
+                    f"{len(self.aliases)}个别名")
+
+    def _intern(self, skill: str) -> int:
+        """返回规范技能的ID，不存在时分配新ID"""
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self.skill_names)
+            self.skill_ids[skill] = skill_id
+            self.skill_names.append(skill)
+        return skill_id
+
+    def skill_id(self, skill: str) -> Optional[int]:
+        """
+        获取技能（或其别名）的规范ID
+
+        Returns:
+            规范技能ID，未收录时返回None
+        """
+        # 别名优先：类别中收录的写法（如js）也会归一到规范名称（javascript）
+        skill_lower = skill.strip().lower()
+        skill_id = self.aliases.get(skill_lower)
+        if skill_id is None:
+            skill_id = self.skill_ids.get(skill_lower)
+        return skill_id
+
+    def normalize(self, skill: str) -> str:
+        """将技能别名归一为规范名称，未收录的技能返回其小写形式"""
+        skill_id = self.skill_id(skill)
+        return self.skill_names[skill_id] if skill_id is not None else skill.strip().lower()
+
+    def category_of(self, skill: str) -> Optional[Dict[str, Any]]:
+        """
+        将具体技能映射到类别
+
+        Returns:
+            {'category': 类别ID, 'name': 类别名称, 'weight': 权重}，没有匹配则返回None
+        """
+        skill_id = self.skill_id(skill)
+        return self.skill_info.get(skill_id) if skill_id is not None else None
+
+    def classify(self, skills: Sequence[str]) -> ClassifiedSkills:
+        """
+        对技能列表分类（带LRU缓存，相同列表只计算一次）
+
+        Args:
+            skills: 技能列表
+
+        Returns:
+            ClassifiedSkills
+        """
+        key = tuple(skills)
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                return result
+
+        skill_ids = [self.skill_id(skill) for skill in key]
+        canonical = [self.skill_names[skill_id] if skill_id is not None else skill.strip().lower()
+                     for skill, skill_id in zip(key, skill_ids)]
+        infos = [self.skill_info.get(skill_id) if skill_id is not None else None for skill_id in skill_ids]
+        result = ClassifiedSkills(list(key), canonical, skill_ids, infos)
+
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > CLASSIFY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    def skill_to_category(self) -> Dict[str, Dict[str, Any]]:
+        """规范技能名称 -> 类别信息 的映射（不含别名）"""
+        return {self.skill_names[skill_id]: info for skill_id, info in self.skill_info.items()}
+
+
+# 单例模式，确保只加载一次
+_skill_taxonomy = None
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """获取技能分类体系实例（单例模式）"""
+    global _skill_taxonomy
+    if _skill_taxonomy is None:
+        _skill_taxonomy = SkillTaxonomy()
+    return _skill_taxonomy
+
+
+def classify(skills: Sequence[str]) -> ClassifiedSkills:
+    """对技能列表分类，返回可复用的ClassifiedSkills"""
+    return get_skill_taxonomy().classify(skills)
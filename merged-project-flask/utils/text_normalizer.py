@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文本规范化
+各文档提取器、接口和NER预处理共用的清理逻辑：正则在模块加载时编译一次，
+字符级处理（全角转半角、去除不可见字符、统一空白）由一张str.translate映射表一次完成。
+需要映射的字符在简历文本中很少见：纯ASCII文本直接translate（CPython对ASCII有快速路径），
+其余文本先用单字符类正则检查是否存在需要映射的字符，不存在时跳过映射。
+clean_lines/clean_compact随后会合并空白，各种空白和\r不必预先映射，只检查其余字符。
+代价：这一检查是逐字符的正则扫描（约5ns/字符，4K字符约20us），没有比原实现更快——
+clean_compact因改用str.split合并空白比原实现快，clean_lines约为原实现的0.7~0.8倍，
+normalize_text原先只做replace+strip，约为原实现的0.2倍（相对PDF解析和NER推理的耗时可以忽略）
+"""
+
+import re
+
+# 保留为全角的中文标点（NER模型和技能提取规则按中文标点训练/编写）
+_KEEP_FULLWIDTH = frozenset('，。：；！？（）')
+# 不可见字符：零宽字符、软连字符、BOM、方向控制符
+_INVISIBLE_CHARS = '\u200b\u200c\u200d\u2060\u00ad\ufeff\u200e\u200f'
+# 各种空白统一为普通空格（换行和制表符另行处理）
+_SPACE_CHARS = '\u00a0\u3000\u2002\u2003\u2009\u202f'
+
+
+def _build_char_table() -> dict:
+    """字符映射表：全角ASCII字符转半角（保留中文标点）、去除不可见字符和控制字符、统一空白"""
+    table = {}
+    for code in range(0xFF01, 0xFF5F):
+        if chr(code) not in _KEEP_FULLWIDTH:
+            table[code] = code - 0xFEE0
+    for char in _SPACE_CHARS:
+        table[ord(char)] = ' '
+    for char in _INVISIBLE_CHARS:
+        table[ord(char)] = None
+    # C0控制字符（保留换行和制表符），\r统一为换行
+    for code in range(0x20):
+        if chr(code) not in '\n\t':
+            table[code] = None
+    table[ord('\r')] = '\n'
+    table[0x7F] = None
+    return table
+
+
+# 字符映射表（模块加载时构建一次）
+CHAR_TABLE = _build_char_table()
+
+
+def _char_class(codes) -> str:
+    """把字符码集合压缩为正则字符类（连续的码点写成区间，匹配更快）"""
+    codes = sorted(codes)
+    ranges = []
+    start = prev = codes[0]
+    for code in codes[1:]:
+        if code != prev + 1:
+            ranges.append((start, prev))
+            start = code
+        prev = code
+    ranges.append((start, prev))
+    return '[' + ''.join(re.escape(chr(a)) if a == b else f'{re.escape(chr(a))}-{re.escape(chr(b))}'
+                         for a, b in ranges) + ']'
+
+
+# 需要映射的字符的连续片段
+_MAPPED_CHARS_RE = re.compile(_char_class(CHAR_TABLE) + '+')
+# 是否存在需要映射的字符（单字符类的search比带+的模式扫描快一倍）
+_MAPPED_CHAR_RE = re.compile(_char_class(CHAR_TABLE))
+# 合并空白前必须映射的字符：除\r和_SPACE_CHARS以外的映射字符（这两类会被str.split当作空白合并，结果相同）
+_UNMERGED_CHAR_RE = re.compile(_char_class(
+    code for code in CHAR_TABLE if code != ord('\r') and chr(code) not in _SPACE_CHARS))
+
+
+def _translate_match(match) -> str:
+    return match.group().translate(CHAR_TABLE)
+
+
+def translate_chars(text: str) -> str:
+    """
+    按CHAR_TABLE做字符映射（与text.translate(CHAR_TABLE)结果相同）
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        映射后的文本
+    """
+    if text.isascii():
+        return text.translate(CHAR_TABLE)
+    if _MAPPED_CHAR_RE.search(text) is None:
+        return text
+    return _MAPPED_CHARS_RE.sub(_translate_match, text)
+
+# clean_compact保留的字符以外的字符：字母数字下划线、空白、中文和常用中英文标点
+_DISALLOWED_CHARS_RE = re.compile(r'[^\w\s\u4e00-\u9fff,.，。:：;；!！?？、"\'“”‘’（）()【】\[\]{}]')
+
+
+def normalize_text(text: str) -> str:
+    """
+    字符级规范化（不改变行结构）：统一换行、全角转半角、去除不可见字符，并去掉首尾空白
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        规范化后的文本
+    """
+    if not text:
+        return ''
+    return translate_chars(text.replace('\r\n', '\n')).strip()
+
+
+def clean_lines(text: str) -> str:
+    """
+    清理提取的文档文本：字符级规范化后去掉空行，合并行内多余空白
+
+    Args:
+        text: 原始提取的文本
+
+    Returns:
+        清理后的文本（每行一段，行内空白合并为单个空格）
+    """
+    if not text:
+        return ''
+    if _UNMERGED_CHAR_RE.search(text) is not None:
+        text = translate_chars(text)
+    elif '\r' in text:
+        text = text.replace('\r', '\n')
+    return '\n'.join(filter(None, map(' '.join, map(str.split, text.split('\n')))))
+
+
+def clean_compact(text: str) -> str:
+    """
+    压缩清理：所有空白（含换行）合并为单个空格，并去除常用标点以外的特殊字符
+
+    Args:
+        text: 待清理的文本
+
+    Returns:
+        清理后的单行文本
+    """
+    if not text:
+        return ''
+    if _UNMERGED_CHAR_RE.search(text) is not None:
+        text = translate_chars(text)
+    return _DISALLOWED_CHARS_RE.sub('', ' '.join(text.split())).strip()